@@ -2,8 +2,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from typing import Optional
-from datetime import datetime
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 import logging
 
@@ -12,7 +12,8 @@ from app.models.indicador import Indicador, TipoIndicador
 from app.models.sac import Subprefeitura
 from app.models.cnc import CNC, StatusCNC
 from app.models.sac import SAC
-from app.services.indicadores import IndicadoresService
+from app.services.cache_indicadores import cache_indicadores
+from app.services.indicadores import IndicadoresService, somar_meses
 from app.schemas.indicador import IndicadorResponse, IndicadorList
 
 router = APIRouter()
@@ -68,9 +69,10 @@ def detalhar_indicadores(
         periodo_inicial = periodo_final.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
     service = IndicadoresService(db)
-    ird = service.calcular_ird(periodo_inicial, periodo_final, subprefeitura)
-    ia = service.calcular_ia(periodo_inicial, periodo_final, subprefeitura)
-    if_result = service.calcular_if(periodo_inicial, periodo_final, subprefeitura)
+    indicadores = service.calcular_indicadores(periodo_inicial, periodo_final, subprefeitura)
+    ird = indicadores["ird"]
+    ia = indicadores["ia"]
+    if_result = indicadores["if"]
     
     # Buscar IPT do banco de dados
     # Estratégia: buscar IPT que intersecta com o período OU que está dentro do mesmo mês/ano do período solicitado
@@ -142,6 +144,134 @@ def detalhar_indicadores(
     }
 
 
+@router.get("/indicadores/subprefeituras")
+def detalhar_indicadores_por_subprefeitura(
+    periodo_inicial: Optional[datetime] = Query(
+        None, description="Data inicial; se vazio, usa o primeiro dia do mês atual"
+    ),
+    periodo_final: Optional[datetime] = Query(
+        None, description="Data final; se vazio, usa a data e hora atuais"
+    ),
+    db: Session = Depends(get_db)
+):
+    """Retorna IRD, IA e IF de cada subprefeitura e o geral, calculados em uma única consulta."""
+    if not periodo_final:
+        periodo_final = datetime.utcnow()
+    if not periodo_inicial:
+        periodo_inicial = periodo_final.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    
+    service = IndicadoresService(db)
+    resultados = service.calcular_indicadores_por_subprefeitura(periodo_inicial, periodo_final)
+    
+    return {
+        "periodo": {
+            "inicial": periodo_inicial.isoformat(),
+            "final": periodo_final.isoformat(),
+        },
+        "geral": resultados.pop(None),
+        "subprefeituras": {
+            subprefeitura.value: indicadores for subprefeitura, indicadores in resultados.items()
+        },
+    }
+
+
+@router.get("/indicadores/adc/mensal")
+def obter_serie_adc_mensal(
+    mes_final: Optional[date] = Query(
+        None, description="Qualquer data do último mês da série; se vazio, usa o mês atual"
+    ),
+    meses: int = Query(12, ge=1, le=60, description="Quantidade de meses da série"),
+    subprefeitura: Optional[Subprefeitura] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna IRD, IA, IF, pontuação e desconto de meses consecutivos.
+    
+    As contagens da série inteira saem de uma consulta agrupada por mês e o
+    IPT de cada mês é o salvo mais recente cujo período cruza o mês.
+    """
+    if not mes_final:
+        mes_final = datetime.utcnow().date()
+    
+    service = IndicadoresService(db)
+    
+    # IPTs salvos que cruzam a série (uma consulta); o mais recente de cada mês prevalece
+    fim_serie = somar_meses(mes_final.replace(day=1), 1)
+    inicio_serie = somar_meses(fim_serie, -meses)
+    ipts = db.query(Indicador).filter(
+        and_(
+            Indicador.tipo == TipoIndicador.IPT,
+            Indicador.periodo_inicial < datetime.combine(fim_serie, time.min),
+            Indicador.periodo_final >= datetime.combine(inicio_serie, time.min),
+            Indicador.subprefeitura.is_(None)
+        )
+    ).order_by(Indicador.calculated_at.asc()).all()
+    
+    valores_ipt = {}
+    for indice in range(meses):
+        mes = somar_meses(inicio_serie, indice)
+        inicio_mes = datetime.combine(mes, time.min)
+        fim_mes = datetime.combine(somar_meses(mes, 1), time.min)
+        for ipt in ipts:
+            if ipt.periodo_inicial < fim_mes and ipt.periodo_final >= inicio_mes:
+                valores_ipt[mes.strftime("%Y-%m")] = ipt.valor
+    
+    serie = service.calcular_serie_adc(mes_final, meses, subprefeitura, valores_ipt)
+    
+    return {
+        "meses": [item["mes"] for item in serie],
+        "subprefeitura": subprefeitura.value if subprefeitura else None,
+        "serie": serie,
+    }
+
+
+@router.get("/indicadores/janelas")
+def obter_janelas_moveis(
+    indicador: TipoIndicador = Query(..., description="IRD, IA ou IF"),
+    janelas: List[int] = Query([7], description="Tamanhos das janelas em dias (ex: 7, 14, 30)"),
+    data_inicial: Optional[date] = Query(None, description="Primeiro dia da série; se vazio, 90 dias antes da final"),
+    data_final: Optional[date] = Query(None, description="Último dia da série; se vazio, hoje"),
+    subprefeitura: Optional[Subprefeitura] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna IRD, IA ou IF em janelas móveis (ex: IA dos últimos 7 dias), um ponto por dia.
+    
+    As contagens diárias do intervalo são lidas uma vez e cada janela sai de
+    somas prefixadas, para todas as janelas pedidas.
+    """
+    if indicador not in (TipoIndicador.IRD, TipoIndicador.IA, TipoIndicador.IF):
+        raise HTTPException(status_code=400, detail="Janelas móveis só calculam IRD, IA e IF")
+    if any(janela < 1 or janela > 366 for janela in janelas):
+        raise HTTPException(status_code=400, detail="Janelas devem ter de 1 a 366 dias")
+    
+    if not data_final:
+        data_final = datetime.utcnow().date()
+    if not data_inicial:
+        data_inicial = data_final - timedelta(days=89)
+    if data_inicial > data_final:
+        raise HTTPException(status_code=400, detail="data_inicial deve ser anterior ou igual a data_final")
+    if (data_final - data_inicial).days >= 731:
+        raise HTTPException(status_code=400, detail="Intervalo máximo de 731 dias")
+    
+    service = IndicadoresService(db)
+    resultados = service.calcular_janelas_moveis(indicador, janelas, data_inicial, data_final, subprefeitura)
+    
+    return {
+        "indicador": indicador.value,
+        "subprefeitura": subprefeitura.value if subprefeitura else None,
+        "data_inicial": data_inicial.isoformat(),
+        "data_final": data_final.isoformat(),
+        "janelas": {str(janela): serie for janela, serie in resultados.items()},
+    }
+
+
+@router.get("/indicadores/cache")
+def obter_estatisticas_cache():
+    """Estatísticas do cache de IRD/IA/IF (itens, hits, misses, taxa de acerto, versões dos dados)."""
+    return cache_indicadores.estatisticas()
+
+
 @router.post("/indicadores/calcular/ird")
 def calcular_ird(
     periodo_inicial: datetime,
@@ -405,11 +535,7 @@ def recalcular_indicadores(
     """Recalcula todos os indicadores para um período."""
     service = IndicadoresService(db)
     
-    resultados = {
-        "ird": service.calcular_ird(periodo_inicial, periodo_final),
-        "ia": service.calcular_ia(periodo_inicial, periodo_final),
-        "if": service.calcular_if(periodo_inicial, periodo_final),
-    }
+    resultados = service.calcular_indicadores(periodo_inicial, periodo_final)
     
     # Salvar indicadores
     for resultado in resultados.values():
@@ -493,10 +619,11 @@ def obter_kpis_dashboard(
     
     service = IndicadoresService(db)
     
-    # Calcular indicadores
-    ird = service.calcular_ird(periodo_inicial, periodo_final)
-    ia = service.calcular_ia(periodo_inicial, periodo_final)
-    if_valor = service.calcular_if(periodo_inicial, periodo_final)
+    # Calcular indicadores (uma consulta)
+    indicadores = service.calcular_indicadores(periodo_inicial, periodo_final)
+    ird = indicadores["ird"]
+    ia = indicadores["ia"]
+    if_valor = indicadores["if"]
     
     # Buscar IPT do banco de dados
     # Extrair mês/ano do período solicitado (ou do período final se for mais recente)
@@ -1,17 +1,27 @@
 """Endpoints para SACs."""
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
+import logging
 
-from app.database import get_db
+from app.database import SessionLocal, get_db
 from app.models.sac import SAC, StatusSAC, TipoServico, Subprefeitura
+from app.models.reclassificacao import ReclassificacaoSAC
 from app.schemas.sac import SACResponse, SACList, SACUpdate
 from app.schemas import SACCreate
+from app.services import indicadores_diarios
+from app.services.geocoding_backfill import GEOCODE_PENDENTE, GEOCODE_NAO_ENCONTRADO, GEOCODE_FALHOU
+from app.services.reclassificacao import (
+    ReclassificacaoService,
+    lock_reclassificacao,
+    reclassificacao_para_dict,
+)
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 def _annotate_sac(sac: SAC) -> SAC:
@@ -129,6 +139,8 @@ def agendar_sac(
     
     sac.data_agendamento = data_agendamento
     sac.status = StatusSAC.EM_EXECUCAO
+    db.flush()
+    indicadores_diarios.atualizar_dias(db, [sac.data_criacao.date()], "sacs")
     
     db.commit()
     db.refresh(sac)
@@ -152,6 +164,10 @@ def atualizar_sac(
     for key, value in update_dict.items():
         setattr(sac, key, value)
     
+    # Status e data de execução entram em IRD/IA
+    db.flush()
+    indicadores_diarios.atualizar_dias(db, [sac.data_criacao.date()], "sacs")
+    
     db.commit()
     db.refresh(sac)
     
@@ -190,3 +206,85 @@ def listar_sacs_urgentes(
         "atrasados": [SACResponse.model_validate(sac) for sac in sacs_atrasados],
     }
 
+
+@router.get("/sacs/geocoding/status")
+def status_geocoding_sacs(db: Session = Depends(get_db)):
+    """Situação do geocoding diferido: SACs pendentes, não encontrados e com falha."""
+    contagens = dict(
+        db.query(SAC.geocode_status, func.count(SAC.id))
+        .filter(SAC.geocode_status.isnot(None))
+        .group_by(SAC.geocode_status)
+        .all()
+    )
+    return {
+        "pendentes": contagens.get(GEOCODE_PENDENTE, 0),
+        "nao_encontrados": contagens.get(GEOCODE_NAO_ENCONTRADO, 0),
+        "falhas": contagens.get(GEOCODE_FALHOU, 0),
+    }
+
+
+@router.post("/sacs/geocoding/reprocessar-falhas")
+def reprocessar_falhas_geocoding(db: Session = Depends(get_db)):
+    """Devolve à fila de geocoding os SACs que esgotaram as tentativas."""
+    reenfileirados = (
+        db.query(SAC)
+        .filter(SAC.geocode_status == GEOCODE_FALHOU)
+        .update(
+            {
+                SAC.geocode_status: GEOCODE_PENDENTE,
+                SAC.geocode_tentativas: 0,
+                SAC.geocode_proxima_tentativa: None,
+            },
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return {"reenfileirados": reenfileirados}
+
+
+
+def _executar_reclassificacao(execucao_id: UUID) -> None:
+    """Roda a reclassificação em segundo plano com sessão própria."""
+    db = None
+    try:
+        db = SessionLocal()
+        execucao = db.get(ReclassificacaoSAC, execucao_id)
+        if execucao is None:
+            # Sem o checkpoint, executar() iniciaria outra execução sem aviso
+            logger.error("Reclassificação %s não encontrada", execucao_id)
+            return
+        ReclassificacaoService(db).executar(execucao)
+    except Exception:
+        logger.exception("Erro na reclassificação %s", execucao_id)
+    finally:
+        if db is not None:
+            db.close()
+        lock_reclassificacao.release()
+
+
+@router.post("/sacs/reclassificar", status_code=202)
+def reclassificar_sacs(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+    """
+    Reaplica as regras atuais de tipo_servico/prazo aos SACs já gravados.
+
+    Roda em segundo plano, em lotes com commit próprio; uma execução
+    interrompida é retomada do último lote gravado.
+    """
+    if not lock_reclassificacao.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Reclassificação já em andamento")
+    try:
+        execucao = ReclassificacaoService(db).iniciar_ou_retomar()
+    except Exception:
+        lock_reclassificacao.release()
+        raise
+    background_tasks.add_task(_executar_reclassificacao, execucao.id)
+    return reclassificacao_para_dict(execucao)
+
+
+@router.get("/sacs/reclassificacoes/{execucao_id}")
+def obter_reclassificacao(execucao_id: UUID, db: Session = Depends(get_db)):
+    """Progresso de uma reclassificação."""
+    execucao = db.get(ReclassificacaoSAC, execucao_id)
+    if not execucao:
+        raise HTTPException(status_code=404, detail="Reclassificação não encontrada")
+    return reclassificacao_para_dict(execucao)
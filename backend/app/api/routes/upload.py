@@ -1,146 +1,250 @@
 """Endpoints para upload de CSVs."""
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Any
-import tempfile
+from typing import Dict, Any, List, Optional
+import asyncio
+import json
 import os
+import shutil
+import tempfile
+from uuid import UUID
 
+from app.config import settings
 from app.database import get_db
-from app.services.csv_processor import CSVProcessor
+from app.models.importacao import Importacao
+from app.schemas.importacao import ImportacaoList, ImportacaoResponse
+from app.services.importacao_jobs import fila_importacoes, ESTADOS_FINAIS
+from app.services.importacao_pacote import identificar_entidade, montar_pacote
+from app.services.validacao_importacao import TABELAS, ValidacaoImportacaoService
+from app.utils.colunar import extensao_colunar
+from app.utils.compressao import extensao_csv
 
 router = APIRouter()
 
+MENSAGEM_EXTENSAO = "Arquivo deve ser CSV (.csv, .csv.gz ou .zip) ou Parquet/Arrow (.parquet, .arrow, .feather)"
 
-@router.post("/upload/sacs-csv")
-async def upload_sacs_csv(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
-) -> Dict[str, Any]:
-    """Upload e processamento de CSV de SACs."""
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Arquivo deve ser CSV")
+
+async def _copiar_upload(file: UploadFile, destino) -> None:
+    """Copia o upload para `destino` em blocos de UPLOAD_BLOCK_SIZE (nunca inteiro em memória)."""
+    while True:
+        bloco = await file.read(settings.UPLOAD_BLOCK_SIZE)
+        if not bloco:
+            break
+        destino.write(bloco)
+
+
+async def _salvar_temporario(file: UploadFile, suffix: str = '.csv') -> str:
+    """
+    Grava o upload em um arquivo temporário.
     
-    # Salvar arquivo temporário
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_path = tmp_file.name
+    Uploads compactados (.csv.gz, .zip) são gravados como vieram: a
+    descompactação é feita em streaming durante a leitura.
     
-    try:
-        processor = CSVProcessor(db)
-        resultado = processor.processar_sacs_csv(tmp_path)
-        return {
-            "success": True,
-            "message": "CSV processado com sucesso",
-            **resultado
-        }
-    except Exception as e:
-        error_msg = str(e)
-        # Melhorar mensagem de erro para duplicados
-        if "duplicate key" in error_msg.lower() or "unique constraint" in error_msg.lower():
-            error_msg = "Erro: Registros duplicados encontrados. Alguns registros já existem no banco de dados."
-        raise HTTPException(status_code=500, detail=error_msg)
-    finally:
-        # Remover arquivo temporário
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+    Returns:
+        Caminho do arquivo temporário
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        await _copiar_upload(file, tmp_file)
+        return tmp_file.name
 
 
-@router.post("/upload/cnc-csv")
-async def upload_cnc_csv(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+async def _enfileirar_upload(file: UploadFile, entidade: str) -> Dict[str, Any]:
+    """Valida o upload, grava em arquivo temporário e enfileira a importação."""
+    extensao = extensao_csv(file.filename) or extensao_colunar(file.filename)
+    if not extensao:
+        raise HTTPException(status_code=400, detail=MENSAGEM_EXTENSAO)
+    
+    # Salvar arquivo temporário (removido pelo worker ao final da importação)
+    tmp_path = await _salvar_temporario(file, extensao)
+    job = fila_importacoes.enfileirar(entidade, tmp_path, file.filename)
+    
+    return {
+        "success": True,
+        "message": "Importação enfileirada",
+        **job.para_dict(),
+    }
+
+
+@router.post("/upload/sacs-csv", status_code=202)
+async def upload_sacs_csv(file: UploadFile = File(...)) -> Dict[str, Any]:
+    """Upload de CSV de SACs (processado em segundo plano)."""
+    return await _enfileirar_upload(file, "sacs")
+
+
+@router.post("/upload/cnc-csv", status_code=202)
+async def upload_cnc_csv(file: UploadFile = File(...)) -> Dict[str, Any]:
+    """Upload de CSV de CNCs (processado em segundo plano)."""
+    return await _enfileirar_upload(file, "cnc")
+
+
+@router.post("/upload/acic-csv", status_code=202)
+async def upload_acic_csv(file: UploadFile = File(...)) -> Dict[str, Any]:
+    """Upload de CSV de ACICs (processado em segundo plano)."""
+    return await _enfileirar_upload(file, "acic")
+
+
+@router.post("/upload/ouvidoria-csv", status_code=202)
+async def upload_ouvidoria_csv(file: UploadFile = File(...)) -> Dict[str, Any]:
+    """Upload de CSV de Ouvidorias (processado em segundo plano)."""
+    return await _enfileirar_upload(file, "ouvidoria")
+
+
+@router.post("/upload/pacote", status_code=202)
+async def upload_pacote(
+    files: List[UploadFile] = File(...),
+    atomico: bool = True,
 ) -> Dict[str, Any]:
-    """Upload e processamento de CSV de CNCs."""
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Arquivo deve ser CSV")
+    """
+    Upload dos CSVs do dia (SAC, CNC, ACIC e Ouvidoria) ou de um .zip com eles.
+    
+    Cada CSV também pode vir compactado (.csv.gz ou .zip com um único CSV)
+    ou convertido para Parquet/Arrow (`scripts.converter_parquet`).
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_path = tmp_file.name
+    A entidade de cada CSV é identificada pelo nome do arquivo. Os arquivos
+    são lidos em paralelo e gravados em ordem de dependência; com
+    `atomico=true` (padrão) o pacote inteiro é commitado de uma vez.
+    """
+    for file in files:
+        if not (extensao_csv(file.filename) or extensao_colunar(file.filename)):
+            raise HTTPException(status_code=400, detail=f"{MENSAGEM_EXTENSAO}: {file.filename}")
     
+    # Diretório temporário do pacote (removido pelo worker ao final da importação)
+    diretorio = tempfile.mkdtemp(prefix="pacote_")
     try:
-        processor = CSVProcessor(db)
-        resultado = processor.processar_cnc_csv(tmp_path)
-        return {
-            "success": True,
-            "message": "CSV processado com sucesso",
-            **resultado
-        }
-    except Exception as e:
-        error_msg = str(e)
-        # Melhorar mensagem de erro para duplicados
-        if "duplicate key" in error_msg.lower() or "unique constraint" in error_msg.lower():
-            error_msg = "Erro: Registros duplicados encontrados. Alguns registros já existem no banco de dados."
-        raise HTTPException(status_code=500, detail=error_msg)
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+        caminhos = []
+        for indice, file in enumerate(files):
+            # Um subdiretório por arquivo: o nome original identifica a entidade
+            os.mkdir(os.path.join(diretorio, str(indice)))
+            caminho = os.path.join(diretorio, str(indice), os.path.basename(file.filename))
+            with open(caminho, "wb") as destino:
+                await _copiar_upload(file, destino)
+            caminhos.append(caminho)
+        arquivos = montar_pacote(caminhos, diretorio)
+    except ValueError as e:
+        shutil.rmtree(diretorio, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    job = fila_importacoes.enfileirar_pacote(diretorio, arquivos, [file.filename for file in files], atomico)
+    return {
+        "success": True,
+        "message": "Importação do pacote enfileirada",
+        "arquivos": {entidade: os.path.basename(caminho) for entidade, caminho in arquivos.items()},
+        **job.para_dict(),
+    }
 
 
-@router.post("/upload/acic-csv")
-async def upload_acic_csv(
+@router.post("/upload/validar")
+async def validar_upload(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    entidade: Optional[str] = None,
+    db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
-    """Upload e processamento de CSV de ACICs."""
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Arquivo deve ser CSV")
+    """
+    Dry-run da importação: relatório de qualidade do arquivo, sem gravar nada.
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_path = tmp_file.name
+    Conta os valores que cairiam em padrões (status, serviço OUTROS,
+    subprefeitura), datas inválidas, coordenadas vazias/fora de São Paulo
+    e quantas linhas seriam inseridas ou atualizadas. A entidade vem do
+    parâmetro ou do nome do arquivo (ex: TODOS_SACS.csv).
+    """
+    extensao = extensao_csv(file.filename) or extensao_colunar(file.filename)
+    if not extensao:
+        raise HTTPException(status_code=400, detail=MENSAGEM_EXTENSAO)
+    entidade = entidade or identificar_entidade(file.filename)
+    if entidade not in TABELAS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Entidade inválida ou não identificada pelo nome do arquivo (use: {', '.join(TABELAS)})",
+        )
     
+    tmp_path = await _salvar_temporario(file, extensao)
     try:
-        processor = CSVProcessor(db)
-        resultado = processor.processar_acic_csv(tmp_path)
-        return {
-            "success": True,
-            "message": "CSV processado com sucesso",
-            **resultado
-        }
-    except Exception as e:
-        error_msg = str(e)
-        # Melhorar mensagem de erro para duplicados
-        if "duplicate key" in error_msg.lower() or "unique constraint" in error_msg.lower():
-            error_msg = "Erro: Registros duplicados encontrados. Alguns registros já existem no banco de dados."
-        raise HTTPException(status_code=500, detail=error_msg)
+        servico = ValidacaoImportacaoService(db)
+        relatorio = await asyncio.to_thread(servico.validar, entidade, tmp_path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+        os.remove(tmp_path)
+    
+    return {"success": True, "arquivo": file.filename, **relatorio}
 
 
-@router.post("/upload/ouvidoria-csv")
-async def upload_ouvidoria_csv(
-    file: UploadFile = File(...),
+@router.get("/upload/jobs/{job_id}")
+async def get_import_job(job_id: str) -> Dict[str, Any]:
+    """Estado de uma importação: etapa, linhas processadas, vazão e resultado final."""
+    job = fila_importacoes.obter(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Importação não encontrada")
+    return job.para_dict()
+
+
+@router.get("/upload/jobs/{job_id}/stream")
+async def stream_import_job(job_id: str):
+    """Stream SSE com o estado da importação a cada mudança, até o fim do job."""
+    job = fila_importacoes.obter(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Importação não encontrada")
+    
+    async def eventos():
+        versao_enviada = -1
+        while True:
+            versao = job.versao
+            if versao != versao_enviada:
+                versao_enviada = versao
+                yield f"data: {json.dumps(job.para_dict())}\n\n"
+            if job.status in ESTADOS_FINAIS:
+                break
+            await asyncio.sleep(settings.IMPORT_SSE_INTERVALO)
+    
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.get("/upload/importacoes", response_model=ImportacaoList)
+def listar_importacoes(
+    entidade: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
-) -> Dict[str, Any]:
-    """Upload e processamento de CSV de Ouvidorias."""
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Arquivo deve ser CSV")
+):
+    """
+    Histórico das importações, das mais recentes para as mais antigas.
     
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_path = tmp_file.name
+    Cada importação traz a duração, a vazão (linhas por segundo), as idas
+    ao banco, as chamadas ao geocoder e o tempo/linhas de cada etapa, para
+    comparar a vazão entre importações.
+    """
+    query = db.query(Importacao)
+    if entidade:
+        query = query.filter(Importacao.entidade == entidade)
+    if status:
+        query = query.filter(Importacao.status == status)
     
-    try:
-        processor = CSVProcessor(db)
-        resultado = processor.processar_ouvidoria_csv(tmp_path)
-        return {
-            "success": True,
-            "message": "CSV processado com sucesso",
-            **resultado
-        }
-    except Exception as e:
-        error_msg = str(e)
-        # Melhorar mensagem de erro para duplicados
-        if "duplicate key" in error_msg.lower() or "unique constraint" in error_msg.lower():
-            error_msg = "Erro: Registros duplicados encontrados. Alguns registros já existem no banco de dados."
-        raise HTTPException(status_code=500, detail=error_msg)
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+    total = query.count()
+    offset = (page - 1) * page_size
+    importacoes = query.order_by(Importacao.iniciado_em.desc()).offset(offset).limit(page_size).all()
+    
+    return ImportacaoList(
+        items=[ImportacaoResponse.model_validate(importacao) for importacao in importacoes],
+        total=total,
+        page=page,
+        page_size=page_size
+    )
+
 
+@router.get("/upload/importacoes/{importacao_id}", response_model=ImportacaoResponse)
+def obter_importacao(
+    importacao_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Detalhes de uma importação (métricas por etapa e checkpoint)."""
+    importacao = db.query(Importacao).filter(Importacao.id == importacao_id).first()
+    if not importacao:
+        raise HTTPException(status_code=404, detail="Importação não encontrada")
+    
+    return ImportacaoResponse.model_validate(importacao)
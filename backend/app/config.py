@@ -22,7 +22,42 @@ class Settings(BaseSettings):
     
     # Geocoding
     GEOCODING_API_KEY: str = ""
-    GEOCODING_PROVIDER: str = "nominatim"  # nominatim ou google
+    GEOCODING_PROVIDER: str = "nominatim"  # nominatim, local (gazetteer + remoto) ou falso (testes)
+    GEOCODING_PROVIDER_REMOTO: str = "nominatim"  # Usado pelo provider "local" quando o gazetteer não resolve
+    GEOCODING_CACHE_TTL_DIAS: int = 180  # Validade de coordenadas encontradas
+    GEOCODING_CACHE_TTL_NEGATIVO_DIAS: int = 7  # Validade de "endereço não encontrado"
+    GEOCODING_LRU_TAMANHO: int = 10000  # Endereços mantidos em memória
+    GEOCODING_DIFERIDO: bool = True  # Importação só consulta o cache; o worker geocodifica o resto
+    GEOCODING_BACKFILL_ATIVO: bool = True  # Inicia o worker de backfill com a API
+    GEOCODING_REQ_POR_SEGUNDO: float = 1.0  # Limite do Nominatim
+    GEOCODING_CONCORRENCIA: int = 1  # Requisições simultâneas ao geocoder
+    GEOCODING_MAX_TENTATIVAS: int = 5  # Após isso o SAC vai para "falhou"
+    GEOCODING_LOTE: int = 100  # SACs pendentes lidos por iteração do worker
+    GEOCODING_INTERVALO_SEGUNDOS: int = 30  # Espera do worker quando não há pendentes
+    GAZETTEER_TTL_SEGUNDOS: int = 3600  # Reconstrução do índice local de endereços
+    GAZETTEER_INTERVALO_MAXIMO: int = 200  # Maior intervalo de numeração para interpolar
+    GAZETTEER_DISTANCIA_MAXIMA: int = 20  # Maior diferença de número para usar o vizinho
+    GAZETTEER_MAX_ENDERECOS: int = 200000  # Endereços distintos no índice (os mais observados)
+    
+    # Reclassificação de SACs (mudança de VERSAO_REGRAS)
+    RECLASSIFICACAO_LOTE: int = 5000  # SACs por lote (um commit por lote)
+    RECLASSIFICACAO_PAUSA_SEGUNDOS: float = 0.1  # Pausa entre lotes (alivia o banco)
+    
+    # Importação de CSVs
+    IMPORT_CHUNK_SIZE: int = 20000  # Linhas por bloco lido/gravado
+    UPLOAD_BLOCK_SIZE: int = 1024 * 1024  # Bytes por leitura do upload (1 MB)
+    IMPORT_MAX_WORKERS: int = 2  # Importações simultâneas em segundo plano
+    IMPORT_JOBS_RETIDOS: int = 100  # Jobs finalizados mantidos para consulta
+    IMPORT_SSE_INTERVALO: float = 0.5  # Segundos entre verificações do stream SSE
+    IMPORT_INCREMENTAL: bool = True  # Pula arquivos e linhas idênticos aos já importados
+    IMPORT_CSV_ENGINE: str = "c"  # "c" (pandas) ou "pyarrow" (requer o pacote pyarrow)
+    IMPORT_PACOTE_WORKERS: int = 2  # Processos que leem e preparam os arquivos do pacote (1: sem pool)
+    IMPORT_CHECKPOINT: bool = True  # Commit por bloco com checkpoint (importação interrompida é retomada)
+    
+    # Indicadores
+    INDICADORES_DIARIOS: bool = True  # IRD/IA/IF dos dias inteiros do período lidos de indicadores_diarios
+    INDICADORES_CACHE_TAMANHO: int = 256  # Resultados de IRD/IA/IF mantidos em memória (0 desativa)
+    INDICADORES_CACHE_TTL_SEGUNDOS: int = 600  # Validade de um resultado (dados alterados por outro processo)
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -3,6 +3,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api.routes import sacs, cnc, acic, upload, indicadores, roteiros
+from app.services.importacao_jobs import fila_importacoes
+from app.services.geocoding_backfill import worker_geocoding
 
 app = FastAPI(
     title="ADC/FLIP API",
@@ -29,6 +31,20 @@ app.include_router(indicadores.router, prefix=settings.API_V1_PREFIX, tags=["ind
 app.include_router(roteiros.router, prefix=settings.API_V1_PREFIX, tags=["roteiros"])
 
 
+@app.on_event("startup")
+def iniciar_geocoding_backfill():
+    """Inicia o worker que geocodifica SACs importados sem coordenadas."""
+    if settings.GEOCODING_BACKFILL_ATIVO:
+        worker_geocoding.iniciar()
+
+
+@app.on_event("shutdown")
+def encerrar_importacoes():
+    """Encerra o pool de importações e o worker de geocoding."""
+    fila_importacoes.encerrar()
+    worker_geocoding.parar()
+
+
 @app.get("/")
 async def root():
     """Endpoint raiz."""
@@ -6,6 +6,10 @@ from app.models.ouvidoria import Ouvidoria
 from app.models.fiscal import Fiscal
 from app.models.indicador import Indicador
 from app.models.log_status import LogStatus
+from app.models.geocoding_cache import GeocodingCache
+from app.models.reclassificacao import ReclassificacaoSAC
+from app.models.importacao import Importacao
+from app.models.indicador_diario import IndicadorDiario
 
 __all__ = [
     "SAC",
@@ -15,5 +19,9 @@ __all__ = [
     "Fiscal",
     "Indicador",
     "LogStatus",
+    "GeocodingCache",
+    "ReclassificacaoSAC",
+    "Importacao",
+    "IndicadorDiario",
 ]
 
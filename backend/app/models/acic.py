@@ -63,6 +63,9 @@ class ACIC(Base):
     coordenada_resposta = Column(String, nullable=True)
     coordenada_vistoria = Column(String, nullable=True)
     
+    # Importação
+    hash_origem = Column(String(16), nullable=True)  # Hash do conteúdo da linha no CSV (importação incremental)
+    
     # Relacionamentos
     cnc = relationship("CNC", back_populates="acics")
     
@@ -60,6 +60,9 @@ class CNC(Base):
     # Flags
     aplicou_multa = Column(Boolean, default=False, index=True)
     
+    # Importação
+    hash_origem = Column(String(16), nullable=True)  # Hash do conteúdo da linha no CSV (importação incremental)
+    
     # Relacionamentos
     acics = relationship("ACIC", back_populates="cnc", cascade="all, delete-orphan")
     
@@ -0,0 +1,30 @@
+"""Model para cache de geocoding."""
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Float
+from app.database import Base
+
+
+class GeocodingCache(Base):
+    """
+    Cache persistente de geocoding (endereço normalizado -> coordenadas).
+    
+    Registros com lat/lng nulos são resultados negativos (endereço não
+    encontrado), também cacheados para não repetir a consulta.
+    """
+    __tablename__ = "geocoding_cache"
+    
+    endereco_normalizado = Column(String, primary_key=True)
+    endereco = Column(String, nullable=False)  # Endereço original da primeira consulta
+    
+    # Resultado (nulos = não encontrado)
+    lat = Column(Float, nullable=True)
+    lng = Column(Float, nullable=True)
+    
+    provider = Column(String, nullable=True)
+    
+    # Timestamps
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f"<GeocodingCache {self.endereco_normalizado} -> {self.lat},{self.lng}>"
@@ -0,0 +1,66 @@
+"""Model para o histórico de importações de CSV."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Float, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class Importacao(Base):
+    """
+    Importação de um arquivo do FLIP.
+    
+    O fingerprint (SHA-256 do arquivo) permite reconhecer um arquivo já
+    importado; as contagens separam linhas novas, alteradas e inalteradas
+    (pelo hash de conteúdo de cada linha).
+    
+    Também é o checkpoint da importação: cada bloco é commitado junto com
+    as linhas confirmadas até ali, e uma importação interrompida do mesmo
+    arquivo continua a partir delas.
+    
+    As métricas guardam, por etapa (leitura, comparação, classificação,
+    parse, geocoding, gravação, commit), o tempo, as linhas e as execuções,
+    para acompanhar a vazão das importações ao longo do tempo.
+    """
+    __tablename__ = "importacoes"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    entidade = Column(String, nullable=False)  # sacs, cnc, acic, ouvidoria
+    arquivo = Column(String, nullable=True)
+    fingerprint = Column(String(64), nullable=False)
+    tamanho_bytes = Column(BigInteger, nullable=True)
+    status = Column(String, nullable=False, default="concluida")  # em_andamento, concluida, repetida, erro
+    
+    # Contagens
+    total = Column(Integer, nullable=False, default=0)
+    novos = Column(Integer, nullable=False, default=0)
+    alterados = Column(Integer, nullable=False, default=0)
+    inalterados = Column(Integer, nullable=False, default=0)
+    erros = Column(Integer, nullable=False, default=0)
+    
+    # Checkpoint
+    linhas_confirmadas = Column(Integer, nullable=False, default=0)  # Linhas do arquivo (sem duplicados) já commitadas
+    blocos = Column(Integer, nullable=False, default=0)
+    retomadas = Column(Integer, nullable=False, default=0)
+    erro = Column(String, nullable=True)
+    
+    # Métricas (app.utils.instrumentacao.MedidorEtapas)
+    duracao_segundos = Column(Float, nullable=True)  # Tempo de processamento (soma das execuções, se retomada)
+    consultas_banco = Column(Integer, nullable=False, default=0)  # Comandos SQL, COPY e commits
+    chamadas_geocoder = Column(Integer, nullable=False, default=0)
+    metricas = Column(JSON, nullable=True)  # {"etapas": {etapa: {segundos, linhas, execucoes}}, "contadores": {...}}
+    
+    # Timestamps
+    iniciado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finalizado_em = Column(DateTime, nullable=True)
+    
+    # Índices
+    __table_args__ = (
+        Index("idx_importacao_entidade_finalizado", "entidade", "finalizado_em"),
+        Index("idx_importacao_entidade_fingerprint", "entidade", "fingerprint"),
+        Index("idx_importacao_iniciado", "iniciado_em"),
+    )
+    
+    def __repr__(self):
+        return f"<Importacao {self.entidade} {self.fingerprint[:12]} - {self.status}>"
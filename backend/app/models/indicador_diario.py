@@ -0,0 +1,33 @@
+"""Model para as contagens diárias usadas no cálculo dos indicadores."""
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, Date
+from app.database import Base
+
+
+class IndicadorDiario(Base):
+    """
+    Contagens de IRD, IA e IF por dia e subprefeitura.
+    
+    SACs entram pelo dia de `data_criacao` e CNCs pelo de `data_abertura`.
+    Mantida pela importação (só os dias afetados são recalculados, ver
+    app.services.indicadores_diarios), permite calcular os indicadores de um
+    período somando dias em vez de percorrer SACs e CNCs.
+    """
+    __tablename__ = "indicadores_diarios"
+    
+    dia = Column(Date, primary_key=True)
+    subprefeitura = Column(String(2), primary_key=True)  # Sigla; "" = CNC de subprefeitura não mapeada
+    
+    # SACs procedentes (Executado, Finalizado, Confirmada Execução)
+    reclamacoes = Column(Integer, nullable=False, default=0)  # Escalonados (IRD)
+    procedentes = Column(Integer, nullable=False, default=0)  # Demandantes com data de execução (IA)
+    no_prazo = Column(Integer, nullable=False, default=0)  # Demandantes executados no prazo (IA)
+    
+    # CNCs (IF)
+    fiscalizacoes = Column(Integer, nullable=False, default=0)
+    sem_irregularidade = Column(Integer, nullable=False, default=0)  # Status Regularizado
+    
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<IndicadorDiario {self.dia} {self.subprefeitura}>"
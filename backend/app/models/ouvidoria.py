@@ -85,6 +85,9 @@ class Ouvidoria(Base):
     # Evidências
     fotos = Column(JSON, nullable=True, default=list)
     
+    # Importação
+    hash_origem = Column(String(16), nullable=True)  # Hash do conteúdo da linha no CSV (importação incremental)
+    
     # Relacionamentos
     sac = relationship("SAC", back_populates="ouvidorias")
     
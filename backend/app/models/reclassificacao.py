@@ -0,0 +1,35 @@
+"""Model para checkpoints da reclassificação de SACs."""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+
+
+class ReclassificacaoSAC(Base):
+    """
+    Execução da reclassificação de tipo_servico/prazo dos SACs.
+    
+    Guarda o cursor (último id processado, em ordem de id) para que uma
+    execução interrompida continue de onde parou.
+    """
+    __tablename__ = "reclassificacoes_sac"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    versao_regras = Column(Integer, nullable=False, index=True)
+    status = Column(String, nullable=False, default="em_andamento")  # em_andamento, concluida, erro
+    
+    # Progresso
+    ultimo_id = Column(UUID(as_uuid=True), nullable=True)  # Cursor do keyset
+    lotes = Column(Integer, nullable=False, default=0)
+    processados = Column(Integer, nullable=False, default=0)  # SACs percorridos
+    atualizados = Column(Integer, nullable=False, default=0)  # SACs com tipo/prazo/versão gravados
+    erro = Column(String, nullable=True)
+    
+    # Timestamps
+    iniciado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finalizado_em = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<ReclassificacaoSAC v{self.versao_regras} - {self.status}>"
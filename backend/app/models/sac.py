@@ -59,12 +59,21 @@ class SAC(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     protocolo = Column(String, unique=True, nullable=False, index=True)
     tipo_servico = Column(Enum(TipoServico), nullable=False, index=True)
+    servico_texto = Column(String, nullable=True)  # Texto original da coluna Serviço (fonte da classificação)
+    regra_versao = Column(Integer, nullable=True)  # VERSAO_REGRAS usada para tipo_servico/prazo
     status = Column(Enum(StatusSAC), nullable=False, index=True)
     subprefeitura = Column(Enum(Subprefeitura), nullable=False, index=True)
     endereco_text = Column(String, nullable=False)
     lat = Column(Float, nullable=True)
     lng = Column(Float, nullable=True)
     bairro = Column(String, nullable=True)
+    
+    # Geocoding diferido (lat/lng preenchidos depois pelo worker de backfill)
+    geocode_status = Column(String, nullable=True, index=True)  # pendente, nao_encontrado, falhou
+    geocode_tentativas = Column(Integer, nullable=False, default=0, server_default="0")
+    geocode_proxima_tentativa = Column(DateTime, nullable=True)
+    geocode_erro = Column(String, nullable=True)
+    
     domicilio_id = Column(String, nullable=True)
     protocolo_origem = Column(String, nullable=True)
     
@@ -77,6 +86,7 @@ class SAC(Base):
     
     # Prazos e fiscal
     prazo_max_hours = Column(Integer, nullable=False)
+    responsividade = Column(Integer, nullable=True)  # Responsividade do CSV (entra no prazo)
     fiscal_id = Column(UUID(as_uuid=True), ForeignKey("fiscais.id"), nullable=True)
     
     # Evidências
@@ -87,6 +97,7 @@ class SAC(Base):
     # Flags
     flag_erro_regional = Column(Boolean, default=False, index=True)
     inserted_from_csv = Column(Boolean, default=False)
+    hash_origem = Column(String(16), nullable=True)  # Hash do conteúdo da linha no CSV (importação incremental)
     
     # Relacionamentos
     fiscal = relationship("Fiscal", back_populates="sacs")
@@ -2,6 +2,7 @@
 from app.schemas.sac import SACCreate, SACUpdate, SACResponse, SACList
 from app.schemas.cnc import CNCCreate, CNCResponse, CNCList
 from app.schemas.indicador import IndicadorResponse, IndicadorCreate, IndicadorList
+from app.schemas.importacao import ImportacaoResponse, ImportacaoList
 
 __all__ = [
     "SACCreate",
@@ -14,5 +15,7 @@ __all__ = [
     "IndicadorResponse",
     "IndicadorCreate",
     "IndicadorList",
+    "ImportacaoResponse",
+    "ImportacaoList",
 ]
 
@@ -0,0 +1,50 @@
+"""Schemas para o histórico de importações."""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, computed_field
+from uuid import UUID
+
+
+class ImportacaoResponse(BaseModel):
+    """Schema de resposta para uma importação (com as métricas por etapa)."""
+    id: UUID
+    entidade: str
+    arquivo: Optional[str] = None
+    fingerprint: str
+    tamanho_bytes: Optional[int] = None
+    status: str
+    total: int
+    novos: int
+    alterados: int
+    inalterados: int
+    erros: int
+    linhas_confirmadas: int
+    blocos: int
+    retomadas: int
+    erro: Optional[str] = None
+    duracao_segundos: Optional[float] = None
+    consultas_banco: int
+    chamadas_geocoder: int
+    metricas: Optional[Dict[str, Any]] = None
+    iniciado_em: datetime
+    atualizado_em: datetime
+    finalizado_em: Optional[datetime] = None
+    
+    @computed_field
+    @property
+    def linhas_por_segundo(self) -> Optional[float]:
+        """Vazão da importação (linhas do arquivo por segundo de processamento)."""
+        if not self.duracao_segundos:
+            return None
+        return round(self.linhas_confirmadas / self.duracao_segundos, 1)
+    
+    class Config:
+        from_attributes = True
+
+
+class ImportacaoList(BaseModel):
+    """Schema para listagem de importações."""
+    items: List[ImportacaoResponse]
+    total: int
+    page: int
+    page_size: int
@@ -0,0 +1,120 @@
+"""Cache em memória dos cálculos de IRD, IA e IF (LRU com TTL, por versão dos dados)."""
+import copy
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+T = TypeVar("T")
+
+# Entidades cujos registros entram nos indicadores (IRD e IA: sacs; IF: cnc)
+ENTIDADES = ("sacs", "cnc")
+
+# Chave em Session.info com as entidades alteradas na transação
+_ALTERADAS = "indicadores_entidades_alteradas"
+
+
+class CacheIndicadores:
+    """
+    LRU dos resultados de IndicadoresService, compartilhado pelo processo.
+    
+    A chave de cada resultado inclui a versão dos dados (uma por entidade).
+    A versão sobe quando uma transação que alterou a entidade é commitada
+    (`marcar_alteracao`), então resultados calculados antes deixam de ser
+    encontrados e saem pelo LRU. O TTL limita a validade de um resultado
+    quando os dados são alterados por outro processo.
+    """
+    
+    def __init__(self, tamanho: int, ttl_segundos: float):
+        self.tamanho = tamanho
+        self.ttl_segundos = ttl_segundos
+        self._itens: "OrderedDict[Tuple, Tuple[Any, float]]" = OrderedDict()
+        self._versoes: Counter = Counter()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirados = 0
+    
+    def versao(self) -> Tuple[int, ...]:
+        """Versão atual dos dados (uma posição por entidade de ENTIDADES)."""
+        return tuple(self._versoes[entidade] for entidade in ENTIDADES)
+    
+    def obter_ou_calcular(self, chave: Tuple[Hashable, ...], calcular: Callable[[], T]) -> T:
+        """
+        Retorna o resultado guardado para `chave` na versão atual ou o calcula.
+        
+        O resultado é copiado na entrada e na saída: quem chama pode
+        alterá-lo sem afetar o cache.
+        """
+        if self.tamanho <= 0 or self.ttl_segundos <= 0:
+            return calcular()
+        
+        chave = (*chave, self.versao())
+        agora = time.monotonic()
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is not None and item[1] <= agora:
+                del self._itens[chave]
+                self.expirados += 1
+                item = None
+            if item is not None:
+                self.hits += 1
+                self._itens.move_to_end(chave)
+                return copy.deepcopy(item[0])
+            self.misses += 1
+        
+        valor = calcular()
+        with self._lock:
+            self._itens[chave] = (copy.deepcopy(valor), agora + self.ttl_segundos)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+        return valor
+    
+    def invalidar(self, *entidades: str) -> None:
+        """Nova versão dos dados das entidades (padrão: todas)."""
+        with self._lock:
+            for entidade in entidades or ENTIDADES:
+                self._versoes[entidade] += 1
+    
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+    
+    def estatisticas(self) -> Dict[str, Any]:
+        consultas = self.hits + self.misses
+        return {
+            "itens": len(self._itens),
+            "tamanho": self.tamanho,
+            "ttl_segundos": self.ttl_segundos,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirados": self.expirados,
+            "taxa_acerto": round(self.hits / consultas, 4) if consultas else None,
+            "versoes": {entidade: self._versoes[entidade] for entidade in ENTIDADES},
+        }
+
+
+cache_indicadores = CacheIndicadores(settings.INDICADORES_CACHE_TAMANHO, settings.INDICADORES_CACHE_TTL_SEGUNDOS)
+
+
+def marcar_alteracao(db: Session, *entidades: str) -> None:
+    """Invalida os indicadores das entidades quando a transação de `db` for commitada."""
+    db.info.setdefault(_ALTERADAS, set()).update(entidades or ENTIDADES)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidar_no_commit(session: Session) -> None:
+    entidades = session.info.pop(_ALTERADAS, None)
+    if entidades:
+        cache_indicadores.invalidar(*entidades)
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_no_rollback(session: Session) -> None:
+    session.info.pop(_ALTERADAS, None)
@@ -1,683 +1,1629 @@
 """Processamento de CSVs do FLIP."""
+import numpy as np
 import pandas as pd
 import pandas.errors
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Callable, FrozenSet, Iterable, Iterator, NamedTuple, Optional, Tuple
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from datetime import datetime
+import contextlib
+import functools
+import itertools
+import os
+from collections import Counter
 import logging
+import time
 import csv
 
+from app.config import settings
 from app.models.sac import SAC, TipoServico, StatusSAC, Subprefeitura
 from app.models.cnc import CNC, StatusCNC
 from app.models.acic import ACIC, StatusACIC
 from app.models.ouvidoria import Ouvidoria, StatusOuvidoria
-from app.utils.validators import parse_data_brasil, normalizar_subprefeitura, calcular_prazo_max_hours
-from app.utils.geocoding import parse_coordenadas, geocode_endereco
+from app.models.importacao import Importacao
+from app.utils.validators import (
+    parse_data_brasil_serie,
+    normalizar_subprefeitura,
+)
+from app.utils.colunar import COLUNA_HASH, agrupar_lotes, formato_colunar, ler_colunar_em_blocos, schema_entidade
+from app.utils.compressao import abrir_csv
+from app.utils.classificacao_servico import VERSAO_REGRAS, classificar_servico, prazo_servico
+from app.utils.fingerprint import fingerprint_arquivo, hash_linhas
+from app.utils.geocoding import parse_coordenadas, parse_coordenadas_serie
+from app.utils.instrumentacao import MedidorEtapas
+from app.services.geocoding_backfill import GEOCODE_PENDENTE
+from app.services.gazetteer import gazetteer_local
+from app.services.geocoding_cache import GeocodingCacheService
+from app.services import indicadores_diarios
+from app.services.gravacao_lote import copiar_para_staging, dataframe_de_registros, executar
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+class LayoutCSV(NamedTuple):
+    """
+    Colunas de um CSV do FLIP consumidas por um processador.
+    
+    As demais colunas do export (dados pessoais, usuários, etc.) não são
+    lidas; as de baixa cardinalidade são lidas como categóricas.
+    """
+    colunas: FrozenSet[str]
+    categoricas: FrozenSet[str] = frozenset()
+    
+    def selecionar(self, cabecalho: Iterable[str]) -> Tuple[List[str], Dict[str, str]]:
+        """Colunas do cabeçalho a ler (nomes originais) e o dtype de cada uma."""
+        usecols = [coluna for coluna in cabecalho if coluna.strip() in self.colunas]
+        dtype = {
+            coluna: "category" if coluna.strip() in self.categoricas else str
+            for coluna in usecols
+        }
+        return usecols, dtype
+
+
+LAYOUT_SAC = LayoutCSV(
+    colunas=frozenset({
+        "Numero_Chamado", "Status", "Serviço", "Regional", "Endereço", "Área",
+        "Coordenadas", "Responsividade", "Data_Registro", "Data_Realização_Vistoria",
+        "Data_Acionamento_Agendamento", "Data_Execução", "Data_Alteração_SAC",
+    }),
+    categoricas=frozenset({"Status", "Serviço", "Regional", "Área"}),
+)
+
+LAYOUT_CNC = LayoutCSV(
+    colunas=frozenset({
+        "N_BFS", "N_CNC", "Situacao_CNC", "Regional", "Area", "Setor", "Turno",
+        "Servico", "Endereco", "Coordenada", "Responsividade", "Fiscal_Contratada",
+        "Fiscal", "Data_Sincronizacao", "Data_Fiscalizacao", "Data_Execução",
+    }),
+    categoricas=frozenset({"Situacao_CNC", "Regional", "Area", "Turno", "Servico"}),
+)
+
+LAYOUT_ACIC = LayoutCSV(
+    colunas=frozenset({
+        "N_ACIC", "N_BFS", "N_CNC", "Status", "Servico", "Responsavel",
+        "Agente_Fiscalizador", "Contratada", "Regional", "Area", "Setor", "Turno",
+        "Descricao", "Valor_Multa", "Clausula_Contratual", "Observacao", "Endereco",
+        "Data_Fiscalizacao", "Data_Sincronizacao", "Data_Execução", "Data_ACIC",
+        "Data_Confirmacao",
+    }),
+    categoricas=frozenset({"Status", "Servico", "Contratada", "Regional", "Area", "Turno"}),
+)
+
+LAYOUT_OUVIDORIA = LayoutCSV(
+    colunas=frozenset({
+        "Numero_Chamado", "Número_SEI", "Status", "Situação", "Contratada", "Origem",
+        "Procedente", "Procedente_por_status", "Regional", "Área", "Serviço", "Assunto",
+        "Endereço", "Coordenadas", "Responsividade", "Data_Registro", "Data_Execução",
+    }),
+    categoricas=frozenset({
+        "Status", "Situação", "Contratada", "Origem", "Procedente",
+        "Procedente_por_status", "Regional", "Área", "Serviço",
+    }),
+)
+
+# Entidade -> (layout, coluna de identificação no CSV)
+LAYOUTS = {
+    "sacs": (LAYOUT_SAC, "Numero_Chamado"),
+    "cnc": (LAYOUT_CNC, "N_BFS"),
+    "acic": (LAYOUT_ACIC, "N_ACIC"),
+    "ouvidoria": (LAYOUT_OUVIDORIA, "Numero_Chamado"),
+}
+
+
+class BlocoPreparado(NamedTuple):
+    """
+    Bloco com o preparo adiantado fora do banco (`CSVProcessor.preparar_bloco`).
+    
+    `dados` traz o hash de cada linha (COLUNA_HASH); `preparado` é o
+    resultado do preparo do bloco inteiro: colunas tipadas dos SACs (sem o
+    geocoding) ou (registros, erros) das demais entidades. None quando o
+    preparo fica para o processador.
+    """
+    dados: pd.DataFrame
+    preparado: Any = None
+
+
+# ACIC -> CNC pelo N_BFS, resolvido no próprio INSERT (sem consulta por linha)
+VINCULO_CNC = {"cnc_id": "(SELECT c.id FROM cnc AS c WHERE c.bfs = s.n_bfs)"}
+
+# Ouvidoria -> SAC de origem: toda Ouvidoria mantém o número de protocolo do SAC
+VINCULO_SAC = {"sac_id": "(SELECT sc.id FROM sacs AS sc WHERE sc.protocolo = s.numero_chamado)"}
+
+# Autor e motivo das mudanças de status registradas pela importação em logs_status
+USUARIO_IMPORTACAO = "FLIP"
+MOTIVO_IMPORTACAO = "Importação CSV"
+
+# Texto do status no FLIP -> status gravado. Valores fora do mapa caem no
+# padrão de cada entidade (SAC: Aguardando Análise; CNC: Pendente; ACIC e
+# Ouvidoria: sem status)
+STATUS_SAC = {
+    "Aguardando Análise": StatusSAC.AGUARDANDO_ANALISE,
+    "Aguardando Agendamento": StatusSAC.AGUARDANDO_AGENDAMENTO,
+    "Aguardando Revistoria": StatusSAC.AGUARDANDO_REVISTORIA,
+    "Não Procede": StatusSAC.NAO_PROCEDE,
+    "Em Execução": StatusSAC.EM_EXECUCAO,
+    "Executado": StatusSAC.EXECUTADO,
+    "Finalizado": StatusSAC.FINALIZADO,
+    "Confirmar Execução": StatusSAC.CONFIRMAR_EXECUCAO,
+    "Confirmada Execução": StatusSAC.CONFIRMADA_EXECUCAO,
+    "Não Confirmada Execução": StatusSAC.NAO_CONFIRMADA_EXECUCAO,
+    "Confirmar Fora de Escopo": StatusSAC.CONFIRMAR_FORA_ESCOPO,
+}
+STATUS_CNC = {
+    "Regularizado": StatusCNC.REGULARIZADO,
+    "Aguardando Vistoria": StatusCNC.AGUARDANDO_VISTORIA,
+}
+STATUS_ACIC = {
+    "Confirmado": StatusACIC.CONFIRMADO,
+    "Solicitacao": StatusACIC.SOLICITACAO,
+}
+STATUS_OUVIDORIA = {
+    "Ouvidoria Encerrada": StatusOuvidoria.OUVIDORIA_ENCERRADA,
+    "Em Execução": StatusOuvidoria.EM_EXECUCAO,
+    "Finalizado": StatusOuvidoria.FINALIZADO,
+    "Executado": StatusOuvidoria.EXECUTADO,
+}
+
+# Estados do registro de importação (importacoes.status)
+EM_ANDAMENTO = "em_andamento"
+CONCLUIDA = "concluida"
+REPETIDA = "repetida"
+ERRO = "erro"
+
+# Máximo de N_BFS sem CNC listados no resultado da importação
+MAX_BFS_SEM_CNC = 50
+
+
+def _coluna(df: pd.DataFrame, nome: str) -> pd.Series:
+    """Retorna a coluna do DataFrame ou uma coluna vazia se ela não existir."""
+    if nome in df.columns:
+        return df[nome]
+    return pd.Series(None, index=df.index, dtype=object)
+
+
+def _coluna_texto(df: pd.DataFrame, nome: str) -> pd.Series:
+    """
+    Equivalente vetorizado de `str(row.get(nome, "")).strip()`.
+    
+    Mantém a mesma semântica do processamento linha a linha: valores
+    ausentes viram "nan" e colunas inexistentes viram string vazia.
+    """
+    if nome not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    serie = df[nome].astype(object)
+    return serie.where(serie.notna(), "nan").astype(str).str.strip().astype(object)
+
+
+def _mapear_unicos(func, *series: pd.Series) -> pd.Series:
+    """
+    Aplica `func` uma vez por combinação distinta de valores das séries.
+    
+    Os valores são fatorados em códigos inteiros e o resultado é propagado
+    de volta para todas as linhas por indexação, sem laço por linha.
+    """
+    combinado = np.zeros(len(series[0]), dtype=np.int64)
+    fatorados = []
+    for serie in series:
+        codigos, valores = pd.factorize(serie, use_na_sentinel=False)
+        combinado = combinado * len(valores) + codigos
+        fatorados.append((codigos, valores))
+    
+    codigos_combinados, combinacoes = pd.factorize(combinado)
+    _, primeiras = np.unique(codigos_combinados, return_index=True)
+    
+    resultados = np.empty(len(combinacoes), dtype=object)
+    for i, linha in enumerate(primeiras):
+        resultados[i] = func(*(valores[codigos[linha]] for codigos, valores in fatorados))
+    
+    return pd.Series(resultados[codigos_combinados], index=series[0].index, dtype=object)
+
+
+def _sem_duplicados(blocos: Iterable[pd.DataFrame], chave: str) -> Iterator[pd.DataFrame]:
+    """
+    Remove duplicados da coluna `chave` dentro de cada bloco e entre blocos.
+    
+    Mantém a primeira ocorrência, como `drop_duplicates(keep="first")` sobre
+    o arquivo inteiro; só as chaves já vistas ficam em memória.
+    """
+    vistos = set()
+    for bloco in blocos:
+        bloco = bloco.drop_duplicates(subset=[chave], keep="first")
+        bloco = bloco[~bloco[chave].isin(vistos)]
+        vistos.update(bloco[chave].tolist())
+        yield bloco
+
+
+def _pular_linhas(blocos: Iterable[Any], linhas: int) -> Iterator[BlocoPreparado]:
+    """
+    Descarta as primeiras `linhas` linhas dos blocos (já commitadas antes).
+    
+    O checkpoint conta linhas sem duplicados, que não dependem do tamanho
+    do bloco: a retomada funciona mesmo com outro `chunksize`. Os blocos
+    podem vir como DataFrame ou já preparados; saem como BlocoPreparado.
+    """
+    for bloco in blocos:
+        if not isinstance(bloco, BlocoPreparado):
+            bloco = BlocoPreparado(bloco)
+        tamanho = len(bloco.dados)
+        if linhas >= tamanho:
+            linhas -= tamanho
+            continue
+        if linhas:
+            bloco = BlocoPreparado(*_restantes(bloco.dados, bloco.preparado, np.arange(tamanho) >= linhas))
+            linhas = 0
+        yield bloco
+
+
+def _linhas_do_bloco(bloco: BlocoPreparado) -> int:
+    """Linhas de um bloco, para a medição da leitura."""
+    return len(bloco.dados)
+
+
+def _restantes(df: pd.DataFrame, preparado: Any, manter: Any) -> Tuple[pd.DataFrame, Any]:
+    """
+    Linhas do bloco que seguem para a gravação, com o preparo correspondente.
+    
+    Colunas preparadas (SACs) são recortadas junto com o bloco. Registros
+    (demais entidades) valem só para o bloco inteiro: se alguma linha sai,
+    são descartados e o parser roda apenas sobre as restantes.
+    """
+    manter = np.asarray(manter, dtype=bool)
+    if manter.all():
+        return df, preparado
+    if isinstance(preparado, pd.DataFrame):
+        preparado = preparado[manter]
+    else:
+        preparado = None
+    return df[manter], preparado
+
+
+def _colunas_data(df: pd.DataFrame, nomes: Iterable[str]) -> Dict[str, pd.Series]:
+    """
+    Converte as colunas de data do bloco de uma vez (`parse_data_brasil_serie`).
+    
+    Os valores ficam como Timestamp ou None, para uso no laço por linha.
+    """
+    datas = {}
+    for nome in nomes:
+        serie = parse_data_brasil_serie(_coluna(df, nome))
+        datas[nome] = serie.astype(object).where(serie.notna(), None)
+    return datas
+
+
+def _anexar_hashes(registros: List[Dict[str, Any]], chave: str, comparacao: pd.DataFrame) -> None:
+    """Preenche hash_origem dos registros a partir da comparação do bloco."""
+    hash_por_chave = dict(zip(comparacao["chave"], comparacao["hash"]))
+    for registro in registros:
+        registro["hash_origem"] = hash_por_chave.get(registro[chave])
+
+
+def _parse_responsividade(valor: Any) -> Optional[int]:
+    """Converte a coluna Responsividade para inteiro (None se ausente ou inválida)."""
+    if pd.isna(valor):
+        return None
+    try:
+        return int(float(valor))
+    except (TypeError, ValueError):
+        return None
+
+
+def _instrumentado(metodo):
+    """
+    Mede a importação com um MedidorEtapas novo, ativo durante a chamada.
+    
+    As etapas, as idas ao banco e as chamadas ao geocoder vão para o
+    resultado e para o registro da importação.
+    """
+    @functools.wraps(metodo)
+    def executar_medido(self, *args, **kwargs):
+        self.medidor = MedidorEtapas()
+        with self.medidor.ativo():
+            return metodo(self, *args, **kwargs)
+    return executar_medido
+
+
 class CSVProcessor:
     """Processador de CSVs do FLIP."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, progresso: Optional[Callable[[str, int], None]] = None):
+        """
+        Args:
+            db: Sessão do banco
+            progresso: Callback opcional chamado com (etapa, linhas lidas)
+                a cada bloco processado e antes do commit
+        """
         self.db = db
+        self.progresso = progresso
+        self.geocoding = GeocodingCacheService(db)
+        self.medidor = MedidorEtapas()
+    
+    def _notificar(self, etapa: str, linhas: int) -> None:
+        """Repassa o progresso da importação ao callback, se houver."""
+        if self.progresso:
+            self.progresso(etapa, linhas)
+    
+    def ler_blocos(self, entidade: str, file_path: str, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Blocos do arquivo da entidade, sem duplicados, como os processadores os consomem.
+        
+        Aceita o CSV do FLIP (puro ou compactado) ou um Parquet/Arrow IPC
+        gerado por `scripts.converter_parquet`, já com as datas tipadas.
+        Não usa o banco: pode ser executado em outro processo (importação
+        em pacote) e o resultado passado aos processadores em `blocos`.
+        """
+        layout, chave = LAYOUTS[entidade]
+        if formato_colunar(file_path):
+            schema = schema_entidade(entidade, layout.colunas, layout.categoricas)
+            blocos = ler_colunar_em_blocos(file_path, chunksize or settings.IMPORT_CHUNK_SIZE, schema)
+        elif entidade == "acic":
+            blocos = self._ler_acic_em_blocos(file_path, chunksize)
+        else:
+            blocos = self._ler_csv_em_blocos(file_path, chunksize, layout)
+        return _sem_duplicados(blocos, chave)
+    
+    def preparar_bloco(self, entidade: str, df: pd.DataFrame) -> BlocoPreparado:
+        """
+        Adianta a parte do preparo de um bloco de `ler_blocos` que não usa o banco.
+        
+        Calcula o hash das linhas (COLUNA_HASH, usado na comparação) e o
+        parse do bloco inteiro: status, serviço, prazo, coordenadas e datas
+        dos SACs (o geocoding fica para a gravação) ou os registros das
+        demais entidades. Executado nos processos da importação em pacote;
+        o resultado é passado aos processadores em `blocos`.
+        """
+        _, chave = LAYOUTS[entidade]
+        if COLUNA_HASH not in df.columns:
+            df = df.assign(**{COLUNA_HASH: hash_linhas(df)})
+        if entidade == "sacs":
+            # As colunas preparadas substituem as do CSV: bastam a chave e o hash
+            return BlocoPreparado(df[[chave, COLUNA_HASH]], self._converter_sacs(df))
+        return BlocoPreparado(df, getattr(self, f"_preparar_{entidade}")(df))
     
-    def processar_sacs_csv(self, file_path: str) -> Dict[str, Any]:
+    @_instrumentado
+    def processar_sacs_csv(
+        self,
+        file_path: str,
+        chunksize: Optional[int] = None,
+        blocos: Optional[Iterable[pd.DataFrame]] = None,
+        commit: bool = True,
+    ) -> Dict[str, Any]:
         """
         Processa CSV de SACs.
         
+        O arquivo é lido em blocos de `chunksize` linhas (padrão
+        settings.IMPORT_CHUNK_SIZE), então a memória usada depende do tamanho
+        do bloco e não do tamanho do arquivo. Em cada bloco o parse (status,
+        tipo de serviço, subprefeitura, coordenadas e datas) é feito coluna a
+        coluna e a gravação é set-based: o bloco vai para uma tabela de
+        staging via COPY e é aplicado com um UPDATE e um INSERT ... ON CONFLICT.
+        
+        Com IMPORT_CHECKPOINT cada bloco é commitado junto com o checkpoint
+        em `importacoes`; se a importação falhar, importar o mesmo arquivo
+        de novo continua do último bloco commitado (`_iniciar_importacao`).
+        
+        Args:
+            file_path: Caminho do CSV
+            chunksize: Linhas por bloco
+            blocos: Blocos já lidos (`ler_blocos`) ou preparados
+                (`preparar_bloco`); padrão: lê `file_path`
+            commit: Se False, a gravação fica na transação do chamador
+                (um commit só, sem checkpoints)
+        
         Returns:
             Dict com estatísticas do processamento
         """
+        inicio = time.perf_counter()
+        importacao = None
         try:
-            df = pd.read_csv(file_path, sep=";", encoding="utf-8", low_memory=False)
-            
-            # Normalizar nomes de colunas (remover acentos e espaços)
-            df.columns = df.columns.str.strip()
-            
-            # Remover duplicados dentro do próprio CSV
-            df = df.drop_duplicates(subset=["Numero_Chamado"], keep="first")
-            
-            # Buscar todos os protocolos existentes de uma vez (mais eficiente)
-            protocolos_list = [str(proto).strip() for proto in df["Numero_Chamado"].dropna().tolist() if str(proto).strip()]
-            sacs_existentes = {}
-            if protocolos_list:
-                sacs_existentes = {
-                    sac.protocolo: sac for sac in self.db.query(SAC).filter(
-                        SAC.protocolo.in_(protocolos_list)
-                    ).all()
-                }
+            fingerprint = fingerprint_arquivo(file_path)
+            repetida = self._importacao_repetida("sacs", file_path, fingerprint, commit)
+            if repetida:
+                return {**repetida, "atualizados": 0}
             
+            importacao = self._iniciar_importacao("sacs", file_path, fingerprint, commit)
+            retomado_de = importacao.linhas_confirmadas
             processados = 0
             atualizados = 0
-            erros = 0
+            erros = importacao.erros
+            total = importacao.total
+            contagens = {"novos": importacao.novos, "alterados": importacao.alterados, "inalterados": importacao.inalterados}
             
-            for _, row in df.iterrows():
-                try:
-                    # Verificar se já existe
-                    protocolo = str(row.get("Numero_Chamado", "")).strip()
-                    if not protocolo:
-                        erros += 1
-                        continue
-                    
-                    # Verificar se já existe no banco
-                    sac_existente = sacs_existentes.get(protocolo)
-                    
-                    # Parse de dados
-                    status_str = str(row.get("Status", "")).strip()
-                    status = self._parse_status_sac(status_str)
-                    
-                    tipo_servico_str = str(row.get("Serviço", "")).strip()
-                    tipo_servico = self._parse_tipo_servico(tipo_servico_str)
-                    
-                    subpref_str = str(row.get("Regional", "")).strip()
-                    subprefeitura = self._parse_subprefeitura(subpref_str)
-                    
-                    endereco = str(row.get("Endereço", "")).strip()
-                    coordenadas_str = str(row.get("Coordenadas", "")).strip()
-                    
-                    # Parse coordenadas
-                    lat, lng = None, None
-                    if coordenadas_str and coordenadas_str != "nan":
-                        coords = parse_coordenadas(coordenadas_str)
-                        if coords:
-                            lat, lng = coords
-                    
-                    # Se não tem coordenadas, tentar geocoding
-                    if not lat or not lng:
-                        coords = geocode_endereco(endereco)
-                        if coords:
-                            lat, lng = coords
-                    
-                    # Parse datas
-                    data_registro = parse_data_brasil(str(row.get("Data_Registro", "")))
-                    data_vistoria = parse_data_brasil(str(row.get("Data_Realização_Vistoria", "")))
-                    data_agendamento = parse_data_brasil(str(row.get("Data_Acionamento_Agendamento", "")))
-                    data_execucao = parse_data_brasil(str(row.get("Data_Execução", "")))
-                    
-                    # Calcular prazo
-                    # IMPORTANTE: Para Cata-Bagulho (Escalonado), sempre usar 720h (30 dias)
-                    # mesmo que tenha responsividade de 5h no CSV (esse é só prazo de vistoria)
-                    responsividade = row.get("Responsividade")
-                    if pd.notna(responsividade):
-                        try:
-                            responsividade = int(responsividade)
-                        except:
-                            responsividade = None
-                    
-                    # Se for Cata-Bagulho, ignorar responsividade e usar 720h
-                    if tipo_servico == TipoServico.CATABAGULHO:
-                        prazo_max_hours = 720  # 30 dias - Escalonado, não importa prazo
-                    else:
-                        prazo_max_hours = calcular_prazo_max_hours(tipo_servico_str, responsividade)
-                    
-                    if sac_existente:
-                        # Atualizar SAC existente
-                        sac_existente.tipo_servico = tipo_servico
-                        sac_existente.status = status
-                        sac_existente.subprefeitura = subprefeitura
-                        sac_existente.endereco_text = endereco
-                        if lat and lng:
-                            sac_existente.lat = lat
-                            sac_existente.lng = lng
-                        if str(row.get("Área", "")).strip():
-                            sac_existente.bairro = str(row.get("Área", "")).strip()
-                        if data_registro:
-                            sac_existente.data_criacao = data_registro
-                        if data_vistoria:
-                            sac_existente.data_vistoria = data_vistoria
-                        if data_agendamento:
-                            sac_existente.data_agendamento = data_agendamento
-                        if data_execucao:
-                            sac_existente.data_execucao = data_execucao
-                        sac_existente.prazo_max_hours = prazo_max_hours
-                        sac_existente.inserted_from_csv = True
-                        
-                        # Verificar se foi executado fora do prazo (apenas para demandantes)
-                        tipos_demandantes = [TipoServico.ENTULHO, TipoServico.ANIMAL_MORTO, TipoServico.PAPELEIRAS]
-                        if tipo_servico in tipos_demandantes and data_execucao and sac_existente.data_criacao:
-                            tempo_decorrido_hours = (data_execucao - sac_existente.data_criacao).total_seconds() / 3600
-                            if tempo_decorrido_hours > prazo_max_hours:
-                                # O cálculo do IA já considera isso automaticamente, mas podemos marcar
-                                # que foi executado fora do prazo para referência
-                                logger.info(f"SAC {protocolo} executado fora do prazo: {tempo_decorrido_hours:.2f}h > {prazo_max_hours}h")
-                        
-                        atualizados += 1
-                    else:
-                        # Criar novo SAC
-                        sac = SAC(
-                            protocolo=protocolo,
-                            tipo_servico=tipo_servico,
-                            status=status,
-                            subprefeitura=subprefeitura,
-                            endereco_text=endereco,
-                            lat=lat,
-                            lng=lng,
-                            bairro=str(row.get("Área", "")).strip() or None,
-                            data_criacao=data_registro or datetime.utcnow(),
-                            data_vistoria=data_vistoria,
-                            data_agendamento=data_agendamento,
-                            data_execucao=data_execucao,
-                            prazo_max_hours=prazo_max_hours,
-                            inserted_from_csv=True,
-                        )
-                        self.db.add(sac)
-                        sacs_existentes[protocolo] = sac  # Adicionar à lista para evitar duplicados no mesmo batch
-                        processados += 1
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao processar SAC {protocolo}: {e}")
-                    erros += 1
+            if blocos is None:
+                blocos = self.ler_blocos("sacs", file_path, chunksize)
+            for df, preparado in self.medidor.iterar("leitura", _pular_linhas(blocos, retomado_de), _linhas_do_bloco):
+                total += len(df)
+                with self.medidor.etapa("comparacao", len(df)):
+                    comparacao = self.comparar_hashes(df, "sacs", "protocolo", "Numero_Chamado", contagens)
+                if settings.IMPORT_INCREMENTAL:
+                    # Protocolos idênticos à última importação não são reprocessados
+                    df, preparado = _restantes(df, preparado, ~comparacao["inalterado"])
+                if df.empty:
+                    self._checkpoint(importacao, total, erros, contagens, commit)
+                    self._notificar("gravando", total)
                     continue
+                
+                preparados = self._preparar_sacs(df, preparado)
+                preparados["hash_origem"] = comparacao["hash"]
+                
+                # Protocolos vazios não podem ser gravados
+                sem_protocolo = preparados["protocolo"] == ""
+                erros += int(sem_protocolo.sum())
+                preparados = preparados[~sem_protocolo].drop_duplicates(subset=["protocolo"], keep="first")
+                
+                with self.medidor.etapa("gravacao", len(preparados)):
+                    inseridos, atualizados_bloco = self._gravar_sacs(preparados)
+                self._registrar_execucoes_fora_do_prazo(preparados)
+                
+                processados += inseridos
+                atualizados += atualizados_bloco
+                self._checkpoint(importacao, total, erros, contagens, commit)
+                self._notificar("gravando", total)
             
-            try:
-                self.db.commit()
-            except Exception as e:
-                self.db.rollback()
-                logger.error(f"Erro ao commitar SACs: {e}")
-                raise
+            self._concluir_importacao(importacao, total, erros, contagens)
+            if commit:
+                self._notificar("commit", total)
+                try:
+                    with self.medidor.etapa("commit"):
+                        self.db.commit()
+                except Exception as e:
+                    self.db.rollback()
+                    logger.error(f"Erro ao commitar SACs: {e}")
+                    raise
+                
+                # Novas coordenadas conhecidas entram no gazetteer local
+                gazetteer_local.invalidar()
             
+            duracao = time.perf_counter() - inicio
             return {
                 "processados": processados,
                 "atualizados": atualizados,
                 "erros": erros,
-                "total": len(df)
+                "total": total,
+                **contagens,
+                "retomado_de": retomado_de,
+                "transicoes_status": self.medidor.contadores["transicoes_status"],
+                **self._metricas(),
+                "duracao_segundos": round(duracao, 3),
+                "linhas_por_segundo": round(total / duracao, 1) if duracao > 0 else None,
+                "geocoding": self.geocoding.estatisticas(),
             }
             
         except Exception as e:
             self.db.rollback()
+            self._registrar_erro(importacao, e, commit)
             logger.error(f"Erro ao processar CSV de SACs: {e}")
             raise
     
-    def processar_cnc_csv(self, file_path: str) -> Dict[str, Any]:
-        """Processa CSV de CNCs."""
-        try:
-            df = pd.read_csv(file_path, sep=";", encoding="utf-8", low_memory=False)
-            df.columns = df.columns.str.strip()
+    def _preparar_sacs(self, df: pd.DataFrame, preparado: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Converte o DataFrame bruto de SACs em colunas já tipadas.
+        
+        A conversão sem banco (`_converter_sacs`) pode vir pronta em
+        `preparado` (importação em pacote); aqui só falta completar as
+        coordenadas pelo geocoding. Cada parte é medida como uma etapa
+        (classificação, parse, geocoding).
+        
+        Returns:
+            DataFrame com um registro por linha do CSV, pronto para gravação
+        """
+        preparados = self._converter_sacs(df) if preparado is None else preparado.copy()
+        
+        # Se não tem coordenadas, tentar geocoding (via cache, uma consulta por endereço distinto).
+        # Com GEOCODING_DIFERIDO só o cache é consultado: o que faltar fica
+        # "pendente" para o worker de backfill, fora do caminho da importação.
+        sem_coordenadas = preparados["lat"].isna() | preparados["lng"].isna()
+        if sem_coordenadas.any():
+            enderecos = preparados.loc[sem_coordenadas, "endereco"]
+            chamadas_antes = self.geocoding.misses
+            with self.medidor.etapa("geocoding", int(sem_coordenadas.sum())):
+                if settings.GEOCODING_DIFERIDO:
+                    resultados = self.geocoding.consultar_cache(enderecos.unique())
+                else:
+                    resultados = self.geocoding.geocodificar_lote(enderecos.unique())
+            self.medidor.contar("chamadas_geocoder", self.geocoding.misses - chamadas_antes)
+            encontrados = {endereco: coords for endereco, coords in resultados.items() if coords}
+            preparados.loc[sem_coordenadas, "lat"] = enderecos.map({e: c[0] for e, c in encontrados.items()}).astype(float)
+            preparados.loc[sem_coordenadas, "lng"] = enderecos.map({e: c[1] for e, c in encontrados.items()}).astype(float)
+        
+        preparados["geocode_status"] = None
+        if settings.GEOCODING_DIFERIDO:
+            pendente = preparados["lat"].isna() & (preparados["endereco"] != "")
+            preparados.loc[pendente, "geocode_status"] = GEOCODE_PENDENTE
+        
+        return preparados
+    
+    def _converter_sacs(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Parte do preparo dos SACs que não usa o banco.
+        
+        Mapeamentos de status, tipo de serviço, subprefeitura e prazo são
+        calculados uma vez por valor distinto; coordenadas e datas são
+        convertidas como operações de coluna. Coordenadas ausentes ficam
+        vazias (NaN) para o geocoding.
+        """
+        servico = _coluna_texto(df, "Serviço")
+        
+        preparados = pd.DataFrame(index=df.index)
+        with self.medidor.etapa("classificacao", len(df)):
+            preparados["protocolo"] = _coluna_texto(df, "Numero_Chamado")
+            preparados["status"] = _mapear_unicos(self._parse_status_sac, _coluna_texto(df, "Status"))
+            preparados["tipo_servico"] = _mapear_unicos(self._parse_tipo_servico, servico)
+            preparados["servico_texto"] = servico
+            preparados["regra_versao"] = VERSAO_REGRAS
+            preparados["subprefeitura"] = _mapear_unicos(self._parse_subprefeitura, _coluna_texto(df, "Regional"))
+            preparados["endereco"] = _coluna_texto(df, "Endereço")
+            preparados["bairro"] = _coluna_texto(df, "Área")
             
-            # Remover duplicados dentro do próprio CSV
-            df = df.drop_duplicates(subset=["N_BFS"], keep="first")
+            # Calcular prazo
+            # IMPORTANTE: Para Cata-Bagulho (Escalonado), sempre usar 720h (30 dias)
+            # mesmo que tenha responsividade de 5h no CSV (esse é só prazo de vistoria)
+            preparados["prazo_max_hours"] = _mapear_unicos(
+                lambda servico_str, responsividade: prazo_servico(
+                    servico_str, _parse_responsividade(responsividade)
+                ),
+                servico,
+                _coluna(df, "Responsividade"),
+            ).astype("int64")
+            preparados["responsividade"] = _mapear_unicos(
+                _parse_responsividade, _coluna(df, "Responsividade")
+            ).astype("Int64")
+        
+        with self.medidor.etapa("parse", len(df)):
+            # Parse coordenadas
+            lat, lng = parse_coordenadas_serie(_coluna_texto(df, "Coordenadas"))
             
-            # Buscar todos os BFSs existentes de uma vez (mais eficiente)
-            bfs_list = [str(bfs).strip() for bfs in df["N_BFS"].dropna().tolist() if str(bfs).strip()]
-            bfs_existentes = set()
-            if bfs_list:
-                bfs_existentes = set(
-                    row[0] for row in self.db.query(CNC.bfs).filter(CNC.bfs.in_(bfs_list)).all()
-                )
+            # Parse datas
+            preparados["data_registro"] = parse_data_brasil_serie(_coluna(df, "Data_Registro"))
+            preparados["data_vistoria"] = parse_data_brasil_serie(_coluna(df, "Data_Realização_Vistoria"))
+            preparados["data_agendamento"] = parse_data_brasil_serie(_coluna(df, "Data_Acionamento_Agendamento"))
+            preparados["data_execucao"] = parse_data_brasil_serie(_coluna(df, "Data_Execução"))
+            preparados["data_alteracao_status"] = parse_data_brasil_serie(_coluna(df, "Data_Alteração_SAC"))
+            preparados["lat"] = lat.astype(float)
+            preparados["lng"] = lng.astype(float)
+        
+        return preparados
+    
+    def _gravar_sacs(self, preparados: pd.DataFrame) -> Tuple[int, int]:
+        """
+        Grava SACs preparados de forma set-based.
+        
+        Existentes são atualizados com um único UPDATE ... FROM staging
+        (campos opcionais só sobrescrevem quando o CSV traz valor) e os novos
+        entram com INSERT ... ON CONFLICT (protocolo) DO NOTHING.
+        
+        Antes do UPDATE, as mudanças de status (status gravado x status do
+        CSV) vão para `logs_status` com um único INSERT ... SELECT, com a
+        Data_Alteração_SAC do FLIP (ou o momento da importação, quando vazia).
+        
+        Depois da gravação, as contagens diárias dos indicadores são
+        recalculadas para os dias afetados (data de criação anterior e nova).
+        
+        Returns:
+            Tupla (inseridos, atualizados)
+        """
+        staging = preparados.rename(columns={
+            "endereco": "endereco_text",
+            "data_registro": "data_criacao",
+        })[[
+            "protocolo", "tipo_servico", "status", "subprefeitura", "endereco_text",
+            "lat", "lng", "bairro", "data_criacao", "data_vistoria",
+            "data_agendamento", "data_execucao", "prazo_max_hours", "geocode_status",
+            "servico_texto", "responsividade", "regra_versao", "hash_origem",
+            "data_alteracao_status",
+        ]]
+        copiar_para_staging(
+            self.db, "sacs", "staging_sacs", staging,
+            colunas_extras={"data_alteracao_status": "timestamp"},
+        )
+        agora = datetime.utcnow()
+        
+        # Dias de criação antes e depois da gravação (indicadores_diarios)
+        dias = self.db.execute(text("""
+            SELECT CAST(COALESCE(s.data_criacao, :agora) AS date) FROM staging_sacs AS s
+            UNION
+            SELECT CAST(t.data_criacao AS date) FROM sacs AS t JOIN staging_sacs AS s ON t.protocolo = s.protocolo
+        """), {"agora": agora}).scalars().all()
+        
+        transicoes = executar(self.db, """
+            INSERT INTO logs_status (id, sac_id, status_anterior, status_novo, usuario, motivo, created_at)
+            SELECT
+                gen_random_uuid(), t.id, t.status::text, s.status::text, :usuario, :motivo,
+                COALESCE(s.data_alteracao_status, :agora)
+            FROM sacs AS t
+            JOIN staging_sacs AS s ON t.protocolo = s.protocolo
+            WHERE t.status IS DISTINCT FROM s.status
+        """, {"usuario": USUARIO_IMPORTACAO, "motivo": MOTIVO_IMPORTACAO, "agora": agora})
+        self.medidor.contar("transicoes_status", transicoes)
+        
+        atualizados = executar(self.db, """
+            UPDATE sacs AS t SET
+                tipo_servico = s.tipo_servico,
+                status = s.status,
+                subprefeitura = s.subprefeitura,
+                endereco_text = s.endereco_text,
+                lat = COALESCE(s.lat, t.lat),
+                lng = COALESCE(s.lng, t.lng),
+                bairro = COALESCE(NULLIF(s.bairro, ''), t.bairro),
+                data_criacao = COALESCE(s.data_criacao, t.data_criacao),
+                data_vistoria = COALESCE(s.data_vistoria, t.data_vistoria),
+                data_agendamento = COALESCE(s.data_agendamento, t.data_agendamento),
+                data_execucao = COALESCE(s.data_execucao, t.data_execucao),
+                prazo_max_hours = s.prazo_max_hours,
+                servico_texto = s.servico_texto,
+                responsividade = s.responsividade,
+                regra_versao = s.regra_versao,
+                hash_origem = s.hash_origem,
+                geocode_status = CASE
+                    WHEN COALESCE(s.lat, t.lat) IS NOT NULL THEN NULL
+                    WHEN t.endereco_text IS DISTINCT FROM s.endereco_text THEN s.geocode_status
+                    ELSE COALESCE(t.geocode_status, s.geocode_status)
+                END,
+                geocode_tentativas = CASE
+                    WHEN t.endereco_text IS DISTINCT FROM s.endereco_text THEN 0
+                    ELSE t.geocode_tentativas
+                END,
+                inserted_from_csv = true
+            FROM staging_sacs AS s
+            WHERE t.protocolo = s.protocolo
+        """)
+        
+        inseridos = executar(self.db, """
+            INSERT INTO sacs (
+                id, protocolo, tipo_servico, status, subprefeitura, endereco_text,
+                lat, lng, bairro, data_criacao, data_vistoria, data_agendamento,
+                data_execucao, prazo_max_hours, fotos_before, fotos_after,
+                flag_erro_regional, inserted_from_csv, geocode_status,
+                servico_texto, responsividade, regra_versao, hash_origem
+            )
+            SELECT
+                gen_random_uuid(), s.protocolo, s.tipo_servico, s.status, s.subprefeitura, s.endereco_text,
+                s.lat, s.lng, NULLIF(s.bairro, ''), COALESCE(s.data_criacao, :agora), s.data_vistoria,
+                s.data_agendamento, s.data_execucao, s.prazo_max_hours, '[]', '[]',
+                false, true, s.geocode_status,
+                s.servico_texto, s.responsividade, s.regra_versao, s.hash_origem
+            FROM staging_sacs AS s
+            ON CONFLICT (protocolo) DO NOTHING
+        """, {"agora": agora})
+        
+        indicadores_diarios.atualizar_dias(self.db, dias, "sacs")
+        
+        return inseridos, atualizados
+    
+    def _registrar_execucoes_fora_do_prazo(self, preparados: pd.DataFrame) -> None:
+        """Conta (e loga) SACs demandantes executados fora do prazo (apenas para referência)."""
+        tipos_demandantes = [TipoServico.ENTULHO, TipoServico.ANIMAL_MORTO, TipoServico.PAPELEIRAS]
+        horas = (preparados["data_execucao"] - preparados["data_registro"]).dt.total_seconds() / 3600
+        fora_do_prazo = preparados["tipo_servico"].isin(tipos_demandantes) & (horas > preparados["prazo_max_hours"])
+        
+        # O cálculo do IA já considera isso automaticamente, mas podemos marcar
+        # que foi executado fora do prazo para referência (contador nas
+        # métricas da importação; o detalhe por SAC só em DEBUG)
+        quantidade = int(fora_do_prazo.sum())
+        if not quantidade:
+            return
+        self.medidor.contar("execucoes_fora_do_prazo", quantidade)
+        logger.info(f"{quantidade} SACs demandantes executados fora do prazo no bloco")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        for protocolo, tempo_decorrido_hours, prazo_max_hours in zip(
+            preparados.loc[fora_do_prazo, "protocolo"],
+            horas[fora_do_prazo],
+            preparados.loc[fora_do_prazo, "prazo_max_hours"],
+        ):
+            logger.debug(f"SAC {protocolo} executado fora do prazo: {tempo_decorrido_hours:.2f}h > {prazo_max_hours}h")
+    
+    @_instrumentado
+    def processar_cnc_csv(
+        self,
+        file_path: str,
+        chunksize: Optional[int] = None,
+        blocos: Optional[Iterable[pd.DataFrame]] = None,
+        commit: bool = True,
+    ) -> Dict[str, Any]:
+        """Processa CSV de CNCs em blocos de `chunksize` linhas."""
+        importacao = None
+        try:
+            fingerprint = fingerprint_arquivo(file_path)
+            repetida = self._importacao_repetida("cnc", file_path, fingerprint, commit)
+            if repetida:
+                return {**repetida, "duplicados": repetida["total"]}
             
+            importacao = self._iniciar_importacao("cnc", file_path, fingerprint, commit)
+            retomado_de = importacao.linhas_confirmadas
             processados = 0
-            erros = 0
+            erros = importacao.erros
             duplicados = 0
+            total = importacao.total
+            contagens = {"novos": importacao.novos, "alterados": importacao.alterados, "inalterados": importacao.inalterados}
             
-            for _, row in df.iterrows():
+            if blocos is None:
+                blocos = self.ler_blocos("cnc", file_path, chunksize)
+            for df, preparado in self.medidor.iterar("leitura", _pular_linhas(blocos, retomado_de), _linhas_do_bloco):
+                total += len(df)
+                with self.medidor.etapa("comparacao", len(df)):
+                    comparacao = self.comparar_hashes(df, "cnc", "bfs", "N_BFS", contagens)
+                if settings.IMPORT_INCREMENTAL:
+                    # CNCs já cadastrados não são sobrescritos: nem passam pelo parser
+                    duplicados += int(comparacao["existe"].sum())
+                    df, preparado = _restantes(df, preparado, ~comparacao["existe"])
+                
+                with self.medidor.etapa("parse", len(df)):
+                    registros, erros_bloco = self._preparar_cnc(df) if preparado is None else preparado
+                _anexar_hashes(registros, "bfs", comparacao.loc[df.index])
+                with self.medidor.etapa("gravacao", len(registros)):
+                    inseridos = self._gravar_novos("cnc", registros, "bfs", extras={"fotos": "'[]'"})
+                    if inseridos:
+                        indicadores_diarios.atualizar_dias(
+                            self.db, {registro["data_abertura"].date() for registro in registros}, "cnc"
+                        )
+                
+                processados += inseridos
+                duplicados += len(registros) - inseridos
+                erros += erros_bloco
+                self._checkpoint(importacao, total, erros, contagens, commit)
+                self._notificar("gravando", total)
+            
+            self._concluir_importacao(importacao, total, erros, contagens)
+            if commit:
+                self._notificar("commit", total)
                 try:
-                    bfs = str(row.get("N_BFS", "")).strip()
-                    if not bfs:
-                        erros += 1
-                        continue
-                    
-                    if bfs in bfs_existentes:
-                        duplicados += 1
-                        continue
-                    
-                    # Parse status
-                    situacao = str(row.get("Situacao_CNC", "")).strip()
-                    status = StatusCNC.PENDENTE
-                    if situacao == "Regularizado":
-                        status = StatusCNC.REGULARIZADO
-                    elif situacao == "Aguardando Vistoria":
-                        status = StatusCNC.AGUARDANDO_VISTORIA
-                    
-                    # Parse datas
-                    data_sincronizacao = parse_data_brasil(str(row.get("Data_Sincronizacao", "")))
-                    data_fiscalizacao = parse_data_brasil(str(row.get("Data_Fiscalizacao", "")))
-                    data_execucao = parse_data_brasil(str(row.get("Data_Execução", "")))
-                    
-                    # Coordenadas
-                    coordenada_str = str(row.get("Coordenada", "")).strip()
-                    lat, lng = None, None
-                    if coordenada_str and coordenada_str != "nan":
-                        coords = parse_coordenadas(coordenada_str)
-                        if coords:
-                            lat, lng = coords
-                    
-                    # Prazo
-                    responsividade = row.get("Responsividade")
-                    prazo_hours = 24  # Padrão
-                    if pd.notna(responsividade):
-                        try:
-                            prazo_hours = int(responsividade)
-                        except:
-                            pass
-                    
-                    cnc = CNC(
-                        bfs=bfs,
-                        n_cnc=str(row.get("N_CNC", "")).strip() or None,
-                        subprefeitura=str(row.get("Regional", "")).strip(),
-                        area=str(row.get("Area", "")).strip() or None,
-                        setor=str(row.get("Setor", "")).strip() or None,
-                        turno=str(row.get("Turno", "")).strip() or None,
-                        servico=str(row.get("Servico", "")).strip() or None,
-                        data_abertura=data_fiscalizacao or datetime.utcnow(),
-                        data_sincronizacao=data_sincronizacao,
-                        data_fiscalizacao=data_fiscalizacao,
-                        data_execucao=data_execucao,
-                        prazo_hours=prazo_hours,
-                        responsividade=prazo_hours,
-                        status=status,
-                        situacao_cnc=situacao,
-                        endereco=str(row.get("Endereco", "")).strip() or None,
-                        coordenada=coordenada_str if coordenada_str != "nan" else None,
-                        lat=lat,
-                        lng=lng,
-                        descricao=None,
-                        fiscal_contratada=str(row.get("Fiscal_Contratada", "")).strip() or None,
-                        agente_fiscalizador=str(row.get("Fiscal", "")).strip() or None,
-                        aplicou_multa=False,
-                    )
-                    
-                    self.db.add(cnc)
-                    bfs_existentes.add(bfs)  # Adicionar à lista para evitar duplicados no mesmo batch
-                    processados += 1
-                    
+                    with self.medidor.etapa("commit"):
+                        self.db.commit()
                 except Exception as e:
-                    logger.error(f"Erro ao processar CNC {bfs}: {e}")
-                    erros += 1
-                    continue
-            
-            try:
-                self.db.commit()
-            except Exception as e:
-                self.db.rollback()
-                logger.error(f"Erro ao commitar CNCs: {e}")
-                raise
+                    self.db.rollback()
+                    logger.error(f"Erro ao commitar CNCs: {e}")
+                    raise
+                
+                # Novas coordenadas conhecidas entram no gazetteer local
+                gazetteer_local.invalidar()
             
             return {
                 "processados": processados,
                 "erros": erros,
                 "duplicados": duplicados,
-                "total": len(df)
+                "total": total,
+                **contagens,
+                "retomado_de": retomado_de,
+                **self._metricas(),
             }
             
         except Exception as e:
             self.db.rollback()
+            self._registrar_erro(importacao, e, commit)
             logger.error(f"Erro ao processar CSV de CNCs: {e}")
             raise
     
-    def processar_acic_csv(self, file_path: str) -> Dict[str, Any]:
-        """Processa CSV de ACICs."""
-        try:
-            # Ler CSV - o arquivo pode ter \n literais dentro dos campos
-            # Usar engine Python com tratamento robusto de erros
-            # Tentar diferentes estratégias de leitura
-            df = None
-            errors = []
-            
-            # Estratégia 1: UTF-8 com engine Python (sem low_memory)
+    def _preparar_cnc(self, df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Converte um bloco do CSV de CNCs em registros para gravação.
+        
+        Returns:
+            Tupla (registros, erros)
+        """
+        registros = []
+        bfs_no_lote = set()
+        erros = 0
+        datas = _colunas_data(df, ("Data_Sincronizacao", "Data_Fiscalizacao", "Data_Execução"))
+        
+        for indice, row in df.iterrows():
             try:
-                df = pd.read_csv(
-                    file_path,
-                    sep=";",
-                    encoding="utf-8",
-                    on_bad_lines='skip',
-                    engine='python',
-                    quotechar='"',
-                    skipinitialspace=True,
-                )
+                bfs = str(row.get("N_BFS", "")).strip()
+                if not bfs:
+                    erros += 1
+                    continue
+                
+                if bfs in bfs_no_lote:
+                    continue
+                
+                # Parse status
+                situacao = str(row.get("Situacao_CNC", "")).strip()
+                status = STATUS_CNC.get(situacao, StatusCNC.PENDENTE)
+                
+                # Parse datas
+                data_sincronizacao = datas["Data_Sincronizacao"][indice]
+                data_fiscalizacao = datas["Data_Fiscalizacao"][indice]
+                data_execucao = datas["Data_Execução"][indice]
+                
+                # Coordenadas
+                coordenada_str = str(row.get("Coordenada", "")).strip()
+                lat, lng = None, None
+                if coordenada_str and coordenada_str != "nan":
+                    coords = parse_coordenadas(coordenada_str)
+                    if coords:
+                        lat, lng = coords
+                
+                # Prazo
+                responsividade = row.get("Responsividade")
+                prazo_hours = 24  # Padrão
+                if pd.notna(responsividade):
+                    try:
+                        prazo_hours = int(float(responsividade))
+                    except:
+                        pass
+                
+                registros.append(dict(
+                    bfs=bfs,
+                    n_cnc=str(row.get("N_CNC", "")).strip() or None,
+                    subprefeitura=str(row.get("Regional", "")).strip(),
+                    area=str(row.get("Area", "")).strip() or None,
+                    setor=str(row.get("Setor", "")).strip() or None,
+                    turno=str(row.get("Turno", "")).strip() or None,
+                    servico=str(row.get("Servico", "")).strip() or None,
+                    data_abertura=data_fiscalizacao or datetime.utcnow(),
+                    data_sincronizacao=data_sincronizacao,
+                    data_fiscalizacao=data_fiscalizacao,
+                    data_execucao=data_execucao,
+                    prazo_hours=prazo_hours,
+                    responsividade=prazo_hours,
+                    status=status,
+                    situacao_cnc=situacao,
+                    endereco=str(row.get("Endereco", "")).strip() or None,
+                    coordenada=coordenada_str if coordenada_str != "nan" else None,
+                    lat=lat,
+                    lng=lng,
+                    descricao=None,
+                    fiscal_contratada=str(row.get("Fiscal_Contratada", "")).strip() or None,
+                    agente_fiscalizador=str(row.get("Fiscal", "")).strip() or None,
+                    aplicou_multa=False,
+                ))
+                bfs_no_lote.add(bfs)  # Evitar duplicados no mesmo batch
+                
             except Exception as e:
-                errors.append(f"UTF-8: {str(e)}")
-            
-            # Estratégia 2: Latin-1 se UTF-8 falhou
-            if df is None or df.empty:
-                try:
-                    df = pd.read_csv(
-                        file_path,
-                        sep=";",
-                        encoding="latin-1",
-                        on_bad_lines='skip',
-                        engine='python',
-                        quotechar='"',
-                        skipinitialspace=True,
-                    )
-                except Exception as e:
-                    errors.append(f"Latin-1: {str(e)}")
-            
-            # Estratégia 3: Sem quotechar
-            if df is None or df.empty:
-                try:
-                    df = pd.read_csv(
-                        file_path,
-                        sep=";",
-                        encoding="utf-8",
-                        on_bad_lines='skip',
-                        engine='python',
-                    )
-                except Exception as e:
-                    errors.append(f"Sem quotechar: {str(e)}")
-            
-            if df is None or df.empty:
-                raise ValueError(f"Não foi possível ler o CSV. Erros: {'; '.join(errors)}")
-            
-            df.columns = df.columns.str.strip()
-            
-            # Validar que temos a coluna N_ACIC
-            if "N_ACIC" not in df.columns:
-                # Tentar encontrar coluna similar (case insensitive)
-                acic_cols = [col for col in df.columns if "ACIC" in col.upper()]
-                if acic_cols:
-                    logger.warning(f"Coluna N_ACIC não encontrada, usando {acic_cols[0]}")
-                    df = df.rename(columns={acic_cols[0]: "N_ACIC"})
-                else:
-                    raise ValueError(f"Coluna N_ACIC não encontrada no CSV. Colunas disponíveis: {list(df.columns)}")
-            
-            # Remover duplicados dentro do próprio CSV
-            df = df.drop_duplicates(subset=["N_ACIC"], keep="first")
-            
-            # Buscar todos os ACICs existentes de uma vez
-            acic_list = [str(acic).strip() for acic in df["N_ACIC"].dropna().tolist() if str(acic).strip()]
-            acic_existentes = set()
-            if acic_list:
-                acic_existentes = set(
-                    row[0] for row in self.db.query(ACIC.n_acic).filter(
-                        ACIC.n_acic.in_(acic_list)
-                    ).all() if row[0]
-                )
+                logger.error(f"Erro ao processar CNC {bfs}: {e}")
+                erros += 1
+                continue
+        
+        return registros, erros
+    
+    @_instrumentado
+    def processar_acic_csv(
+        self,
+        file_path: str,
+        chunksize: Optional[int] = None,
+        blocos: Optional[Iterable[pd.DataFrame]] = None,
+        commit: bool = True,
+    ) -> Dict[str, Any]:
+        """Processa CSV de ACICs em blocos de `chunksize` linhas."""
+        importacao = None
+        try:
+            fingerprint = fingerprint_arquivo(file_path)
+            repetida = self._importacao_repetida("acic", file_path, fingerprint, commit)
+            if repetida:
+                return {**repetida, "duplicados": repetida["total"]}
             
+            importacao = self._iniciar_importacao("acic", file_path, fingerprint, commit)
+            retomado_de = importacao.linhas_confirmadas
             processados = 0
-            erros = 0
+            erros = importacao.erros
             duplicados = 0
+            total = importacao.total
+            contagens = {"novos": importacao.novos, "alterados": importacao.alterados, "inalterados": importacao.inalterados}
+            acics_por_bfs: Counter = Counter()
+            
+            if blocos is None:
+                blocos = self.ler_blocos("acic", file_path, chunksize)
+            for df, preparado in self.medidor.iterar("leitura", _pular_linhas(blocos, retomado_de), _linhas_do_bloco):
+                total += len(df)
+                with self.medidor.etapa("comparacao", len(df)):
+                    comparacao = self.comparar_hashes(df, "acic", "n_acic", "N_ACIC", contagens)
+                if settings.IMPORT_INCREMENTAL:
+                    # ACICs já cadastrados não são sobrescritos: nem passam pelo parser
+                    duplicados += int(comparacao["existe"].sum())
+                    df, preparado = _restantes(df, preparado, ~comparacao["existe"])
+                
+                with self.medidor.etapa("parse", len(df)):
+                    registros, erros_bloco = self._preparar_acic(df) if preparado is None else preparado
+                _anexar_hashes(registros, "n_acic", comparacao.loc[df.index])
+                with self.medidor.etapa("gravacao", len(registros)):
+                    inseridos = self._gravar_novos("acic", registros, "n_acic", extras=VINCULO_CNC)
+                acics_por_bfs.update(r["n_bfs"] for r in registros if r["n_bfs"])
+                
+                processados += inseridos
+                duplicados += len(registros) - inseridos
+                erros += erros_bloco
+                self._checkpoint(importacao, total, erros, contagens, commit)
+                self._notificar("gravando", total)
             
-            for _, row in df.iterrows():
+            bfs_sem_cnc = self.bfs_sem_cnc(acics_por_bfs)
+            
+            self._concluir_importacao(importacao, total, erros, contagens)
+            if commit:
+                self._notificar("commit", total)
                 try:
-                    n_acic = str(row.get("N_ACIC", "")).strip()
-                    if not n_acic:
-                        erros += 1
-                        continue
-                    
-                    if n_acic in acic_existentes:
-                        duplicados += 1
-                        continue
-                    
-                    # Parse status
-                    status_str = str(row.get("Status", "")).strip()
-                    status = None
-                    if status_str == "Confirmado":
-                        status = StatusACIC.CONFIRMADO
-                    elif status_str == "Solicitacao":
-                        status = StatusACIC.SOLICITACAO
-                    
-                    # Parse datas
-                    data_fiscalizacao = parse_data_brasil(str(row.get("Data_Fiscalizacao", "")))
-                    data_sincronizacao = parse_data_brasil(str(row.get("Data_Sincronizacao", "")))
-                    data_execucao = parse_data_brasil(str(row.get("Data_Execução", "")))
-                    data_acic = parse_data_brasil(str(row.get("Data_ACIC", "")))
-                    data_confirmacao = parse_data_brasil(str(row.get("Data_Confirmacao", "")))
-                    
-                    # Valor multa
-                    valor_multa = None
-                    valor_str = str(row.get("Valor_Multa", "")).strip()
-                    if valor_str and valor_str != "nan":
-                        try:
-                            valor_multa = float(valor_str.replace(",", "."))
-                        except:
-                            pass
-                    
-                    # Buscar CNC relacionado
-                    n_bfs = str(row.get("N_BFS", "")).strip()
-                    cnc_id = None
-                    if n_bfs:
-                        cnc = self.db.query(CNC).filter(CNC.bfs == n_bfs).first()
-                        if cnc:
-                            cnc_id = cnc.id
-                    
-                    acic = ACIC(
-                        n_acic=n_acic,
-                        n_bfs=n_bfs or None,
-                        n_cnc=str(row.get("N_CNC", "")).strip() or None,
-                        cnc_id=cnc_id,
-                        status=status,
-                        data_fiscalizacao=data_fiscalizacao,
-                        data_sincronizacao=data_sincronizacao,
-                        data_execucao=data_execucao,
-                        data_acic=data_acic,
-                        data_confirmacao=data_confirmacao,
-                        servico=str(row.get("Servico", "")).strip() or None,
-                        responsavel=str(row.get("Responsavel", "")).strip() or None,
-                        agente_fiscalizador=str(row.get("Agente_Fiscalizador", "")).strip() or None,
-                        contratada=str(row.get("Contratada", "")).strip() or None,
-                        regional=str(row.get("Regional", "")).strip() or None,
-                        area=str(row.get("Area", "")).strip() or None,
-                        setor=str(row.get("Setor", "")).strip() or None,
-                        turno=str(row.get("Turno", "")).strip() or None,
-                        descricao=str(row.get("Descricao", "")).strip() or None,
-                        valor_multa=valor_multa,
-                        clausula_contratual=str(row.get("Clausula_Contratual", "")).strip() or None,
-                        observacao=str(row.get("Observacao", "")).strip() or None,
-                        endereco=str(row.get("Endereco", "")).strip() or None,
-                    )
-                    
-                    self.db.add(acic)
-                    acic_existentes.add(n_acic)  # Adicionar à lista para evitar duplicados no mesmo batch
-                    processados += 1
-                    
+                    with self.medidor.etapa("commit"):
+                        self.db.commit()
                 except Exception as e:
-                    logger.error(f"Erro ao processar ACIC {n_acic}: {e}")
-                    erros += 1
-                    continue
-            
-            try:
-                self.db.commit()
-            except Exception as e:
-                self.db.rollback()
-                logger.error(f"Erro ao commitar ACICs: {e}")
-                raise
+                    self.db.rollback()
+                    logger.error(f"Erro ao commitar ACICs: {e}")
+                    raise
             
             return {
                 "processados": processados,
                 "erros": erros,
                 "duplicados": duplicados,
-                "total": len(df)
+                "total": total,
+                **contagens,
+                "retomado_de": retomado_de,
+                **self._metricas(),
+                "sem_cnc": sum(acics_por_bfs[bfs] for bfs in bfs_sem_cnc),
+                "bfs_sem_cnc": bfs_sem_cnc[:MAX_BFS_SEM_CNC],
             }
             
         except Exception as e:
             self.db.rollback()
+            self._registrar_erro(importacao, e, commit)
             logger.error(f"Erro ao processar CSV de ACICs: {e}")
             raise
     
-    def processar_ouvidoria_csv(self, file_path: str) -> Dict[str, Any]:
-        """Processa CSV de Ouvidorias."""
-        try:
-            df = pd.read_csv(file_path, sep=";", encoding="utf-8", low_memory=False)
-            df.columns = df.columns.str.strip()
+    def bfs_sem_cnc(self, acics_por_bfs: Counter) -> List[str]:
+        """N_BFS referenciados pelas ACICs que não têm CNC cadastrado (uma consulta)."""
+        if not acics_por_bfs:
+            return []
+        encontrados = set(
+            self.db.execute(
+                text("SELECT bfs FROM cnc WHERE bfs = ANY(:bfs)"),
+                {"bfs": list(acics_por_bfs)},
+            ).scalars()
+        )
+        return sorted(bfs for bfs in acics_por_bfs if bfs not in encontrados)
+    
+    def _ler_acic_em_blocos(self, file_path: str, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Lê o CSV de ACICs em blocos.
+        
+        O arquivo pode ter \\n literais dentro dos campos, então usa a engine
+        Python e tenta diferentes estratégias de leitura; a estratégia é
+        escolhida pelo primeiro bloco lido com sucesso.
+        """
+        chunksize = chunksize or settings.IMPORT_CHUNK_SIZE
+        estrategias = [
+            # Estratégia 1: UTF-8 com engine Python
+            ("UTF-8", dict(encoding="utf-8", quotechar='"', skipinitialspace=True)),
+            # Estratégia 2: Latin-1 se UTF-8 falhou
+            ("Latin-1", dict(encoding="latin-1", quotechar='"', skipinitialspace=True)),
+            # Estratégia 3: Sem quotechar
+            ("Sem quotechar", dict(encoding="utf-8")),
+        ]
+        errors = []
+        
+        for nome, opcoes in estrategias:
+            # Mantém aberta a fonte (stream descompactado) enquanto o leitor é usado
+            fontes = contextlib.ExitStack()
+            try:
+                # Sem usecols: a seleção de colunas mudaria quais linhas malformadas
+                # são descartadas pelo on_bad_lines; as colunas não usadas são
+                # removidas após a leitura
+                with abrir_csv(file_path) as fonte:
+                    cabecalho = pd.read_csv(fonte, sep=";", engine='python', nrows=0, **opcoes).columns
+                _, dtype = LAYOUT_ACIC.selecionar(cabecalho)
+                leitor = fontes.enter_context(pd.read_csv(
+                    fontes.enter_context(abrir_csv(file_path)),
+                    sep=";",
+                    on_bad_lines='skip',
+                    engine='python',
+                    dtype={coluna: dtype.get(coluna, str) for coluna in cabecalho},
+                    chunksize=chunksize,
+                    **opcoes,
+                ))
+                primeiro = next(leitor, None)
+            except Exception as e:
+                fontes.close()
+                errors.append(f"{nome}: {str(e)}")
+                continue
             
-            # Remover duplicados dentro do próprio CSV
-            df = df.drop_duplicates(subset=["Numero_Chamado"], keep="first")
+            if primeiro is None or primeiro.empty:
+                fontes.close()
+                continue
             
-            # Buscar todos os números existentes de uma vez
-            numeros_list = [str(num).strip() for num in df["Numero_Chamado"].dropna().tolist() if str(num).strip()]
-            numeros_existentes = set()
-            if numeros_list:
-                numeros_existentes = set(
-                    row[0] for row in self.db.query(Ouvidoria.numero_chamado).filter(
-                        Ouvidoria.numero_chamado.in_(numeros_list)
-                    ).all()
-                )
+            with fontes:
+                coluna_acic = self._coluna_n_acic(primeiro)
+                for bloco in itertools.chain([primeiro], leitor):
+                    bloco.columns = bloco.columns.str.strip()
+                    if coluna_acic != "N_ACIC":
+                        bloco = bloco.rename(columns={coluna_acic: "N_ACIC"})
+                    yield bloco[[coluna for coluna in bloco.columns if coluna in LAYOUT_ACIC.colunas]]
+            return
+        
+        raise ValueError(f"Não foi possível ler o CSV. Erros: {'; '.join(errors)}")
+    
+    def _coluna_n_acic(self, df: pd.DataFrame) -> str:
+        """Retorna o nome da coluna com o número do ACIC."""
+        colunas = [col.strip() for col in df.columns]
+        
+        # Validar que temos a coluna N_ACIC
+        if "N_ACIC" in colunas:
+            return "N_ACIC"
+        
+        # Tentar encontrar coluna similar (case insensitive)
+        acic_cols = [col for col in colunas if "ACIC" in col.upper()]
+        if acic_cols:
+            logger.warning(f"Coluna N_ACIC não encontrada, usando {acic_cols[0]}")
+            return acic_cols[0]
+        
+        raise ValueError(f"Coluna N_ACIC não encontrada no CSV. Colunas disponíveis: {colunas}")
+    
+    def _preparar_acic(self, df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Converte um bloco do CSV de ACICs em registros para gravação.
+        
+        Returns:
+            Tupla (registros, erros)
+        """
+        registros = []
+        acic_no_lote = set()
+        erros = 0
+        datas = _colunas_data(df, (
+            "Data_Fiscalizacao", "Data_Sincronizacao", "Data_Execução", "Data_ACIC", "Data_Confirmacao",
+        ))
+        
+        for indice, row in df.iterrows():
+            try:
+                n_acic = str(row.get("N_ACIC", "")).strip()
+                if not n_acic:
+                    erros += 1
+                    continue
+                
+                if n_acic in acic_no_lote:
+                    continue
+                
+                # Parse status
+                status_str = str(row.get("Status", "")).strip()
+                status = STATUS_ACIC.get(status_str)
+                
+                # Parse datas
+                data_fiscalizacao = datas["Data_Fiscalizacao"][indice]
+                data_sincronizacao = datas["Data_Sincronizacao"][indice]
+                data_execucao = datas["Data_Execução"][indice]
+                data_acic = datas["Data_ACIC"][indice]
+                data_confirmacao = datas["Data_Confirmacao"][indice]
+                
+                # Valor multa
+                valor_multa = None
+                valor_str = str(row.get("Valor_Multa", "")).strip()
+                if valor_str and valor_str != "nan":
+                    try:
+                        valor_multa = float(valor_str.replace(",", "."))
+                    except:
+                        pass
+                
+                # CNC relacionado: resolvido na gravação (VINCULO_CNC)
+                n_bfs = str(row.get("N_BFS", "")).strip()
+                
+                registros.append(dict(
+                    n_acic=n_acic,
+                    n_bfs=n_bfs or None,
+                    n_cnc=str(row.get("N_CNC", "")).strip() or None,
+                    status=status,
+                    data_fiscalizacao=data_fiscalizacao,
+                    data_sincronizacao=data_sincronizacao,
+                    data_execucao=data_execucao,
+                    data_acic=data_acic,
+                    data_confirmacao=data_confirmacao,
+                    servico=str(row.get("Servico", "")).strip() or None,
+                    responsavel=str(row.get("Responsavel", "")).strip() or None,
+                    agente_fiscalizador=str(row.get("Agente_Fiscalizador", "")).strip() or None,
+                    contratada=str(row.get("Contratada", "")).strip() or None,
+                    regional=str(row.get("Regional", "")).strip() or None,
+                    area=str(row.get("Area", "")).strip() or None,
+                    setor=str(row.get("Setor", "")).strip() or None,
+                    turno=str(row.get("Turno", "")).strip() or None,
+                    descricao=str(row.get("Descricao", "")).strip() or None,
+                    valor_multa=valor_multa,
+                    clausula_contratual=str(row.get("Clausula_Contratual", "")).strip() or None,
+                    observacao=str(row.get("Observacao", "")).strip() or None,
+                    endereco=str(row.get("Endereco", "")).strip() or None,
+                ))
+                acic_no_lote.add(n_acic)  # Evitar duplicados no mesmo batch
+                
+            except Exception as e:
+                logger.error(f"Erro ao processar ACIC {n_acic}: {e}")
+                erros += 1
+                continue
+        
+        return registros, erros
+    
+    @_instrumentado
+    def processar_ouvidoria_csv(
+        self,
+        file_path: str,
+        chunksize: Optional[int] = None,
+        blocos: Optional[Iterable[pd.DataFrame]] = None,
+        commit: bool = True,
+    ) -> Dict[str, Any]:
+        """Processa CSV de Ouvidorias em blocos de `chunksize` linhas."""
+        importacao = None
+        try:
+            fingerprint = fingerprint_arquivo(file_path)
+            repetida = self._importacao_repetida("ouvidoria", file_path, fingerprint, commit)
+            if repetida:
+                return {**repetida, "duplicados": repetida["total"]}
             
+            importacao = self._iniciar_importacao("ouvidoria", file_path, fingerprint, commit)
+            retomado_de = importacao.linhas_confirmadas
             processados = 0
-            erros = 0
+            erros = importacao.erros
             duplicados = 0
+            total = importacao.total
+            contagens = {"novos": importacao.novos, "alterados": importacao.alterados, "inalterados": importacao.inalterados}
             
-            for _, row in df.iterrows():
+            if blocos is None:
+                blocos = self.ler_blocos("ouvidoria", file_path, chunksize)
+            for df, preparado in self.medidor.iterar("leitura", _pular_linhas(blocos, retomado_de), _linhas_do_bloco):
+                total += len(df)
+                with self.medidor.etapa("comparacao", len(df)):
+                    comparacao = self.comparar_hashes(df, "ouvidorias", "numero_chamado", "Numero_Chamado", contagens)
+                if settings.IMPORT_INCREMENTAL:
+                    # Ouvidorias já cadastrados não são sobrescritos: nem passam pelo parser
+                    duplicados += int(comparacao["existe"].sum())
+                    df, preparado = _restantes(df, preparado, ~comparacao["existe"])
+                
+                with self.medidor.etapa("parse", len(df)):
+                    registros, erros_bloco = self._preparar_ouvidoria(df) if preparado is None else preparado
+                _anexar_hashes(registros, "numero_chamado", comparacao.loc[df.index])
+                with self.medidor.etapa("gravacao", len(registros)):
+                    inseridos = self._gravar_novos("ouvidorias", registros, "numero_chamado", extras={"fotos": "'[]'", **VINCULO_SAC})
+                
+                processados += inseridos
+                duplicados += len(registros) - inseridos
+                erros += erros_bloco
+                self._checkpoint(importacao, total, erros, contagens, commit)
+                self._notificar("gravando", total)
+            
+            self._concluir_importacao(importacao, total, erros, contagens)
+            if commit:
+                self._notificar("commit", total)
                 try:
-                    numero_chamado = str(row.get("Numero_Chamado", "")).strip()
-                    if not numero_chamado:
-                        erros += 1
-                        continue
-                    
-                    if numero_chamado in numeros_existentes:
-                        duplicados += 1
-                        continue
-                    
-                    # Parse status
-                    status_str = str(row.get("Status", "")).strip()
-                    status = None
-                    if status_str == "Ouvidoria Encerrada":
-                        status = StatusOuvidoria.OUVIDORIA_ENCERRADA
-                    elif status_str == "Em Execução":
-                        status = StatusOuvidoria.EM_EXECUCAO
-                    elif status_str == "Finalizado":
-                        status = StatusOuvidoria.FINALIZADO
-                    elif status_str == "Executado":
-                        status = StatusOuvidoria.EXECUTADO
-                    
-                    # Parse datas
-                    data_registro = parse_data_brasil(str(row.get("Data_Registro", "")))
-                    data_execucao = parse_data_brasil(str(row.get("Data_Execução", "")))
-                    
-                    # Coordenadas
-                    coordenadas_str = str(row.get("Coordenadas", "")).strip()
-                    
-                    ouvidoria = Ouvidoria(
-                        numero_chamado=numero_chamado,
-                        numero_sei=str(row.get("Número_SEI", "")).strip() or None,
-                        status=status,
-                        situacao=str(row.get("Situação", "")).strip() or None,
-                        contratada=str(row.get("Contratada", "")).strip() or None,
-                        origem=str(row.get("Origem", "")).strip() or None,
-                        procedente=str(row.get("Procedente", "")).strip() or None,
-                        procedente_por_status=str(row.get("Procedente_por_status", "")).strip() or None,
-                        regional=str(row.get("Regional", "")).strip() or None,
-                        area=str(row.get("Área", "")).strip() or None,
-                        servico=str(row.get("Serviço", "")).strip() or None,
-                        assunto=str(row.get("Assunto", "")).strip() or None,
-                        endereco=str(row.get("Endereço", "")).strip() or None,
-                        coordenadas=coordenadas_str if coordenadas_str != "nan" else None,
-                        data_registro=data_registro,
-                        data_execucao=data_execucao,
-                        responsividade=str(row.get("Responsividade", "")).strip() or None,
-                    )
-                    
-                    self.db.add(ouvidoria)
-                    numeros_existentes.add(numero_chamado)  # Adicionar à lista para evitar duplicados no mesmo batch
-                    processados += 1
-                    
+                    with self.medidor.etapa("commit"):
+                        self.db.commit()
                 except Exception as e:
-                    logger.error(f"Erro ao processar Ouvidoria {numero_chamado}: {e}")
-                    erros += 1
-                    continue
-            
-            try:
-                self.db.commit()
-            except Exception as e:
-                self.db.rollback()
-                logger.error(f"Erro ao commitar Ouvidorias: {e}")
-                raise
+                    self.db.rollback()
+                    logger.error(f"Erro ao commitar Ouvidorias: {e}")
+                    raise
             
             return {
                 "processados": processados,
                 "erros": erros,
                 "duplicados": duplicados,
-                "total": len(df)
+                "total": total,
+                **contagens,
+                "retomado_de": retomado_de,
+                **self._metricas(),
             }
             
         except Exception as e:
             self.db.rollback()
+            self._registrar_erro(importacao, e, commit)
             logger.error(f"Erro ao processar CSV de Ouvidorias: {e}")
             raise
     
-    def _parse_status_sac(self, status_str: str) -> StatusSAC:
-        """Parse de status de SAC."""
-        status_map = {
-            "Aguardando Análise": StatusSAC.AGUARDANDO_ANALISE,
-            "Aguardando Agendamento": StatusSAC.AGUARDANDO_AGENDAMENTO,
-            "Aguardando Revistoria": StatusSAC.AGUARDANDO_REVISTORIA,
-            "Não Procede": StatusSAC.NAO_PROCEDE,
-            "Em Execução": StatusSAC.EM_EXECUCAO,
-            "Executado": StatusSAC.EXECUTADO,
-            "Finalizado": StatusSAC.FINALIZADO,
-            "Confirmar Execução": StatusSAC.CONFIRMAR_EXECUCAO,
-            "Confirmada Execução": StatusSAC.CONFIRMADA_EXECUCAO,
-            "Não Confirmada Execução": StatusSAC.NAO_CONFIRMADA_EXECUCAO,
-            "Confirmar Fora de Escopo": StatusSAC.CONFIRMAR_FORA_ESCOPO,
+    def vincular_ouvidorias_sem_sac(self) -> int:
+        """
+        Vincula ao SAC de origem as Ouvidorias gravadas antes do SAC (um UPDATE).
+        
+        Returns:
+            Número de Ouvidorias vinculadas
+        """
+        return executar(self.db, """
+            UPDATE ouvidorias AS o SET sac_id = sc.id
+            FROM sacs AS sc
+            WHERE o.sac_id IS NULL AND sc.protocolo = o.numero_chamado
+        """)
+    
+    def _preparar_ouvidoria(self, df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Converte um bloco do CSV de Ouvidorias em registros para gravação.
+        
+        Returns:
+            Tupla (registros, erros)
+        """
+        registros = []
+        numeros_no_lote = set()
+        erros = 0
+        datas = _colunas_data(df, ("Data_Registro", "Data_Execução"))
+        
+        for indice, row in df.iterrows():
+            try:
+                numero_chamado = str(row.get("Numero_Chamado", "")).strip()
+                if not numero_chamado:
+                    erros += 1
+                    continue
+                
+                if numero_chamado in numeros_no_lote:
+                    continue
+                
+                # Parse status
+                status_str = str(row.get("Status", "")).strip()
+                status = STATUS_OUVIDORIA.get(status_str)
+                
+                # Parse datas
+                data_registro = datas["Data_Registro"][indice]
+                data_execucao = datas["Data_Execução"][indice]
+                
+                # Coordenadas
+                coordenadas_str = str(row.get("Coordenadas", "")).strip()
+                
+                registros.append(dict(
+                    numero_chamado=numero_chamado,
+                    numero_sei=str(row.get("Número_SEI", "")).strip() or None,
+                    status=status,
+                    situacao=str(row.get("Situação", "")).strip() or None,
+                    contratada=str(row.get("Contratada", "")).strip() or None,
+                    origem=str(row.get("Origem", "")).strip() or None,
+                    procedente=str(row.get("Procedente", "")).strip() or None,
+                    procedente_por_status=str(row.get("Procedente_por_status", "")).strip() or None,
+                    regional=str(row.get("Regional", "")).strip() or None,
+                    area=str(row.get("Área", "")).strip() or None,
+                    servico=str(row.get("Serviço", "")).strip() or None,
+                    assunto=str(row.get("Assunto", "")).strip() or None,
+                    endereco=str(row.get("Endereço", "")).strip() or None,
+                    coordenadas=coordenadas_str if coordenadas_str != "nan" else None,
+                    data_registro=data_registro,
+                    data_execucao=data_execucao,
+                    responsividade=str(row.get("Responsividade", "")).strip() or None,
+                ))
+                numeros_no_lote.add(numero_chamado)  # Evitar duplicados no mesmo batch
+                
+            except Exception as e:
+                logger.error(f"Erro ao processar Ouvidoria {numero_chamado}: {e}")
+                erros += 1
+                continue
+        
+        return registros, erros
+    
+    def comparar_hashes(
+        self,
+        df: pd.DataFrame,
+        tabela: str,
+        chave: str,
+        coluna_chave: str,
+        contagens: Dict[str, int],
+    ) -> pd.DataFrame:
+        """
+        Compara o hash de conteúdo das linhas do bloco com o gravado no banco.
+        
+        Uma consulta por bloco. Atualiza `contagens` (novos, alterados,
+        inalterados); registros gravados antes do hash existir contam como
+        alterados.
+        
+        Returns:
+            DataFrame (mesmo índice do bloco) com chave, hash, existe e inalterado
+        """
+        chaves = _coluna_texto(df, coluna_chave)
+        if COLUNA_HASH in df.columns:
+            # Parquet convertido: hash calculado sobre o texto do CSV de origem
+            hashes = df[COLUNA_HASH]
+        else:
+            hashes = hash_linhas(df)
+        gravados = dict(self.db.execute(
+            text(f"SELECT {chave}, hash_origem FROM {tabela} WHERE {chave} = ANY(:chaves)"),
+            {"chaves": chaves[chaves != ""].unique().tolist()},
+        ).all())
+        
+        existe = chaves.isin(list(gravados))
+        inalterado = existe & (chaves.map(gravados) == hashes)
+        
+        contagens["novos"] += int((~existe & (chaves != "")).sum())
+        contagens["alterados"] += int((existe & ~inalterado).sum())
+        contagens["inalterados"] += int(inalterado.sum())
+        return pd.DataFrame({"chave": chaves, "hash": hashes, "existe": existe, "inalterado": inalterado})
+    
+    def ultima_importacao(self, entidade: str) -> Optional[Importacao]:
+        """Última importação finalizada da entidade (None se nunca importada)."""
+        return (
+            self.db.query(Importacao)
+            .filter(Importacao.entidade == entidade, Importacao.status.in_([CONCLUIDA, REPETIDA]))
+            .order_by(Importacao.finalizado_em.desc())
+            .first()
+        )
+    
+    def _importacao_repetida(
+        self,
+        entidade: str,
+        file_path: str,
+        fingerprint: str,
+        commit: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Resultado de uma importação sem efeito, se o arquivo for idêntico ao último importado.
+        
+        Só compara com a última importação da entidade: um arquivo antigo
+        reimportado depois de outro é processado normalmente. Com
+        `commit=False` o registro fica na transação do chamador.
+        """
+        if not settings.IMPORT_INCREMENTAL:
+            return None
+        ultima = self.ultima_importacao(entidade)
+        if not ultima or ultima.fingerprint != fingerprint:
+            return None
+        
+        self.db.add(Importacao(
+            entidade=entidade,
+            arquivo=os.path.basename(file_path),
+            fingerprint=fingerprint,
+            tamanho_bytes=os.path.getsize(file_path),
+            status=REPETIDA,
+            total=ultima.total,
+            inalterados=ultima.total,
+            linhas_confirmadas=ultima.total,
+            finalizado_em=datetime.utcnow(),
+        ))
+        if commit:
+            self.db.commit()
+        logger.info(f"Arquivo de {entidade} idêntico à última importação: nada a processar")
+        return {
+            "processados": 0,
+            "erros": 0,
+            "total": ultima.total,
+            "novos": 0,
+            "alterados": 0,
+            "inalterados": ultima.total,
+            "arquivo_repetido": True,
         }
-        return status_map.get(status_str, StatusSAC.AGUARDANDO_ANALISE)
     
-    def _parse_tipo_servico(self, tipo_str: str) -> TipoServico:
+    def _iniciar_importacao(self, entidade: str, file_path: str, fingerprint: str, commit: bool) -> Importacao:
         """
-        Parse de tipo de serviço conforme especificações.
-        
-        Demandantes (com responsividade):
-        - Coleta e transporte de entulho e grandes objetos -> ENTULHO (72h)
-        - Remoção de animais mortos -> ANIMAL_MORTO (12h)
-        - Papeleiras -> PAPELEIRAS (72h)
-        
-        Escalonados (agendados):
-        - Cata-Bagulho -> CATABAGULHO
-        - Coleta manual de varrição e feiras -> VARRIACAO_COLETA
-        - Mutirão (inclui Capinação, Propaganda, Raspagem, Pintura) -> MUTIRAO
-        - Lavagem -> LAVAGEM
-        - Limpeza de bueiros -> BUEIRO
-        - Varrição manual -> VARRIACAO
-        - Varrição de Praças -> VARRIACAO_PRACAS
-        - Monumentos -> MONUMENTOS
-        - Outros -> OUTROS
-        """
-        tipo_lower = tipo_str.lower()
-        
-        # IMPORTANTE: Verificar Escalonados específicos ANTES dos Demandantes genéricos
-        # para evitar que "Cata-Bagulho" seja classificado como "entulho"
-        
-        # Escalonados - verificar casos específicos primeiro (antes dos Demandantes!)
-        # Cata-Bagulho: "Coleta programada e transporte de objetos volumosos e de entulho (Cata-Bagulho)"
-        # A chave é identificar "programada" ANTES de verificar "entulho"
-        if "cata-bagulho" in tipo_lower or "cata bagulho" in tipo_lower:
-            return TipoServico.CATABAGULHO
-        elif "coleta programada" in tipo_lower:
-            # Se tem "coleta programada", é SEMPRE Cata-Bagulho (Escalonado)
-            return TipoServico.CATABAGULHO
-        
-        # Demandantes - verificar depois dos Escalonados específicos
-        # Coleta e transporte de entulho e grandes objetos (NÃO programada = Demandante)
-        # Texto exato: "Coleta e transporte de entulho e grandes objetos depositados irregularmente nas vias..."
-        elif ("coleta e transporte" in tipo_lower or "coleta de entulho" in tipo_lower) and \
-             ("entulho" in tipo_lower or "grandes objetos" in tipo_lower) and \
-             "programada" not in tipo_lower:  # Garantir que NÃO é programada
-            return TipoServico.ENTULHO
-        elif ("entulho" in tipo_lower or "grandes objetos" in tipo_lower) and \
-             "programada" not in tipo_lower:  # Se tem entulho mas NÃO é programada, é Demandante
-            return TipoServico.ENTULHO
-        elif (
-            ("animal" in tipo_lower or "animais" in tipo_lower) and
-            ("morto" in tipo_lower or "mortos" in tipo_lower)
-        ):
-            return TipoServico.ANIMAL_MORTO
-        elif "papeleira" in tipo_lower or "lixeira" in tipo_lower or "equipamentos de recepção" in tipo_lower:
-            return TipoServico.PAPELEIRAS
-        
-        # Escalonados - continuar verificando outros casos específicos
-        elif ("coleta manual" in tipo_lower or "coleta de varrição" in tipo_lower) and ("feira" in tipo_lower or "compactador" in tipo_lower):
-            return TipoServico.VARRIACAO_COLETA
-        elif "varrição de praça" in tipo_lower or "equipe de varrição de praça" in tipo_lower:
-            return TipoServico.VARRIACAO_PRACAS
-        elif "varrição" in tipo_lower:
-            return TipoServico.VARRIACAO
-        elif ("mutirão" in tipo_lower or "mutirao" in tipo_lower) or \
-             "capinação" in tipo_lower or \
-             "propaganda" in tipo_lower or \
-             "raspagem" in tipo_lower or \
-             "pintura de guia" in tipo_lower or \
-             "zeladoria" in tipo_lower:
-            return TipoServico.MUTIRAO
-        elif "lavagem" in tipo_lower and ("equipamento" in tipo_lower or "público" in tipo_lower):
-            return TipoServico.LAVAGEM
-        elif "bueiro" in tipo_lower or "boca de lobo" in tipo_lower or "boca de leão" in tipo_lower or "desobstrução" in tipo_lower:
-            return TipoServico.BUEIRO
-        elif "monumento" in tipo_lower or "conservação de monumento" in tipo_lower:
-            return TipoServico.MONUMENTOS
+        Registro da importação, que também é o seu checkpoint.
+        
+        Com checkpoints (`commit=True` e IMPORT_CHECKPOINT), uma importação
+        interrompida do mesmo arquivo (mesmo fingerprint) é retomada: o
+        registro traz as linhas já commitadas e as contagens até elas. Com
+        `commit=False` o registro fica na transação do chamador.
+        """
+        if commit and settings.IMPORT_CHECKPOINT:
+            interrompida = (
+                self.db.query(Importacao)
+                .filter(
+                    Importacao.entidade == entidade,
+                    Importacao.fingerprint == fingerprint,
+                    Importacao.status.in_([EM_ANDAMENTO, ERRO]),
+                )
+                .order_by(Importacao.iniciado_em.desc())
+                .first()
+            )
+            if interrompida:
+                interrompida.status = EM_ANDAMENTO
+                interrompida.arquivo = os.path.basename(file_path)
+                interrompida.retomadas += 1
+                interrompida.erro = None
+                self.medidor.carregar(
+                    interrompida.metricas,
+                    interrompida.consultas_banco,
+                    interrompida.duracao_segundos or 0.0,
+                )
+                self.db.commit()
+                logger.info(
+                    f"Retomando importação de {entidade} a partir da linha {interrompida.linhas_confirmadas}"
+                )
+                return interrompida
+        
+        importacao = Importacao(
+            entidade=entidade,
+            arquivo=os.path.basename(file_path),
+            fingerprint=fingerprint,
+            tamanho_bytes=os.path.getsize(file_path),
+            status=EM_ANDAMENTO,
+            total=0,
+            novos=0,
+            alterados=0,
+            inalterados=0,
+            erros=0,
+            linhas_confirmadas=0,
+            blocos=0,
+            retomadas=0,
+            iniciado_em=datetime.utcnow(),
+        )
+        self.db.add(importacao)
+        if commit and settings.IMPORT_CHECKPOINT:
+            self.db.commit()
+        return importacao
+    
+    def _checkpoint(
+        self,
+        importacao: Importacao,
+        total: int,
+        erros: int,
+        contagens: Dict[str, int],
+        commit: bool,
+    ) -> None:
+        """
+        Commita o bloco gravado junto com o checkpoint (linhas confirmadas).
+        
+        As gravações dos blocos são idempotentes (UPDATE/INSERT pela chave),
+        então um bloco refeito após uma falha não duplica nada.
+        """
+        if not (commit and settings.IMPORT_CHECKPOINT):
+            return
+        self._atualizar_contagens(importacao, total, erros, contagens)
+        importacao.linhas_confirmadas = total
+        importacao.blocos += 1
+        self._notificar("checkpoint", total)
+        with self.medidor.etapa("commit"):
+            self.db.commit()
+    
+    def _concluir_importacao(
+        self,
+        importacao: Importacao,
+        total: int,
+        erros: int,
+        contagens: Dict[str, int],
+    ) -> None:
+        """Marca a importação como concluída, na mesma transação dos dados."""
+        self._atualizar_contagens(importacao, total, erros, contagens)
+        importacao.linhas_confirmadas = total
+        importacao.status = CONCLUIDA
+        importacao.finalizado_em = datetime.utcnow()
+    
+    def _atualizar_contagens(
+        self,
+        importacao: Importacao,
+        total: int,
+        erros: int,
+        contagens: Dict[str, int],
+    ) -> None:
+        importacao.total = total
+        importacao.erros = erros
+        importacao.novos = contagens["novos"]
+        importacao.alterados = contagens["alterados"]
+        importacao.inalterados = contagens["inalterados"]
+        importacao.duracao_segundos = round(self.medidor.decorrido(), 3)
+        importacao.consultas_banco = self.medidor.consultas_banco
+        importacao.chamadas_geocoder = self.medidor.contadores["chamadas_geocoder"]
+        importacao.metricas = self.medidor.para_dict()
+    
+    def _metricas(self) -> Dict[str, Any]:
+        """Medições da importação para o resultado."""
+        metricas = self.medidor.para_dict()
+        return {
+            "consultas_banco": self.medidor.consultas_banco,
+            "chamadas_geocoder": self.medidor.contadores["chamadas_geocoder"],
+            "etapas": metricas["etapas"],
+            "pico_memoria_mb": metricas["pico_memoria_mb"],
+        }
+    
+    def _registrar_erro(self, importacao: Optional[Importacao], erro: Exception, commit: bool) -> None:
+        """
+        Marca a importação com erro (após o rollback), mantendo o checkpoint.
+        
+        Só com checkpoints: sem eles o registro foi desfeito com os dados.
+        """
+        if importacao is None or not (commit and settings.IMPORT_CHECKPOINT):
+            return
+        try:
+            importacao.status = ERRO
+            importacao.erro = str(erro)[:1000]
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Erro ao registrar falha da importação de {importacao.entidade}: {e}")
+    
+    def _ler_csv_em_blocos(
+        self,
+        file_path: str,
+        chunksize: Optional[int] = None,
+        layout: Optional[LayoutCSV] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lê um CSV do FLIP em blocos de `chunksize` linhas, com colunas normalizadas.
+        
+        Todas as colunas são lidas como texto (ou categóricas, conforme o
+        `layout`): a inferência de tipos do pandas é feita por bloco e poderia
+        converter a mesma coluna de formas diferentes em blocos diferentes
+        (ex: setor "02" virando 2). Com `layout`, só as colunas consumidas
+        pelo processador são lidas. Arquivos .csv.gz e .zip são descompactados
+        em streaming (`abrir_csv`).
+        """
+        chunksize = chunksize or settings.IMPORT_CHUNK_SIZE
+        with abrir_csv(file_path) as fonte:
+            cabecalho = pd.read_csv(fonte, sep=";", encoding="utf-8", nrows=0).columns
+        if layout:
+            usecols, dtype = layout.selecionar(cabecalho)
         else:
-            return TipoServico.OUTROS
+            usecols, dtype = list(cabecalho), {coluna: str for coluna in cabecalho}
+        
+        if settings.IMPORT_CSV_ENGINE == "pyarrow":
+            if PYARROW_AVAILABLE:
+                yield from self._ler_csv_pyarrow(file_path, chunksize, usecols, dtype)
+                return
+            logger.warning("IMPORT_CSV_ENGINE=pyarrow, mas o pyarrow não está instalado; usando a engine C")
+        
+        with abrir_csv(file_path) as fonte, pd.read_csv(
+            fonte,
+            sep=";",
+            encoding="utf-8",
+            usecols=usecols,
+            dtype=dtype,
+            chunksize=chunksize,
+        ) as leitor:
+            for bloco in leitor:
+                # Normalizar nomes de colunas (remover espaços)
+                bloco.columns = bloco.columns.str.strip()
+                yield bloco
+    
+    def _ler_csv_pyarrow(
+        self,
+        file_path: str,
+        chunksize: int,
+        usecols: List[str],
+        dtype: Dict[str, Any],
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lê o CSV com o leitor em streaming do pyarrow (multithread).
+        
+        Os lotes do pyarrow são agrupados até `chunksize` linhas, para que os
+        blocos tenham o mesmo tamanho da engine C.
+        """
+        tipos = {
+            coluna: pa.dictionary(pa.int32(), pa.string()) if tipo == "category" else pa.string()
+            for coluna, tipo in dtype.items()
+        }
+        with abrir_csv(file_path) as fonte:
+            leitor = pacsv.open_csv(
+                fonte,
+                read_options=pacsv.ReadOptions(encoding="utf8"),
+                parse_options=pacsv.ParseOptions(delimiter=";", newlines_in_values=True),
+                convert_options=pacsv.ConvertOptions(
+                    include_columns=usecols,
+                    column_types=tipos,
+                    strings_can_be_null=True,
+                ),
+            )
+            yield from agrupar_lotes(leitor, chunksize)
+    
+    def _gravar_novos(
+        self,
+        tabela: str,
+        registros: List[Dict[str, Any]],
+        chave: str,
+        extras: Optional[Dict[str, str]] = None,
+    ) -> int:
+        """
+        Insere apenas os registros cuja chave ainda não existe na tabela.
+        
+        Os registros vão para staging via COPY e entram com um único
+        INSERT ... SELECT que ignora chaves já cadastradas.
+        
+        Args:
+            tabela: Tabela de destino
+            registros: Registros já convertidos (nomes de coluna da tabela)
+            chave: Coluna de identificação do FLIP (bfs, n_acic, numero_chamado)
+            extras: Colunas adicionais com sua expressão SQL sobre a staging `s` (ex: defaults JSON)
+            
+        Returns:
+            Número de registros inseridos
+        """
+        if not registros:
+            return 0
+        
+        staging = f"staging_{tabela}"
+        dados = dataframe_de_registros(registros)
+        copiar_para_staging(self.db, tabela, staging, dados)
+        
+        extras = extras or {}
+        colunas = ["id", *dados.columns, *extras.keys()]
+        valores = ["gen_random_uuid()", *(f"s.{coluna}" for coluna in dados.columns), *extras.values()]
+        
+        return executar(self.db, f"""
+            INSERT INTO {tabela} ({", ".join(colunas)})
+            SELECT {", ".join(valores)}
+            FROM {staging} AS s
+            WHERE NOT EXISTS (SELECT 1 FROM {tabela} AS t WHERE t.{chave} = s.{chave})
+            ON CONFLICT DO NOTHING
+        """)
+    
+    def _parse_status_sac(self, status_str: str) -> StatusSAC:
+        """Parse de status de SAC."""
+        return STATUS_SAC.get(status_str, StatusSAC.AGUARDANDO_ANALISE)
+    
+    def _parse_tipo_servico(self, tipo_str: str) -> TipoServico:
+        """Parse de tipo de serviço (regras em app.utils.classificacao_servico)."""
+        return classificar_servico(tipo_str)[0]
     
     def _parse_subprefeitura(self, subpref_str: str) -> Subprefeitura:
         """Parse de subprefeitura."""
@@ -0,0 +1,197 @@
+"""Conversão de CSVs do FLIP para Parquet/Arrow e snapshots Parquet das tabelas."""
+import enum
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Boolean, BigInteger, DateTime, Enum, Float, Integer, JSON, Numeric, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import Base
+from app.services.csv_processor import CSVProcessor, LAYOUTS
+from app.utils.colunar import (
+    COLUNA_HASH,
+    colunas_data,
+    exigir_pyarrow,
+    schema_entidade,
+    tabela_de_bloco,
+)
+from app.utils.fingerprint import hash_linhas
+from app.utils.validators import parse_data_brasil_serie
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as paipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pass
+
+logger = logging.getLogger(__name__)
+
+# Tabelas exportáveis como snapshot
+TABELAS_SNAPSHOT = ("sacs", "cnc", "acic", "ouvidorias")
+
+# Formatos de saída do conversor
+FORMATOS = ("parquet", "arrow")
+
+
+def converter_csv(
+    entidade: str,
+    file_path: str,
+    destino: str,
+    formato: str = "parquet",
+    chunksize: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Converte um CSV do FLIP em Parquet (ou Arrow IPC) com o schema fixo da entidade.
+
+    O CSV é lido como na importação (mesmas colunas, sem duplicados) e
+    gravado bloco a bloco; as datas são convertidas uma única vez e o hash
+    de cada linha é calculado sobre o texto original.
+
+    Raises:
+        ValueError: Entidade/formato inválido ou CSV sem alguma coluna do layout
+    """
+    exigir_pyarrow()
+    if entidade not in LAYOUTS:
+        raise ValueError(f"Entidade inválida: {entidade}")
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}")
+
+    inicio = time.perf_counter()
+    layout, _ = LAYOUTS[entidade]
+    schema = schema_entidade(entidade, layout.colunas, layout.categoricas)
+    datas = colunas_data(layout.colunas)
+    linhas = 0
+    escritor = None
+    try:
+        for bloco in CSVProcessor(None).ler_blocos(entidade, file_path, chunksize):
+            if bloco.empty:
+                # Bloco só com chaves repetidas de blocos anteriores
+                continue
+            faltando = sorted(layout.colunas - set(bloco.columns))
+            if faltando:
+                raise ValueError(f"CSV de {entidade} sem as colunas {faltando}")
+
+            # O hash vem do texto, antes da conversão (igual ao da importação do CSV)
+            bloco[COLUNA_HASH] = hash_linhas(bloco)
+            for coluna in datas:
+                bloco[coluna] = parse_data_brasil_serie(bloco[coluna])
+
+            if escritor is None:
+                if formato == "parquet":
+                    escritor = pq.ParquetWriter(destino, schema, compression="zstd")
+                else:
+                    escritor = paipc.new_file(destino, schema)
+            escritor.write_table(tabela_de_bloco(bloco, schema))
+            linhas += len(bloco)
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    if escritor is None:
+        raise ValueError(f"CSV de {entidade} vazio: {file_path}")
+
+    return {
+        "entidade": entidade,
+        "arquivo": destino,
+        "formato": formato,
+        "linhas": linhas,
+        "bytes_csv": os.path.getsize(file_path),
+        "bytes": os.path.getsize(destino),
+        "duracao_segundos": round(time.perf_counter() - inicio, 3),
+    }
+
+
+def _tipo_arrow(coluna) -> "pa.DataType":
+    """Tipo Arrow de uma coluna do SQLAlchemy."""
+    tipo = coluna.type
+    if isinstance(tipo, UUID):
+        return pa.string()
+    if isinstance(tipo, Enum):
+        return pa.dictionary(pa.int32(), pa.string())
+    if isinstance(tipo, DateTime):
+        return pa.timestamp("us")
+    if isinstance(tipo, BigInteger):
+        return pa.int64()
+    if isinstance(tipo, Integer):
+        return pa.int32()
+    if isinstance(tipo, Float):
+        return pa.float64()
+    if isinstance(tipo, Numeric):
+        return pa.decimal128(tipo.precision or 18, tipo.scale or 0)
+    if isinstance(tipo, Boolean):
+        return pa.bool_()
+    # String, Text e JSON (serializado)
+    return pa.string()
+
+
+def _valor_arrow(valor: Any, coluna) -> Any:
+    """Valor do banco no formato da coluna Arrow (Enum pelo nome, como gravado)."""
+    if valor is None:
+        return None
+    if isinstance(valor, enum.Enum):
+        return valor.name
+    if isinstance(valor, uuid.UUID):
+        return str(valor)
+    if isinstance(coluna.type, JSON):
+        return json.dumps(valor, ensure_ascii=False)
+    return valor
+
+
+def exportar_snapshot(
+    db: Session,
+    tabela: str,
+    destino: str,
+    chunksize: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Grava um snapshot Parquet de uma tabela de entidade.
+
+    As linhas são lidas com cursor no servidor e gravadas em row groups
+    de `chunksize` linhas (a tabela nunca fica inteira em memória). O
+    schema segue os tipos das colunas do model.
+    """
+    exigir_pyarrow()
+    if tabela not in TABELAS_SNAPSHOT:
+        raise ValueError(f"Tabela inválida: {tabela}")
+
+    inicio = time.perf_counter()
+    chunksize = chunksize or settings.IMPORT_CHUNK_SIZE
+    tabela_sql = Base.metadata.tables[tabela]
+    colunas = list(tabela_sql.columns)
+    schema = pa.schema(
+        [pa.field(coluna.name, _tipo_arrow(coluna)) for coluna in colunas],
+        metadata={
+            b"flip_tabela": tabela.encode(),
+            b"flip_snapshot_em": datetime.utcnow().isoformat().encode(),
+        },
+    )
+
+    linhas = 0
+    resultado = db.execute(
+        select(tabela_sql).order_by(tabela_sql.c.id),
+        execution_options={"stream_results": True, "yield_per": chunksize},
+    )
+    with pq.ParquetWriter(destino, schema, compression="zstd") as escritor:
+        for lote in resultado.partitions(chunksize):
+            dados = {
+                coluna.name: [_valor_arrow(linha[i], coluna) for linha in lote]
+                for i, coluna in enumerate(colunas)
+            }
+            escritor.write_table(pa.Table.from_pydict(dados, schema=schema))
+            linhas += len(lote)
+
+    return {
+        "tabela": tabela,
+        "arquivo": destino,
+        "linhas": linhas,
+        "bytes": os.path.getsize(destino),
+        "duracao_segundos": round(time.perf_counter() - inicio, 3),
+    }
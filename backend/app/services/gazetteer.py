@@ -0,0 +1,172 @@
+"""Geocoder offline construído a partir das coordenadas já conhecidas de SACs e CNCs."""
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.utils.geocoding import decompor_endereco
+
+logger = logging.getLogger(__name__)
+
+Coordenadas = Optional[Tuple[float, float]]
+
+# Pontos de um logradouro: números ordenados e coordenadas correspondentes
+_Pontos = Tuple[List[int], List[Tuple[float, float]]]
+
+
+class GazetteerLocal:
+    """
+    Índice logradouro + número + CEP -> coordenadas, sem chamadas de rede.
+
+    Construído com os endereços de SACs e CNCs que já têm coordenadas,
+    agregados no banco (um registro por endereço distinto, limitado aos
+    GAZETTEER_MAX_ENDERECOS mais observados). Um
+    endereço é resolvido por número exato, por interpolação linear entre os
+    números vizinhos conhecidos do mesmo logradouro (no mesmo CEP e, se não
+    houver, em qualquer CEP) ou pelo vizinho mais próximo dentro de
+    GAZETTEER_DISTANCIA_MAXIMA números.
+    """
+
+    def __init__(self, ttl_segundos: Optional[int] = None):
+        self.ttl_segundos = ttl_segundos if ttl_segundos is not None else settings.GAZETTEER_TTL_SEGUNDOS
+        self._por_cep: Dict[Tuple[str, str], _Pontos] = {}
+        self._por_logradouro: Dict[str, _Pontos] = {}
+        self._construido_em: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def total_logradouros(self) -> int:
+        return len(self._por_logradouro)
+
+    def obter(self, db: Session) -> "GazetteerLocal":
+        """Retorna o índice, reconstruindo-o se estiver vencido."""
+        with self._lock:
+            vencido = (
+                self._construido_em is None
+                or time.monotonic() - self._construido_em > self.ttl_segundos
+            )
+            if vencido:
+                self._construir(db)
+        return self
+
+    def invalidar(self) -> None:
+        """Força a reconstrução no próximo uso (ex: após uma importação)."""
+        with self._lock:
+            self._construido_em = None
+
+    def _construir(self, db: Session) -> None:
+        inicio = time.perf_counter()
+        # Endereços sem dígito não têm número e não entram no índice
+        conhecidos = pd.DataFrame(
+            db.execute(text("""
+                SELECT endereco, sum(lat) AS soma_lat, sum(lng) AS soma_lng, count(*) AS observacoes
+                FROM (
+                    SELECT endereco_text AS endereco, lat, lng FROM sacs
+                    WHERE lat IS NOT NULL AND lng IS NOT NULL
+                    UNION ALL
+                    SELECT endereco, lat, lng FROM cnc
+                    WHERE endereco IS NOT NULL AND lat IS NOT NULL AND lng IS NOT NULL
+                ) AS observados
+                WHERE endereco ~ '[0-9]'
+                GROUP BY endereco
+                ORDER BY count(*) DESC
+                LIMIT :limite
+            """), {"limite": settings.GAZETTEER_MAX_ENDERECOS}).all(),
+            columns=["endereco", "soma_lat", "soma_lng", "observacoes"],
+        )
+
+        self._por_cep = {}
+        self._por_logradouro = {}
+        if not conhecidos.empty:
+            # Cada endereço distinto é decomposto uma vez (já vem agrupado do banco)
+            decompostos = pd.DataFrame(
+                [decompor_endereco(endereco) for endereco in conhecidos["endereco"]],
+                columns=["logradouro", "numero", "cep"],
+                index=conhecidos.index,
+            )
+            conhecidos = conhecidos.join(decompostos)
+            conhecidos = conhecidos[(conhecidos["logradouro"] != "") & conhecidos["numero"].notna()]
+            conhecidos["numero"] = conhecidos["numero"].astype(int)
+
+            # Um ponto por número (média das coordenadas observadas)
+            por_cep = _media(conhecidos.dropna(subset=["cep"]), ["logradouro", "cep", "numero"])
+            por_logradouro = _media(conhecidos, ["logradouro", "numero"])
+
+            for (logradouro, cep), grupo in por_cep.groupby(level=[0, 1]):
+                self._por_cep[(logradouro, cep)] = _pontos(grupo)
+            for logradouro, grupo in por_logradouro.groupby(level=0):
+                self._por_logradouro[logradouro] = _pontos(grupo)
+
+        self._construido_em = time.monotonic()
+        logger.info(
+            f"Gazetteer local: {len(self._por_logradouro)} logradouros, "
+            f"{len(self._por_cep)} logradouro+CEP em {time.perf_counter() - inicio:.2f}s"
+        )
+
+    def localizar(self, endereco: str) -> Coordenadas:
+        """Resolve um endereço pelo índice (None se não houver base suficiente)."""
+        logradouro, numero, cep = decompor_endereco(endereco)
+        if not logradouro or numero is None:
+            return None
+
+        candidatos = []
+        if cep:
+            candidatos.append(self._por_cep.get((logradouro, cep)))
+        candidatos.append(self._por_logradouro.get(logradouro))
+
+        for pontos in candidatos:
+            if pontos:
+                coordenadas = _interpolar(pontos, numero)
+                if coordenadas:
+                    return coordenadas
+        return None
+
+
+def _media(conhecidos: pd.DataFrame, chaves: List[str]) -> pd.DataFrame:
+    """Média das coordenadas por `chaves`, ponderada pelas observações de cada endereço."""
+    somas = conhecidos.groupby(chaves)[["soma_lat", "soma_lng", "observacoes"]].sum()
+    return pd.DataFrame({
+        "lat": somas["soma_lat"] / somas["observacoes"],
+        "lng": somas["soma_lng"] / somas["observacoes"],
+    })
+
+
+def _pontos(grupo: pd.DataFrame) -> _Pontos:
+    """Converte um grupo (índice terminando em número) em listas ordenadas."""
+    numeros = grupo.index.get_level_values(-1).tolist()
+    coordenadas = list(zip(grupo["lat"].tolist(), grupo["lng"].tolist()))
+    return numeros, coordenadas
+
+
+def _interpolar(pontos: _Pontos, numero: int) -> Coordenadas:
+    """Número exato, interpolação entre vizinhos ou vizinho mais próximo."""
+    numeros, coordenadas = pontos
+    i = bisect.bisect_left(numeros, numero)
+    if i < len(numeros) and numeros[i] == numero:
+        return coordenadas[i]
+
+    anterior = i - 1 if i > 0 else None
+    seguinte = i if i < len(numeros) else None
+
+    if anterior is not None and seguinte is not None:
+        n0, n1 = numeros[anterior], numeros[seguinte]
+        if n1 - n0 <= settings.GAZETTEER_INTERVALO_MAXIMO:
+            (lat0, lng0), (lat1, lng1) = coordenadas[anterior], coordenadas[seguinte]
+            fator = (numero - n0) / (n1 - n0)
+            return (lat0 + (lat1 - lat0) * fator, lng0 + (lng1 - lng0) * fator)
+
+    vizinhos = [j for j in (anterior, seguinte) if j is not None]
+    if vizinhos:
+        mais_proximo = min(vizinhos, key=lambda j: abs(numeros[j] - numero))
+        if abs(numeros[mais_proximo] - numero) <= settings.GAZETTEER_DISTANCIA_MAXIMA:
+            return coordenadas[mais_proximo]
+    return None
+
+
+gazetteer_local = GazetteerLocal()
@@ -0,0 +1,241 @@
+"""Worker de backfill de geocoding dos SACs importados sem coordenadas."""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.geocoding_cache import GeocodingCacheService
+from app.utils.geocoding import GeocodingIndisponivelError, obter_geocoder
+
+logger = logging.getLogger(__name__)
+
+# Valores de sacs.geocode_status (NULL = não precisa de geocoding)
+GEOCODE_PENDENTE = "pendente"
+GEOCODE_NAO_ENCONTRADO = "nao_encontrado"
+GEOCODE_FALHOU = "falhou"  # excedeu GEOCODING_MAX_TENTATIVAS (dead-letter)
+
+# Espera máxima entre tentativas de um mesmo SAC (minutos)
+BACKOFF_MAXIMO_MINUTOS = 360
+
+
+class TokenBucket:
+    """Limitador de taxa (token bucket) compartilhado entre threads."""
+
+    def __init__(self, taxa: float, capacidade: int = 1):
+        """
+        Args:
+            taxa: Tokens repostos por segundo
+            capacidade: Máximo de tokens acumulados (rajada)
+        """
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._atualizado_em = time.monotonic()
+        self._lock = threading.Lock()
+
+    def adquirir(self) -> None:
+        """Bloqueia até haver um token disponível e o consome."""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._tokens = min(
+                    self.capacidade,
+                    self._tokens + (agora - self._atualizado_em) * self.taxa,
+                )
+                self._atualizado_em = agora
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                espera = (1 - self._tokens) / self.taxa
+            time.sleep(espera)
+
+
+class GeocodingBackfillWorker:
+    """
+    Geocodifica em segundo plano os SACs com geocode_status = 'pendente'.
+
+    A cada iteração lê um lote de pendentes, consulta o cache de geocoding e
+    chama o geocoder remoto para os endereços restantes (respeitando o limite
+    de requisições por segundo). Endereços resolvidos preenchem lat/lng,
+    "não encontrado" é definitivo e falhas do serviço são reagendadas com
+    backoff exponencial até GEOCODING_MAX_TENTATIVAS, quando o SAC vai para
+    'falhou'.
+    """
+
+    def __init__(
+        self,
+        sessao_factory: Callable[[], Session] = SessionLocal,
+        geocoder: Optional[Callable[[str], Optional[Tuple[float, float]]]] = None,
+        req_por_segundo: Optional[float] = None,
+        concorrencia: Optional[int] = None,
+        max_tentativas: Optional[int] = None,
+        lote: Optional[int] = None,
+    ):
+        self._sessao_factory = sessao_factory
+        self.geocoder = geocoder or obter_geocoder()
+        self.limitador = TokenBucket(req_por_segundo or settings.GEOCODING_REQ_POR_SEGUNDO)
+        self.concorrencia = concorrencia or settings.GEOCODING_CONCORRENCIA
+        self.max_tentativas = max_tentativas or settings.GEOCODING_MAX_TENTATIVAS
+        self.lote = lote or settings.GEOCODING_LOTE
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def processar_pendentes(self) -> Dict[str, int]:
+        """
+        Executa uma iteração do backfill.
+
+        Returns:
+            Dict com contadores da iteração
+        """
+        db = self._sessao_factory()
+        try:
+            agora = datetime.utcnow()
+            pendentes = db.execute(
+                text("""
+                    SELECT id, endereco_text
+                    FROM sacs
+                    WHERE geocode_status = :pendente
+                      AND (geocode_proxima_tentativa IS NULL OR geocode_proxima_tentativa <= :agora)
+                    ORDER BY data_criacao DESC
+                    LIMIT :lote
+                """),
+                {"pendente": GEOCODE_PENDENTE, "agora": agora, "lote": self.lote},
+            ).all()
+
+            resumo = {"sacs": len(pendentes), "resolvidos": 0, "nao_encontrados": 0, "falhas": 0}
+            if not pendentes:
+                return resumo
+
+            # Agrupar SACs por endereço: uma consulta por endereço distinto
+            por_endereco: Dict[str, List[Any]] = {}
+            for sac_id, endereco in pendentes:
+                por_endereco.setdefault(endereco, []).append(sac_id)
+
+            cache = GeocodingCacheService(db, geocoder=self.geocoder)
+            resultados = cache.consultar_cache(por_endereco)
+
+            faltando = [endereco for endereco in por_endereco if endereco not in resultados]
+            falhas: Dict[str, str] = {}
+            if faltando:
+                with ThreadPoolExecutor(max_workers=self.concorrencia) as executor:
+                    remotos = dict(zip(faltando, executor.map(self._geocodificar, faltando)))
+                novos = {}
+                for endereco, (coordenadas, erro) in remotos.items():
+                    if erro:
+                        falhas[endereco] = erro
+                    else:
+                        novos[endereco] = coordenadas
+                cache.registrar(novos)
+                resultados.update(novos)
+
+            for endereco, sac_ids in por_endereco.items():
+                if endereco in falhas:
+                    self._registrar_falha(db, sac_ids, endereco, falhas[endereco], agora)
+                    resumo["falhas"] += len(sac_ids)
+                elif resultados.get(endereco):
+                    lat, lng = resultados[endereco]
+                    self._atualizar(db, sac_ids, endereco, {"lat": lat, "lng": lng, "status": None})
+                    resumo["resolvidos"] += len(sac_ids)
+                else:
+                    self._atualizar(db, sac_ids, endereco, {"lat": None, "lng": None, "status": GEOCODE_NAO_ENCONTRADO})
+                    resumo["nao_encontrados"] += len(sac_ids)
+
+            db.commit()
+            resumo["cache_hits"] = cache.estatisticas()["cache_hits"]
+            return resumo
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _geocodificar(self, endereco: str) -> Tuple[Optional[Tuple[float, float]], Optional[str]]:
+        """Chama o geocoder respeitando o limite de taxa. Retorna (coordenadas, erro)."""
+        self.limitador.adquirir()
+        try:
+            return self.geocoder(endereco), None
+        except GeocodingIndisponivelError as e:
+            return None, str(e)
+
+    def _atualizar(self, db: Session, sac_ids: List[Any], endereco: str, valores: Dict[str, Any]) -> None:
+        """Grava o resultado nos SACs (se ainda pendentes e com o mesmo endereço)."""
+        db.execute(
+            text("""
+                UPDATE sacs SET
+                    lat = :lat,
+                    lng = :lng,
+                    geocode_status = :status,
+                    geocode_proxima_tentativa = NULL,
+                    geocode_erro = NULL
+                WHERE id = ANY(:ids)
+                  AND geocode_status = :pendente
+                  AND endereco_text = :endereco
+            """),
+            {**valores, "ids": sac_ids, "pendente": GEOCODE_PENDENTE, "endereco": endereco},
+        )
+
+    def _registrar_falha(self, db: Session, sac_ids: List[Any], endereco: str, erro: str, agora: datetime) -> None:
+        """Reagenda com backoff exponencial ou move para 'falhou'."""
+        db.execute(
+            text("""
+                UPDATE sacs SET
+                    geocode_tentativas = geocode_tentativas + 1,
+                    geocode_erro = :erro,
+                    geocode_status = CASE
+                        WHEN geocode_tentativas + 1 >= :max_tentativas THEN :falhou
+                        ELSE geocode_status
+                    END,
+                    geocode_proxima_tentativa = CAST(:agora AS timestamp)
+                        + make_interval(mins => LEAST(power(2, geocode_tentativas)::int, :backoff_maximo))
+                WHERE id = ANY(:ids)
+                  AND geocode_status = :pendente
+                  AND endereco_text = :endereco
+            """),
+            {
+                "erro": erro[:500],
+                "max_tentativas": self.max_tentativas,
+                "falhou": GEOCODE_FALHOU,
+                "agora": agora,
+                "backoff_maximo": BACKOFF_MAXIMO_MINUTOS,
+                "ids": sac_ids,
+                "pendente": GEOCODE_PENDENTE,
+                "endereco": endereco,
+            },
+        )
+        logger.warning(f"Geocoding falhou para '{endereco}' ({len(sac_ids)} SACs): {erro}")
+
+    def iniciar(self) -> None:
+        """Inicia o worker em uma thread daemon."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._loop, name="geocoding-backfill", daemon=True)
+        self._thread.start()
+
+    def parar(self) -> None:
+        """Sinaliza o fim do worker (termina após a iteração corrente)."""
+        self._parar.set()
+
+    def _loop(self) -> None:
+        while not self._parar.is_set():
+            try:
+                resumo = self.processar_pendentes()
+            except Exception as e:
+                logger.error(f"Erro no backfill de geocoding: {e}")
+                resumo = {"sacs": 0}
+
+            if resumo["sacs"]:
+                logger.info(f"Backfill de geocoding: {resumo}")
+            if resumo["sacs"] < self.lote:
+                # Fila vazia (ou só itens aguardando backoff): esperar antes de consultar de novo
+                self._parar.wait(settings.GEOCODING_INTERVALO_SEGUNDOS)
+
+
+worker_geocoding = GeocodingBackfillWorker()
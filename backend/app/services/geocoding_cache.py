@@ -0,0 +1,265 @@
+"""Cache de geocoding (LRU em memória + tabela geocoding_cache)."""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.gazetteer import gazetteer_local
+from app.utils.geocoding import GeocodingIndisponivelError, normalizar_endereco, obter_geocoder
+
+logger = logging.getLogger(__name__)
+
+Coordenadas = Optional[Tuple[float, float]]
+
+
+class _LRUGeocoding:
+    """LRU em memória, compartilhado entre importações do mesmo processo."""
+
+    def __init__(self, tamanho: int):
+        self.tamanho = tamanho
+        self._itens: "OrderedDict[str, Tuple[Coordenadas, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave: str, agora: datetime) -> Tuple[bool, Coordenadas]:
+        """Retorna (encontrado, coordenadas), ignorando itens expirados."""
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return False, None
+            coordenadas, expira_em = item
+            if expira_em <= agora:
+                del self._itens[chave]
+                return False, None
+            self._itens.move_to_end(chave)
+            return True, coordenadas
+
+    def guardar(self, chave: str, coordenadas: Coordenadas, expira_em: datetime) -> None:
+        with self._lock:
+            self._itens[chave] = (coordenadas, expira_em)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._itens.clear()
+
+
+lru_geocoding = _LRUGeocoding(settings.GEOCODING_LRU_TAMANHO)
+
+
+def _validade(coordenadas: Coordenadas) -> timedelta:
+    """TTL do resultado: resultados negativos expiram antes."""
+    if coordenadas is None:
+        return timedelta(days=settings.GEOCODING_CACHE_TTL_NEGATIVO_DIAS)
+    return timedelta(days=settings.GEOCODING_CACHE_TTL_DIAS)
+
+
+class GeocodingCacheService:
+    """
+    Geocoding com cache em dois níveis.
+    
+    Ordem de consulta: LRU em memória -> tabela geocoding_cache -> gazetteer
+    local (GEOCODING_PROVIDER="local") -> geocoder remoto. Resultados do
+    geocoder remoto (inclusive "não encontrado") são gravados na tabela;
+    falhas do serviço (timeout, erro) não são cacheadas.
+    """
+    
+    def __init__(
+        self,
+        db: Session,
+        geocoder: Optional[Callable[[str], Coordenadas]] = None,
+        provider: Optional[str] = None,
+        usar_gazetteer: Optional[bool] = None,
+    ):
+        local = settings.GEOCODING_PROVIDER == "local"
+        self.db = db
+        self.geocoder = geocoder or obter_geocoder()
+        self.provider = provider or (settings.GEOCODING_PROVIDER_REMOTO if local else settings.GEOCODING_PROVIDER)
+        self.usar_gazetteer = local if usar_gazetteer is None else usar_gazetteer
+        self.enderecos_consultados = 0
+        self.resolvidos_offline = 0
+        self.hits_memoria = 0
+        self.hits_banco = 0
+        self.misses = 0
+        self.falhas = 0
+    
+    def geocodificar(self, endereco: str) -> Coordenadas:
+        """Geocoding de um endereço usando o cache."""
+        return self.geocodificar_lote([endereco]).get(endereco)
+    
+    def geocodificar_lote(self, enderecos: Iterable[str]) -> Dict[str, Coordenadas]:
+        """
+        Geocoding de vários endereços, com uma única consulta à tabela de cache.
+        
+        Returns:
+            Dict endereço original -> (lat, lng) ou None
+        """
+        enderecos = list(dict.fromkeys(enderecos))
+        resolvidos = self.consultar_cache(enderecos)
+        
+        novos: Dict[str, Coordenadas] = {}
+        consultados: Dict[str, Coordenadas] = {}  # chave -> resultado do geocoder
+        for endereco in enderecos:
+            if endereco in resolvidos:
+                continue
+            chave = normalizar_endereco(endereco)
+            if not chave:
+                resolvidos[endereco] = None
+                continue
+            if chave in consultados:
+                resolvidos[endereco] = consultados[chave]
+                continue
+            
+            self.misses += 1
+            try:
+                coordenadas = self.geocoder(endereco)
+            except GeocodingIndisponivelError as e:
+                logger.warning(f"Geocoding indisponível para '{endereco}': {e}")
+                self.falhas += 1
+                coordenadas = None
+            else:
+                novos[endereco] = coordenadas
+            consultados[chave] = coordenadas
+            resolvidos[endereco] = coordenadas
+        
+        self.registrar(novos)
+        return resolvidos
+    
+    def consultar_cache(self, enderecos: Iterable[str]) -> Dict[str, Coordenadas]:
+        """
+        Consulta apenas o cache (LRU e tabela), sem chamar o geocoder.
+        
+        Returns:
+            Dict endereço original -> (lat, lng) ou None (negativo cacheado),
+            somente para os endereços presentes e válidos no cache
+        """
+        agora = datetime.utcnow()
+        chaves: Dict[str, str] = {}
+        for endereco in enderecos:
+            if endereco not in chaves:
+                chaves[endereco] = normalizar_endereco(endereco)
+        
+        encontrados: Dict[str, Coordenadas] = {}
+        pendentes = set()
+        for chave in set(chaves.values()):
+            if not chave:
+                continue
+            encontrado, coordenadas = lru_geocoding.obter(chave, agora)
+            if encontrado:
+                self.hits_memoria += 1
+                encontrados[chave] = coordenadas
+            else:
+                pendentes.add(chave)
+        
+        self.enderecos_consultados += len(encontrados) + len(pendentes)
+        
+        if pendentes:
+            do_banco = self._buscar_no_banco(list(pendentes), agora)
+            self.hits_banco += len(do_banco)
+            encontrados.update(do_banco)
+            pendentes -= set(do_banco)
+        
+        if pendentes and self.usar_gazetteer:
+            encontrados.update(self._localizar_offline(chaves, pendentes))
+        
+        return {
+            endereco: encontrados[chave]
+            for endereco, chave in chaves.items()
+            if chave in encontrados
+        }
+    
+    def registrar(self, resultados: Dict[str, Coordenadas]) -> None:
+        """Grava resultados do geocoder (endereço -> coordenadas ou None) no cache."""
+        agora = datetime.utcnow()
+        novos = {}
+        for endereco, coordenadas in resultados.items():
+            chave = normalizar_endereco(endereco)
+            if not chave:
+                continue
+            lru_geocoding.guardar(chave, coordenadas, agora + _validade(coordenadas))
+            novos[chave] = {
+                "chave": chave,
+                "endereco": endereco,
+                "lat": coordenadas[0] if coordenadas else None,
+                "lng": coordenadas[1] if coordenadas else None,
+                "provider": self.provider,
+                "agora": agora,
+            }
+        self._gravar_no_banco(list(novos.values()))
+    
+    def estatisticas(self) -> Dict[str, Any]:
+        """Contadores de uso do cache desde a criação do serviço."""
+        return {
+            "enderecos": self.enderecos_consultados,
+            "cache_hits": self.hits_memoria + self.hits_banco,
+            "cache_hits_memoria": self.hits_memoria,
+            "cache_hits_banco": self.hits_banco,
+            "resolvidos_offline": self.resolvidos_offline,
+            "percentual_offline": (
+                round(100 * self.resolvidos_offline / self.enderecos_consultados, 1)
+                if self.enderecos_consultados else None
+            ),
+            "cache_misses": self.misses,
+            "falhas": self.falhas,
+        }
+    
+    def _localizar_offline(self, chaves: Dict[str, str], pendentes: set) -> Dict[str, Coordenadas]:
+        """Resolve pelo gazetteer local as chaves que não estão no cache."""
+        gazetteer = gazetteer_local.obter(self.db)
+        originais = {}
+        for endereco, chave in chaves.items():
+            if chave in pendentes and chave not in originais:
+                originais[chave] = endereco
+        
+        encontrados = {}
+        for chave, endereco in originais.items():
+            coordenadas = gazetteer.localizar(endereco)
+            if coordenadas:
+                encontrados[chave] = coordenadas
+        self.resolvidos_offline += len(encontrados)
+        return encontrados
+    
+    def _buscar_no_banco(self, chaves: list, agora: datetime) -> Dict[str, Coordenadas]:
+        """Busca chaves na tabela de cache, descartando registros expirados."""
+        linhas = self.db.execute(
+            text("""
+                SELECT endereco_normalizado, lat, lng, updated_at
+                FROM geocoding_cache
+                WHERE endereco_normalizado = ANY(:chaves)
+            """),
+            {"chaves": chaves},
+        ).all()
+        
+        encontrados = {}
+        for chave, lat, lng, updated_at in linhas:
+            coordenadas = (lat, lng) if lat is not None and lng is not None else None
+            expira_em = updated_at + _validade(coordenadas)
+            if expira_em <= agora:
+                continue
+            lru_geocoding.guardar(chave, coordenadas, expira_em)
+            encontrados[chave] = coordenadas
+        return encontrados
+    
+    def _gravar_no_banco(self, novos: list) -> None:
+        """Grava (ou renova) resultados do geocoder na tabela de cache."""
+        if not novos:
+            return
+        self.db.execute(
+            text("""
+                INSERT INTO geocoding_cache
+                    (endereco_normalizado, endereco, lat, lng, provider, created_at, updated_at)
+                VALUES (:chave, :endereco, :lat, :lng, :provider, :agora, :agora)
+                ON CONFLICT (endereco_normalizado) DO UPDATE SET
+                    lat = EXCLUDED.lat,
+                    lng = EXCLUDED.lng,
+                    provider = EXCLUDED.provider,
+                    updated_at = EXCLUDED.updated_at
+            """),
+            novos,
+        )
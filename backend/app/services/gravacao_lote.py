@@ -0,0 +1,112 @@
+"""Gravação em lote (COPY para tabela de staging + SQL set-based)."""
+import enum
+import io
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.utils.instrumentacao import registrar_consulta
+
+# Marcador de nulo usado no COPY (distingue NULL de string vazia)
+NULL_COPY = "\\N"
+
+
+def _nomes_enum(serie: pd.Series) -> pd.Series:
+    """
+    Converte colunas de Enum para o nome do membro.
+
+    O SQLAlchemy grava Enums pelo nome (ex: "ENTULHO", "FINALIZADO"),
+    então o COPY precisa enviar o nome e não o valor.
+    """
+    amostra = serie.dropna()
+    if amostra.empty or not isinstance(amostra.iloc[0], enum.Enum):
+        return serie
+    classe_enum = type(amostra.iloc[0])
+    return serie.map({membro: membro.name for membro in classe_enum})
+
+
+def dataframe_de_registros(registros: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Monta o DataFrame de registros já com os Enums convertidos para o nome.
+    
+    A conversão precisa ser feita antes da construção: com o pandas 3 e o
+    pyarrow instalado, colunas de Enums `str` são inferidas como texto e
+    perdem o membro (ficaria o valor, ex: "regularizado").
+    """
+    return pd.DataFrame.from_records([
+        {coluna: valor.name if isinstance(valor, enum.Enum) else valor for coluna, valor in registro.items()}
+        for registro in registros
+    ])
+
+
+def copiar_para_staging(
+    db: Session,
+    tabela: str,
+    staging: str,
+    dados: pd.DataFrame,
+    colunas_extras: Optional[Dict[str, str]] = None,
+) -> int:
+    """
+    Carrega um DataFrame em uma tabela temporária via COPY.
+
+    A tabela temporária é criada com os tipos das colunas correspondentes
+    de `tabela` (sem constraints) e descartada no commit da transação.
+
+    Args:
+        db: Sessão do banco (o COPY roda na mesma transação)
+        tabela: Tabela de destino usada como modelo de tipos
+        staging: Nome da tabela temporária
+        dados: DataFrame cujas colunas têm os mesmos nomes de `tabela`
+            (mais as de `colunas_extras`)
+        colunas_extras: Colunas que não existem em `tabela` (nome -> tipo SQL),
+            usadas só pelo SQL set-based (ex: data da alteração de status)
+
+    Returns:
+        Número de linhas copiadas
+    """
+    colunas_extras = colunas_extras or {}
+    colunas_sql = ", ".join(dados.columns)
+    colunas_modelo = ", ".join(
+        f"CAST(NULL AS {colunas_extras[coluna]}) AS {coluna}" if coluna in colunas_extras else coluna
+        for coluna in dados.columns
+    )
+
+    db.execute(text(f"DROP TABLE IF EXISTS {staging}"))
+    db.execute(text(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+        f"SELECT {colunas_modelo} FROM {tabela} WITH NO DATA"
+    ))
+
+    if dados.empty:
+        return 0
+
+    buffer = io.StringIO()
+    dados.apply(_nomes_enum).to_csv(
+        buffer,
+        header=False,
+        index=False,
+        na_rep=NULL_COPY,
+        date_format="%Y-%m-%d %H:%M:%S",
+    )
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {staging} ({colunas_sql}) FROM STDIN WITH (FORMAT csv, NULL '{NULL_COPY}')",
+            buffer,
+        )
+        # O COPY usa o cursor do driver, fora dos eventos do SQLAlchemy
+        registrar_consulta()
+    finally:
+        cursor.close()
+
+    return len(dados)
+
+
+def executar(db: Session, sql: str, parametros: Dict[str, Any] = None) -> int:
+    """Executa um comando SQL set-based e retorna o número de linhas afetadas."""
+    return db.execute(text(sql), parametros or {}).rowcount
+
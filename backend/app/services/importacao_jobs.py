@@ -0,0 +1,331 @@
+"""Fila de importações de CSV executadas em segundo plano."""
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.csv_processor import CSVProcessor
+from app.services.importacao_pacote import ERRO as ERRO_PACOTE, ImportacaoPacoteService
+
+logger = logging.getLogger(__name__)
+
+# Entidade -> método do CSVProcessor
+PROCESSADORES = {
+    "sacs": "processar_sacs_csv",
+    "cnc": "processar_cnc_csv",
+    "acic": "processar_acic_csv",
+    "ouvidoria": "processar_ouvidoria_csv",
+}
+
+# Entidade dos jobs de importação em pacote (várias entidades de uma vez)
+PACOTE = "pacote"
+
+# Estados de um job
+PENDENTE = "pendente"
+AGUARDANDO = "aguardando"  # esperando outra importação da mesma entidade
+PROCESSANDO = "processando"
+CONCLUIDO = "concluido"
+ERRO = "erro"
+ESTADOS_FINAIS = (CONCLUIDO, ERRO)
+
+
+def mensagem_erro_importacao(erro: Exception) -> str:
+    """Mensagem amigável para erros de importação."""
+    error_msg = str(erro)
+    # Melhorar mensagem de erro para duplicados
+    if "duplicate key" in error_msg.lower() or "unique constraint" in error_msg.lower():
+        error_msg = "Erro: Registros duplicados encontrados. Alguns registros já existem no banco de dados."
+    return error_msg
+
+
+class ImportacaoJob:
+    """Estado de uma importação enfileirada."""
+
+    def __init__(self, entidade: str, arquivo: str, nome_arquivo: Optional[str] = None):
+        self.id = str(uuid.uuid4())
+        self.entidade = entidade
+        self.arquivo = arquivo
+        self.nome_arquivo = nome_arquivo
+        self.pacote: Optional[Dict[str, str]] = None  # entidade -> CSV (jobs de pacote)
+        self.atomico = True
+        self.status = PENDENTE
+        self.etapa = "na_fila"
+        self.linhas_processadas = 0
+        self.resultado: Optional[Dict[str, Any]] = None
+        self.erro: Optional[str] = None
+        self.criado_em = datetime.utcnow()
+        self.iniciado_em: Optional[datetime] = None
+        self.finalizado_em: Optional[datetime] = None
+        self.versao = 0  # incrementada a cada mudança (usada pelo stream SSE)
+        self._inicio_processamento: Optional[float] = None
+
+    def atualizar(self, **campos: Any) -> None:
+        """Atualiza campos do job e marca a mudança."""
+        for campo, valor in campos.items():
+            setattr(self, campo, valor)
+        self.versao += 1
+
+    def iniciar(self) -> None:
+        """Marca o início do processamento."""
+        self._inicio_processamento = time.perf_counter()
+        self.atualizar(status=PROCESSANDO, etapa="lendo", iniciado_em=datetime.utcnow())
+
+    def linhas_por_segundo(self) -> Optional[float]:
+        """Vazão da importação desde o início do processamento."""
+        if self._inicio_processamento is None:
+            return None
+        decorrido = time.perf_counter() - self._inicio_processamento
+        if decorrido <= 0:
+            return None
+        return round(self.linhas_processadas / decorrido, 1)
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Representação serializável do job."""
+        vazao = self.linhas_por_segundo()
+        if self.resultado and self.resultado.get("linhas_por_segundo") is not None:
+            vazao = self.resultado["linhas_por_segundo"]
+        return {
+            "job_id": self.id,
+            "entidade": self.entidade,
+            "arquivo": self.nome_arquivo,
+            "status": self.status,
+            "etapa": self.etapa,
+            "linhas_processadas": self.linhas_processadas,
+            "linhas_por_segundo": vazao,
+            "resultado": self.resultado,
+            "erro": self.erro,
+            "criado_em": self.criado_em.isoformat(),
+            "iniciado_em": self.iniciado_em.isoformat() if self.iniciado_em else None,
+            "finalizado_em": self.finalizado_em.isoformat() if self.finalizado_em else None,
+        }
+
+
+class FilaImportacoes:
+    """
+    Executa importações de CSV em um pool limitado de threads.
+
+    O número de importações simultâneas é IMPORT_MAX_WORKERS. Importações
+    da mesma entidade são serializadas, para que dois uploads de SACs não
+    gravem a mesma tabela ao mesmo tempo: um job só vai para o pool quando
+    todas as suas entidades estão livres. Os que esperam ficam em uma fila
+    (na ordem de chegada por entidade) sem ocupar threads do pool, então
+    não atrasam importações de outras entidades.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        sessao_factory: Callable[[], Session] = SessionLocal,
+        jobs_retidos: Optional[int] = None,
+    ):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.IMPORT_MAX_WORKERS,
+            thread_name_prefix="importacao",
+        )
+        self._sessao_factory = sessao_factory
+        self._jobs_retidos = jobs_retidos or settings.IMPORT_JOBS_RETIDOS
+        self._jobs: "OrderedDict[str, ImportacaoJob]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._agenda_lock = threading.Lock()
+        self._entidades_ocupadas: Set[str] = set()
+        self._aguardando: List[ImportacaoJob] = []
+        self._encerrada = False
+
+    def enfileirar(self, entidade: str, arquivo: str, nome_arquivo: Optional[str] = None) -> ImportacaoJob:
+        """
+        Enfileira a importação de um arquivo.
+
+        O arquivo é removido ao final da importação.
+
+        Returns:
+            Job criado (status "pendente")
+        """
+        if entidade not in PROCESSADORES:
+            raise ValueError(f"Entidade inválida: {entidade}")
+
+        job = ImportacaoJob(entidade, arquivo, nome_arquivo)
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+            self._descartar_antigos()
+        self._agendar(job)
+        return job
+
+    def enfileirar_pacote(
+        self,
+        diretorio: str,
+        arquivos: Dict[str, str],
+        nomes_arquivos: List[str],
+        atomico: bool = True,
+    ) -> ImportacaoJob:
+        """
+        Enfileira a importação de um pacote (ver ImportacaoPacoteService).
+
+        O diretório temporário do pacote é removido ao final da importação.
+
+        Args:
+            diretorio: Diretório temporário com os arquivos do pacote
+            arquivos: Dict entidade -> caminho do CSV
+            nomes_arquivos: Nomes originais dos arquivos enviados
+            atomico: Commit único do pacote (True) ou por arquivo (False)
+        """
+        invalidas = set(arquivos) - set(PROCESSADORES)
+        if invalidas:
+            raise ValueError(f"Entidades inválidas: {', '.join(sorted(invalidas))}")
+
+        job = ImportacaoJob(PACOTE, diretorio, ", ".join(nomes_arquivos))
+        job.pacote = arquivos
+        job.atomico = atomico
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+            self._descartar_antigos()
+        self._agendar(job)
+        return job
+
+    def obter(self, job_id: str) -> Optional[ImportacaoJob]:
+        """Retorna o job pelo id (None se não existir ou já tiver sido descartado)."""
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def encerrar(self) -> None:
+        """Encerra o pool, descartando jobs que ainda não começaram."""
+        with self._agenda_lock:
+            self._encerrada = True
+            self._aguardando.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _descartar_antigos(self) -> None:
+        """Mantém no máximo `jobs_retidos` jobs finalizados em memória."""
+        finalizados = [job_id for job_id, job in self._jobs.items() if job.status in ESTADOS_FINAIS]
+        for job_id in finalizados[:max(0, len(finalizados) - self._jobs_retidos)]:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _entidades(job: ImportacaoJob) -> Set[str]:
+        """Entidades gravadas pelo job (todas as do pacote, nos jobs de pacote)."""
+        return set(job.pacote) if job.pacote is not None else {job.entidade}
+
+    def _agendar(self, job: ImportacaoJob) -> None:
+        """Envia o job ao pool se as suas entidades estão livres; senão, coloca na fila de espera."""
+        with self._agenda_lock:
+            if self._encerrada:
+                return
+            # Respeita a ordem de chegada: um job que espera pela mesma entidade vai antes
+            bloqueadas = set(self._entidades_ocupadas)
+            for anterior in self._aguardando:
+                bloqueadas |= self._entidades(anterior)
+            if self._entidades(job) & bloqueadas:
+                job.atualizar(status=AGUARDANDO, etapa="aguardando_importacao_em_andamento")
+                self._aguardando.append(job)
+                return
+            self._iniciar(job)
+
+    def _iniciar(self, job: ImportacaoJob) -> None:
+        """Reserva as entidades do job e envia ao pool (com `_agenda_lock`)."""
+        self._entidades_ocupadas |= self._entidades(job)
+        self._executor.submit(self._executar_pacote if job.pacote is not None else self._executar, job)
+
+    def _liberar(self, job: ImportacaoJob) -> None:
+        """Libera as entidades do job e envia ao pool os que esperavam e agora estão livres."""
+        with self._agenda_lock:
+            self._entidades_ocupadas -= self._entidades(job)
+            if self._encerrada:
+                return
+            bloqueadas = set(self._entidades_ocupadas)
+            aguardando = []
+            for proximo in self._aguardando:
+                entidades = self._entidades(proximo)
+                if entidades & bloqueadas:
+                    aguardando.append(proximo)
+                else:
+                    self._iniciar(proximo)
+                bloqueadas |= entidades
+            self._aguardando = aguardando
+
+    def _executar(self, job: ImportacaoJob) -> None:
+        """Executa um job no worker (as entidades já foram reservadas por `_agendar`)."""
+        db = None
+        try:
+            db = self._sessao_factory()
+            job.iniciar()
+
+            def progresso(etapa: str, linhas: int) -> None:
+                job.atualizar(etapa=etapa, linhas_processadas=linhas)
+
+            processor = CSVProcessor(db, progresso=progresso)
+            resultado = getattr(processor, PROCESSADORES[job.entidade])(job.arquivo)
+
+            job.atualizar(
+                status=CONCLUIDO,
+                etapa="concluido",
+                linhas_processadas=resultado.get("total", job.linhas_processadas),
+                resultado=resultado,
+                finalizado_em=datetime.utcnow(),
+            )
+        except Exception as e:
+            logger.error(f"Erro na importação {job.id} ({job.entidade}): {e}")
+            job.atualizar(
+                status=ERRO,
+                etapa="erro",
+                erro=mensagem_erro_importacao(e),
+                finalizado_em=datetime.utcnow(),
+            )
+        finally:
+            if db is not None:
+                db.close()
+            self._liberar(job)
+            if os.path.exists(job.arquivo):
+                os.unlink(job.arquivo)
+
+    def _executar_pacote(self, job: ImportacaoJob) -> None:
+        """Executa um job de pacote (todas as suas entidades já foram reservadas por `_agendar`)."""
+        db = None
+        try:
+            db = self._sessao_factory()
+            job.iniciar()
+
+            def progresso(etapa: str, linhas: int) -> None:
+                job.atualizar(etapa=etapa, linhas_processadas=linhas)
+
+            resultado = ImportacaoPacoteService(db, progresso=progresso).importar(job.pacote, atomico=job.atomico)
+
+            erros = [
+                f"{entidade}: {arquivo['erro']}"
+                for entidade, arquivo in resultado["arquivos"].items()
+                if arquivo.get("erro")
+            ]
+            job.atualizar(
+                status=ERRO if resultado["status"] == ERRO_PACOTE else CONCLUIDO,
+                etapa="erro" if resultado["status"] == ERRO_PACOTE else "concluido",
+                linhas_processadas=sum(
+                    arquivo.get("resultado", {}).get("total", 0) for arquivo in resultado["arquivos"].values()
+                ),
+                resultado=resultado,
+                erro="; ".join(erros) or None,
+                finalizado_em=datetime.utcnow(),
+            )
+        except Exception as e:
+            logger.error(f"Erro na importação {job.id} (pacote): {e}")
+            job.atualizar(
+                status=ERRO,
+                etapa="erro",
+                erro=mensagem_erro_importacao(e),
+                finalizado_em=datetime.utcnow(),
+            )
+        finally:
+            if db is not None:
+                db.close()
+            self._liberar(job)
+            shutil.rmtree(job.arquivo, ignore_errors=True)
+
+
+fila_importacoes = FilaImportacoes()
@@ -0,0 +1,345 @@
+"""Importação em pacote dos quatro exports do FLIP (SAC, CNC, ACIC e Ouvidoria)."""
+import contextlib
+import gzip
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.csv_processor import BlocoPreparado, CSVProcessor
+from app.services.gazetteer import gazetteer_local
+from app.utils.compressao import membros_csv, tipo_compressao
+from app.utils.instrumentacao import pico_memoria_mb
+
+logger = logging.getLogger(__name__)
+
+# Ordem de gravação: SAC antes de Ouvidoria (vínculo sac_id) e CNC antes de ACIC (vínculo cnc_id)
+ORDEM_GRAVACAO = ("sacs", "cnc", "acic", "ouvidoria")
+
+# Trecho do nome do arquivo -> entidade. A ordem importa: "OUVIDORIA" e
+# "ACIC" são testados antes de "SAC" e "CNC"
+NOMES_ENTIDADE = (
+    ("OUVIDORIA", "ouvidoria"),
+    ("ACIC", "acic"),
+    ("CNC", "cnc"),
+    ("SAC", "sacs"),
+)
+
+# Estados de cada arquivo do pacote
+CONCLUIDO = "concluido"
+ERRO = "erro"
+REVERTIDO = "revertido"  # gravado, mas desfeito pelo erro de outro arquivo (modo atômico)
+NAO_GRAVADO = "nao_gravado"
+PARCIAL = "parcial"  # status geral: parte dos arquivos com erro (modo não atômico)
+
+# Blocos preparados que um processo do pool pode deixar em disco à frente da
+# gravação, e intervalo (segundos) entre as verificações do diretório de blocos
+BLOCOS_ADIANTADOS = 4
+INTERVALO_BLOCOS = 0.05
+
+
+def identificar_entidade(nome_arquivo: str) -> Optional[str]:
+    """Entidade de um export do FLIP pelo nome do arquivo (ex: TODAS_ACICS.csv -> acic)."""
+    nome = os.path.basename(nome_arquivo).upper()
+    for trecho, entidade in NOMES_ENTIDADE:
+        if trecho in nome:
+            return entidade
+    return None
+
+
+def montar_pacote(caminhos: List[str], destino: str) -> Dict[str, str]:
+    """
+    Associa cada arquivo do pacote à sua entidade.
+
+    CSVs compactados (.csv.gz ou .zip com um único CSV) são lidos em
+    streaming. Os CSVs de um .zip com vários CSVs são separados em `destino`
+    como .csv.gz (compressão rápida, sem gravar o CSV descompactado), para
+    serem lidos em paralelo.
+
+    Returns:
+        Dict entidade -> caminho do CSV
+
+    Raises:
+        ValueError: Arquivo não reconhecido ou entidade repetida
+    """
+    arquivos: Dict[str, str] = {}
+
+    def adicionar(nome: str, caminho: str) -> None:
+        entidade = identificar_entidade(nome)
+        if not entidade:
+            raise ValueError(f"Não foi possível identificar a entidade do arquivo {nome}")
+        if entidade in arquivos:
+            raise ValueError(f"Mais de um arquivo de {entidade} no pacote")
+        arquivos[entidade] = caminho
+
+    for caminho in caminhos:
+        if tipo_compressao(caminho) != "zip":
+            adicionar(os.path.basename(caminho), caminho)
+            continue
+        with zipfile.ZipFile(caminho) as zip_file:
+            membros = membros_csv(zip_file)
+            if len(membros) == 1:
+                adicionar(os.path.basename(membros[0].filename), caminho)
+                continue
+            for membro in membros:
+                nome = os.path.basename(membro.filename)
+                separado = os.path.join(destino, f"{nome}.gz")
+                with zip_file.open(membro) as origem, gzip.open(separado, "wb", compresslevel=1) as saida:
+                    shutil.copyfileobj(origem, saida, settings.UPLOAD_BLOCK_SIZE)
+                adicionar(nome, separado)
+
+    if not arquivos:
+        raise ValueError("Nenhum CSV do FLIP encontrado no pacote")
+    return arquivos
+
+
+def _caminho_bloco(destino: str, entidade: str, numero: int) -> str:
+    """Arquivo do bloco `numero` (a partir de 1) da entidade no diretório de blocos."""
+    return os.path.join(destino, f"{entidade}_{numero:06d}.pkl")
+
+
+def _caminho_cancelamento(destino: str, entidade: str) -> str:
+    """Marca de que os blocos da entidade não serão mais consumidos."""
+    return os.path.join(destino, f"{entidade}.cancelado")
+
+
+def _preparar_arquivo(entidade: str, file_path: str, chunksize: Optional[int], destino: str) -> int:
+    """
+    Leitura e preparo de um arquivo do pacote (executado em um processo do pool).
+
+    Cada bloco lido passa por `CSVProcessor.preparar_bloco` (hash das
+    linhas, classificação, coordenadas e datas) e é gravado em `destino`
+    assim que fica pronto, enquanto o processo principal grava os
+    anteriores. O processo guarda um bloco por vez e deixa no máximo
+    BLOCOS_ADIANTADOS blocos em disco à frente da gravação.
+
+    Returns:
+        Número de blocos gravados
+    """
+    processor = CSVProcessor(None)
+    cancelamento = _caminho_cancelamento(destino, entidade)
+    numero = 0
+    for numero, bloco in enumerate(processor.ler_blocos(entidade, file_path, chunksize), start=1):
+        preparado = processor.preparar_bloco(entidade, bloco)
+        del bloco
+        while os.path.exists(_caminho_bloco(destino, entidade, numero - BLOCOS_ADIANTADOS)):
+            if os.path.exists(cancelamento):
+                break
+            time.sleep(INTERVALO_BLOCOS)
+        if os.path.exists(cancelamento):
+            return numero - 1
+        # Gravado com outro nome e renomeado: o processo principal só vê blocos completos
+        caminho = _caminho_bloco(destino, entidade, numero)
+        pd.to_pickle(preparado, f"{caminho}.tmp")
+        os.replace(f"{caminho}.tmp", caminho)
+    return numero
+
+
+def _blocos_preparados(preparo: Future, destino: str, entidade: str) -> Iterator[BlocoPreparado]:
+    """
+    Blocos gravados por `_preparar_arquivo`, em ordem, à medida que ficam prontos.
+
+    Cada bloco é lido e apagado do disco. Um erro no processo do pool é
+    relançado aqui, depois dos blocos que ele chegou a gravar.
+    """
+    numero = 1
+    while True:
+        caminho = _caminho_bloco(destino, entidade, numero)
+        if not os.path.exists(caminho):
+            if not preparo.done():
+                wait([preparo], timeout=INTERVALO_BLOCOS)
+                continue
+            if not os.path.exists(caminho):
+                preparo.result()
+                return
+        bloco = pd.read_pickle(caminho)
+        os.remove(caminho)
+        numero += 1
+        yield bloco
+
+
+class ImportacaoPacoteService:
+    """
+    Importa os exports do dia de uma vez.
+
+    Cada arquivo é lido e preparado (hash das linhas, classificação,
+    coordenadas e datas) em um pool de IMPORT_PACOTE_WORKERS processos, que
+    grava os blocos prontos em um diretório temporário. O processo principal
+    grava os arquivos na ordem de ORDEM_GRAVACAO, consumindo cada bloco
+    assim que fica pronto: a comparação com o banco, o geocoding e a
+    gravação de um bloco acontecem enquanto os próximos são preparados. A
+    memória fica limitada ao bloco (IMPORT_CHUNK_SIZE linhas) em cada
+    processo, e não ao tamanho dos arquivos. Com 1 processo não há pool e
+    cada arquivo é lido e preparado no próprio processo principal.
+
+    No modo atômico o pacote inteiro é uma transação: um erro em qualquer
+    arquivo desfaz todos. Caso contrário cada arquivo é commitado por
+    conta própria e os erros são reportados por arquivo.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        progresso: Optional[Callable[[str, int], None]] = None,
+        max_workers: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ):
+        self.db = db
+        self.progresso = progresso
+        self.max_workers = max_workers or settings.IMPORT_PACOTE_WORKERS
+        self.chunksize = chunksize
+
+    def importar(self, arquivos: Dict[str, str], atomico: bool = True) -> Dict[str, Any]:
+        """
+        Importa o pacote.
+
+        Args:
+            arquivos: Dict entidade -> caminho do CSV (ver `montar_pacote`)
+            atomico: Commit único do pacote (True) ou por arquivo (False)
+
+        Returns:
+            Dict com o status geral e o resultado de cada arquivo
+        """
+        invalidas = set(arquivos) - set(ORDEM_GRAVACAO)
+        if invalidas:
+            raise ValueError(f"Entidades inválidas: {', '.join(sorted(invalidas))}")
+
+        inicio = time.perf_counter()
+        entidades = [entidade for entidade in ORDEM_GRAVACAO if entidade in arquivos]
+        resultados: Dict[str, Dict[str, Any]] = {entidade: {"status": NAO_GRAVADO} for entidade in entidades}
+        falhou = False
+
+        pool = None
+        diretorio_blocos = None
+        if self.max_workers > 1:
+            # Mesmo com um arquivo só o pool adianta o preparo dos blocos durante a gravação.
+            # spawn: o processo principal tem threads (fila de importações, servidor)
+            pool = ProcessPoolExecutor(
+                max_workers=min(self.max_workers, len(entidades)),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            diretorio_blocos = tempfile.mkdtemp(prefix="pacote_blocos_")
+        try:
+            # Submetidos na ordem de gravação: o pool começa pelos arquivos gravados primeiro
+            preparos: Dict[str, Future] = {}
+            if pool:
+                for entidade in entidades:
+                    preparos[entidade] = pool.submit(
+                        _preparar_arquivo, entidade, arquivos[entidade], self.chunksize, diretorio_blocos
+                    )
+
+            for entidade in entidades:
+                if falhou and atomico:
+                    break
+                try:
+                    resultados[entidade] = self._gravar(
+                        entidade, arquivos[entidade], preparos.get(entidade), diretorio_blocos, atomico
+                    )
+                except Exception as e:
+                    self.db.rollback()
+                    logger.error(f"Erro ao importar {entidade} do pacote: {e}")
+                    falhou = True
+                    resultados[entidade] = {"status": ERRO, "erro": str(e)}
+                    if atomico:
+                        for anterior in entidades[:entidades.index(entidade)]:
+                            resultados[anterior]["status"] = REVERTIDO
+                finally:
+                    if pool:
+                        # Blocos não consumidos (arquivo repetido ou erro) não seguram o pool
+                        self._encerrar_preparo(diretorio_blocos, entidade)
+
+            vinculadas = 0
+            if not (falhou and atomico) and (
+                resultados.get("sacs", {}).get("status") == CONCLUIDO
+                or resultados.get("ouvidoria", {}).get("status") == CONCLUIDO
+            ):
+                # Ouvidorias gravadas antes do seu SAC (em importações anteriores)
+                vinculadas = CSVProcessor(self.db).vincular_ouvidorias_sem_sac()
+
+            if not (falhou and atomico):
+                self._notificar("pacote", "commit", 0)
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        finally:
+            if pool:
+                # Arquivos ainda em preparo (erro no modo atômico) param no próximo bloco
+                for entidade in entidades:
+                    self._encerrar_preparo(diretorio_blocos, entidade)
+                pool.shutdown(wait=True, cancel_futures=True)
+            if diretorio_blocos:
+                shutil.rmtree(diretorio_blocos, ignore_errors=True)
+
+        # Novas coordenadas conhecidas entram no gazetteer local
+        gazetteer_local.invalidar()
+
+        if not falhou:
+            status = CONCLUIDO
+        elif atomico or all(r["status"] != CONCLUIDO for r in resultados.values()):
+            status = ERRO
+        else:
+            status = PARCIAL
+        return {
+            "status": status,
+            "atomico": atomico,
+            "arquivos": resultados,
+            "ouvidorias_vinculadas": vinculadas,
+            "duracao_segundos": round(time.perf_counter() - inicio, 3),
+            "pico_memoria_mb": pico_memoria_mb(),
+        }
+
+    def _gravar(
+        self,
+        entidade: str,
+        file_path: str,
+        preparo: Optional[Future],
+        diretorio_blocos: Optional[str],
+        atomico: bool,
+    ) -> Dict[str, Any]:
+        """
+        Grava um arquivo do pacote.
+
+        Com o pool, os blocos vêm de `_blocos_preparados`; a etapa "leitura"
+        das métricas passa a ser o tempo esperando blocos do pool.
+        """
+        inicio = time.perf_counter()
+        self._notificar(entidade, "lendo", 0)
+        blocos = _blocos_preparados(preparo, diretorio_blocos, entidade) if preparo else None
+
+        def progresso(etapa: str, linhas: int) -> None:
+            self._notificar(entidade, etapa, linhas)
+
+        processor = CSVProcessor(self.db, progresso=progresso)
+        metodo = getattr(processor, f"processar_{entidade}_csv")
+        resultado = metodo(file_path, self.chunksize, blocos=blocos, commit=not atomico)
+
+        return {
+            "status": CONCLUIDO,
+            "resultado": resultado,
+            "duracao_segundos": round(time.perf_counter() - inicio, 3),
+        }
+
+    @staticmethod
+    def _encerrar_preparo(diretorio_blocos: str, entidade: str) -> None:
+        """Para o preparo da entidade no pool, se ainda em andamento, e apaga os blocos que sobraram."""
+        open(_caminho_cancelamento(diretorio_blocos, entidade), "w").close()
+        for nome in os.listdir(diretorio_blocos):
+            if nome.startswith(f"{entidade}_"):
+                # Um .tmp pode ter sido renomeado pelo processo nesse meio tempo
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(diretorio_blocos, nome))
+
+    def _notificar(self, entidade: str, etapa: str, linhas: int) -> None:
+        """Repassa o progresso ao callback, com a etapa prefixada pela entidade."""
+        if self.progresso:
+            self.progresso(f"{entidade}:{etapa}", linhas)
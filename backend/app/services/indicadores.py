@@ -1,19 +1,156 @@
 """Cálculos de indicadores ADC."""
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, Optional, List
+from typing import Dict, Iterable, Optional, List
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, or_
+from sqlalchemy import Date, String, and_, case, cast, func, or_, select, union_all
+from sqlalchemy.sql import ColumnElement, Select
 
 from app.models.sac import SAC, TipoServico, StatusSAC, Subprefeitura
 from app.models.cnc import CNC, StatusCNC
 from app.models.indicador import Indicador, TipoIndicador
 from app.models.acic import ACIC
+from app.models.indicador_diario import IndicadorDiario
 from app.config import settings
+from app.services.cache_indicadores import cache_indicadores
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Tipos escalonados (IRD)
+TIPOS_ESCALONADOS = [
+    TipoServico.CATABAGULHO,
+    TipoServico.VARRIACAO_COLETA,
+    TipoServico.MUTIRAO,
+    TipoServico.LAVAGEM,
+    TipoServico.BUEIRO,
+    TipoServico.VARRIACAO,
+    TipoServico.VARRIACAO_PRACAS,
+    TipoServico.MONUMENTOS,
+    TipoServico.OUTROS,
+]
+
+# Tipos demandantes (IA)
+TIPOS_DEMANDANTES = [
+    TipoServico.ENTULHO,
+    TipoServico.ANIMAL_MORTO,
+    TipoServico.PAPELEIRAS,
+]
+
+# Status que contam como procedente (IRD e IA)
+STATUS_PROCEDENTES = [
+    StatusSAC.EXECUTADO,
+    StatusSAC.FINALIZADO,
+    StatusSAC.CONFIRMADA_EXECUCAO,
+]
+
+# Subprefeitura -> texto gravado em CNC.subprefeitura (IF)
+SUBPREFEITURA_CNC = {
+    Subprefeitura.CV: "Casa Verde/Cachoeirinha",
+    Subprefeitura.JT: "Jaçanã/Tremembé",
+    Subprefeitura.ST: "Santana/Tucuruvi",
+    Subprefeitura.MG: "Vila Maria/Vila Guilherme",
+}
+
+# Subprefeitura das contagens de CNCs cujo texto não está em SUBPREFEITURA_CNC
+SEM_SUBPREFEITURA = ""
+
+# Contagens de uma subprefeitura usadas por IRD, IA e IF
+CONTAGENS = ("reclamacoes", "procedentes", "no_prazo", "fiscalizacoes", "sem_irregularidade")
+
+# Indicador -> (chave no resultado de calcular_indicadores, contagens que usa)
+CONTAGENS_INDICADOR = {
+    TipoIndicador.IRD: ("ird", ("reclamacoes",)),
+    TipoIndicador.IA: ("ia", ("procedentes", "no_prazo")),
+    TipoIndicador.IF: ("if", ("fiscalizacoes", "sem_irregularidade")),
+}
+
+
+def _somar(contagens: Iterable[Dict[str, int]]) -> Dict[str, int]:
+    """Soma contagens (ausentes valem 0)."""
+    return {nome: sum(int(c.get(nome, 0)) for c in contagens) for nome in CONTAGENS}
+
+
+def somar_meses(mes: date, quantidade: int) -> date:
+    """Primeiro dia do mês `quantidade` meses depois (ou antes) de `mes`."""
+    ano, indice = divmod(mes.year * 12 + mes.month - 1 + quantidade, 12)
+    return date(ano, indice + 1, 1)
+
+
+def consulta_contagens(
+    periodo_sac: ColumnElement,
+    periodo_cnc: ColumnElement,
+    subprefeitura: Optional[Subprefeitura] = None,
+    por_dia: bool = False,
+    por_mes: bool = False,
+) -> Select:
+    """
+    Consulta das contagens de IRD, IA e IF por subprefeitura.
+    
+    SACs que atendem `periodo_sac` e CNCs que atendem `periodo_cnc` são
+    agregados com `count(*) FILTER (WHERE ...)` e GROUP BY subprefeitura
+    (e dia, com `por_dia`, ou `date_trunc('month')`, com `por_mes`), e os
+    dois agrupamentos são unidos por FULL JOIN. CNCs de subprefeitura fora
+    de SUBPREFEITURA_CNC ficam em SEM_SUBPREFEITURA.
+    
+    Returns:
+        SELECT com as colunas [dia | mes,] subprefeitura e CONTAGENS
+    """
+    procedente = SAC.status.in_(STATUS_PROCEDENTES)
+    demandante = and_(SAC.tipo_servico.in_(TIPOS_DEMANDANTES), SAC.data_execucao.isnot(None))
+    chaves_sac = {"subprefeitura": cast(SAC.subprefeitura, String)}
+    chaves_cnc = {
+        "subprefeitura": case(
+            {texto: sigla.name for sigla, texto in SUBPREFEITURA_CNC.items()},
+            value=CNC.subprefeitura,
+            else_=SEM_SUBPREFEITURA,
+        ),
+    }
+    if por_dia:
+        chaves_sac = {"dia": cast(SAC.data_criacao, Date), **chaves_sac}
+        chaves_cnc = {"dia": cast(CNC.data_abertura, Date), **chaves_cnc}
+    elif por_mes:
+        chaves_sac = {"mes": func.date_trunc('month', SAC.data_criacao), **chaves_sac}
+        chaves_cnc = {"mes": func.date_trunc('month', CNC.data_abertura), **chaves_cnc}
+    
+    sacs = (
+        select(
+            *[expressao.label(nome) for nome, expressao in chaves_sac.items()],
+            func.count().filter(SAC.tipo_servico.in_(TIPOS_ESCALONADOS)).label("reclamacoes"),
+            func.count().filter(demandante).label("procedentes"),
+            func.count().filter(and_(
+                demandante,
+                func.extract('epoch', SAC.data_execucao - SAC.data_criacao) / 3600 <= SAC.prazo_max_hours,
+            )).label("no_prazo"),
+        )
+        .where(periodo_sac, procedente)
+        .group_by(*chaves_sac.values())
+    )
+    cncs = (
+        select(
+            *[expressao.label(nome) for nome, expressao in chaves_cnc.items()],
+            func.count().label("fiscalizacoes"),
+            func.count().filter(CNC.status == StatusCNC.REGULARIZADO).label("sem_irregularidade"),
+        )
+        .where(periodo_cnc)
+        .group_by(*chaves_cnc.values())
+    )
+    
+    if subprefeitura:
+        sacs = sacs.where(SAC.subprefeitura == subprefeitura)
+        cncs = cncs.where(CNC.subprefeitura == SUBPREFEITURA_CNC.get(subprefeitura))
+    
+    sacs = sacs.subquery("sacs_periodo")
+    cncs = cncs.subquery("cncs_periodo")
+    return select(
+        *[func.coalesce(sacs.c[nome], cncs.c[nome]).label(nome) for nome in chaves_sac],
+        *[func.coalesce(sacs.c[nome], 0).label(nome) for nome in CONTAGENS[:3]],
+        *[func.coalesce(cncs.c[nome], 0).label(nome) for nome in CONTAGENS[3:]],
+    ).select_from(
+        sacs.join(cncs, and_(*[sacs.c[nome] == cncs.c[nome] for nome in chaves_sac]), full=True)
+    )
+
 
 class IndicadoresService:
     """Serviço para cálculos de indicadores."""
@@ -41,43 +178,399 @@ class IndicadoresService:
         Returns:
             Dict com valor do IRD, pontuação e detalhes
         """
-        # Tipos escalonados
-        tipos_escalonados = [
-            TipoServico.CATABAGULHO,
-            TipoServico.VARRIACAO_COLETA,
-            TipoServico.MUTIRAO,
-            TipoServico.LAVAGEM,
-            TipoServico.BUEIRO,
-            TipoServico.VARRIACAO,
-            TipoServico.VARRIACAO_PRACAS,
-            TipoServico.MONUMENTOS,
-            TipoServico.OUTROS,
-        ]
-        
-        # Query base
-        query = self.db.query(SAC).filter(
-            and_(
-                SAC.data_criacao >= periodo_inicial,
-                SAC.data_criacao <= periodo_final,
-                SAC.tipo_servico.in_(tipos_escalonados),
-                SAC.status.in_([
-                    StatusSAC.EXECUTADO,
-                    StatusSAC.FINALIZADO,
-                    StatusSAC.CONFIRMADA_EXECUCAO,
-                ])
-            )
+        return self.calcular_indicadores(periodo_inicial, periodo_final, subprefeitura)["ird"]
+    
+    def calcular_ia(
+        self,
+        periodo_inicial: datetime,
+        periodo_final: datetime,
+        subprefeitura: Optional[Subprefeitura] = None
+    ) -> Dict[str, any]:
+        """
+        Calcula IA (Índice de Atendimento).
+        
+        Fórmula: (solicitações demandantes atendidas no prazo / total demandantes procedentes) × 100
+        
+        Args:
+            periodo_inicial: Data inicial do período
+            periodo_final: Data final do período
+            subprefeitura: Subprefeitura (opcional)
+            
+        Returns:
+            Dict com valor do IA, pontuação e detalhes
+        """
+        return self.calcular_indicadores(periodo_inicial, periodo_final, subprefeitura)["ia"]
+    
+    def calcular_if(
+        self,
+        periodo_inicial: datetime,
+        periodo_final: datetime,
+        subprefeitura: Optional[Subprefeitura] = None
+    ) -> Dict[str, any]:
+        """
+        Calcula IF (Índice de Fiscalização).
+        
+        Fórmula: (nº de fiscalizações sem irregularidade / total fiscalizações) × 100
+        
+        Args:
+            periodo_inicial: Data inicial do período
+            periodo_final: Data final do período
+            subprefeitura: Subprefeitura (opcional)
+            
+        Returns:
+            Dict com valor do IF, pontuação e detalhes
+        """
+        return self.calcular_indicadores(periodo_inicial, periodo_final, subprefeitura)["if"]
+    
+    def calcular_indicadores(
+        self,
+        periodo_inicial: datetime,
+        periodo_final: datetime,
+        subprefeitura: Optional[Subprefeitura] = None
+    ) -> Dict[str, Dict[str, any]]:
+        """
+        Calcula IRD, IA e IF de uma vez (uma consulta ao banco).
+        
+        O resultado fica em `cache_indicadores` até a próxima alteração de
+        SACs ou CNCs: repetir o mesmo período não consulta o banco.
+        
+        Args:
+            periodo_inicial: Data inicial do período
+            periodo_final: Data final do período
+            subprefeitura: Subprefeitura (opcional, se None calcula geral)
+            
+        Returns:
+            Dict {"ird", "ia", "if"} com os mesmos resultados de calcular_ird,
+            calcular_ia e calcular_if
+        """
+        def calcular():
+            contagens = self._contar(periodo_inicial, periodo_final, subprefeitura)
+            return self._indicadores(_somar(contagens.values()), periodo_inicial, periodo_final, subprefeitura)
+        
+        return cache_indicadores.obter_ou_calcular(
+            ("indicadores", periodo_inicial, periodo_final, subprefeitura), calcular
         )
+    
+    def calcular_indicadores_por_subprefeitura(
+        self,
+        periodo_inicial: datetime,
+        periodo_final: datetime
+    ) -> Dict[Optional[Subprefeitura], Dict[str, Dict[str, any]]]:
+        """
+        Calcula IRD, IA e IF de todas as subprefeituras e o geral (uma consulta ao banco).
+        
+        Também passa por `cache_indicadores`.
+        
+        Returns:
+            Dict subprefeitura -> {"ird", "ia", "if"}; a chave None é o geral
+        """
+        def calcular():
+            contagens = self._contar(periodo_inicial, periodo_final)
+            resultados = {
+                None: self._indicadores(_somar(contagens.values()), periodo_inicial, periodo_final, None),
+            }
+            for subprefeitura in Subprefeitura:
+                resultados[subprefeitura] = self._indicadores(
+                    _somar([contagens.get(subprefeitura, {})]), periodo_inicial, periodo_final, subprefeitura
+                )
+            return resultados
+        
+        return cache_indicadores.obter_ou_calcular(
+            ("por_subprefeitura", periodo_inicial, periodo_final), calcular
+        )
+    
+    def calcular_serie_mensal(
+        self,
+        mes_final: date,
+        meses: int,
+        subprefeitura: Optional[Subprefeitura] = None
+    ) -> List[Dict[str, any]]:
+        """
+        Calcula IRD, IA e IF de `meses` meses consecutivos até `mes_final` (uma consulta ao banco).
+        
+        As contagens são agrupadas por `date_trunc('month')` em uma única
+        consulta (sobre `indicadores_diarios` com INDICADORES_DIARIOS, senão
+        sobre SACs e CNCs) e as faixas de pontuação são aplicadas mês a mês.
+        Cada mês vale do dia 1 às 23:59:59.999999 do último dia, então o
+        resultado é o mesmo de `calcular_indicadores` para o mês. Também
+        passa por `cache_indicadores`.
+        
+        Args:
+            mes_final: Qualquer data do último mês da série
+            meses: Quantidade de meses
+            subprefeitura: Subprefeitura (opcional, se None calcula geral)
+            
+        Returns:
+            Lista em ordem cronológica de {"mes", "ird", "ia", "if"}
+        """
+        fim_serie = somar_meses(mes_final.replace(day=1), 1)
+        inicio_serie = somar_meses(fim_serie, -meses)
+        
+        def calcular():
+            contagens = self._contar_por_data(inicio_serie, fim_serie, subprefeitura, por_mes=True)
+            serie = []
+            for indice in range(meses):
+                mes = somar_meses(inicio_serie, indice)
+                periodo_inicial = datetime.combine(mes, time.min)
+                periodo_final = datetime.combine(somar_meses(mes, 1), time.min) - timedelta(microseconds=1)
+                serie.append({
+                    "mes": mes.strftime("%Y-%m"),
+                    **self._indicadores(
+                        _somar([contagens.get(mes, {})]), periodo_inicial, periodo_final, subprefeitura
+                    ),
+                })
+            return serie
+        
+        return cache_indicadores.obter_ou_calcular(
+            ("serie_mensal", inicio_serie, meses, subprefeitura), calcular
+        )
+    
+    def calcular_serie_adc(
+        self,
+        mes_final: date,
+        meses: int,
+        subprefeitura: Optional[Subprefeitura] = None,
+        valores_ipt: Optional[Dict[str, Decimal]] = None
+    ) -> List[Dict[str, any]]:
+        """
+        Calcula o ADC de `meses` meses consecutivos até `mes_final`.
+        
+        Usa `calcular_serie_mensal` (uma consulta para a série inteira) e
+        monta cada mês como `calcular_adc`.
         
-        # Filtrar por subprefeitura se especificado
+        Args:
+            mes_final: Qualquer data do último mês da série
+            meses: Quantidade de meses
+            subprefeitura: Subprefeitura (opcional)
+            valores_ipt: IPT de cada mês ("AAAA-MM" -> valor); meses sem IPT pontuam 0
+            
+        Returns:
+            Lista em ordem cronológica com o resultado de `calcular_adc` de cada mês e "mes"
+        """
+        valores_ipt = valores_ipt or {}
+        serie = []
+        for indicadores in self.calcular_serie_mensal(mes_final, meses, subprefeitura):
+            serie.append({
+                "mes": indicadores["mes"],
+                **self._resultado_adc(
+                    indicadores,
+                    indicadores["ird"]["periodo_inicial"],
+                    indicadores["ird"]["periodo_final"],
+                    valores_ipt.get(indicadores["mes"]),
+                    None,
+                    None,
+                    subprefeitura,
+                ),
+            })
+        return serie
+    
+    def calcular_janelas_moveis(
+        self,
+        tipo: TipoIndicador,
+        janelas: Iterable[int],
+        data_inicial: date,
+        data_final: date,
+        subprefeitura: Optional[Subprefeitura] = None
+    ) -> Dict[int, List[Dict[str, any]]]:
+        """
+        Calcula IRD, IA ou IF em janelas móveis de dias, para cada dia de `data_inicial` a `data_final`.
+        
+        O ponto do dia D com janela de N dias vale o período do início do dia
+        D-(N-1) ao fim do dia D (o mesmo resultado de `calcular_indicadores`
+        nesse período). As contagens diárias são lidas uma vez, desde o
+        começo da maior janela, e acumuladas em somas prefixadas: a contagem
+        de cada janela é a diferença de duas posições, calculada para todos
+        os dias de uma vez. Também passa por `cache_indicadores`.
+        
+        Args:
+            tipo: IRD, IA ou IF
+            janelas: Tamanhos das janelas em dias (ex: [7, 14, 30])
+            data_inicial: Primeiro dia da série
+            data_final: Último dia da série
+            subprefeitura: Subprefeitura (opcional, se None calcula geral)
+            
+        Returns:
+            Dict janela -> lista em ordem cronológica de {"data", "valor",
+            "pontuacao"} e das contagens do indicador
+        """
+        if tipo not in CONTAGENS_INDICADOR:
+            raise ValueError(f"Janelas móveis só calculam IRD, IA e IF (recebido {tipo.value})")
+        janelas = tuple(sorted(set(janelas)))
+        chave, nomes = CONTAGENS_INDICADOR[tipo]
+        
+        def calcular():
+            inicio = data_inicial - timedelta(days=janelas[-1] - 1)
+            total_dias = (data_final - inicio).days + 1
+            contagens = self._contar_por_data(inicio, data_final + timedelta(days=1), subprefeitura)
+            
+            # acumulado[:, k] = soma dos dias [inicio, inicio + k)
+            acumulado = np.zeros((len(CONTAGENS), total_dias + 1), dtype=np.int64)
+            for dia, valores in contagens.items():
+                acumulado[:, (dia - inicio).days + 1] = [valores[nome] for nome in CONTAGENS]
+            acumulado = np.cumsum(acumulado, axis=1)
+            
+            posicoes = np.arange((data_inicial - inicio).days, total_dias)
+            dias = [inicio + timedelta(days=int(posicao)) for posicao in posicoes]
+            resultados = {}
+            for janela in janelas:
+                somas = (acumulado[:, posicoes + 1] - acumulado[:, posicoes + 1 - janela]).T.tolist()
+                serie = []
+                for dia, valores in zip(dias, somas):
+                    contagens_janela = dict(zip(CONTAGENS, valores))
+                    resultado = self._indicadores(
+                        contagens_janela,
+                        datetime.combine(dia - timedelta(days=janela - 1), time.min),
+                        datetime.combine(dia, time.max),
+                        subprefeitura,
+                    )[chave]
+                    serie.append({
+                        "data": dia.isoformat(),
+                        "valor": resultado["valor"],
+                        "pontuacao": resultado["pontuacao"],
+                        **{nome: contagens_janela[nome] for nome in nomes},
+                    })
+                resultados[janela] = serie
+            return resultados
+        
+        return cache_indicadores.obter_ou_calcular(
+            ("janelas_moveis", tipo, janelas, data_inicial, data_final, subprefeitura), calcular
+        )
+    
+    def _contar_por_data(
+        self,
+        inicio: date,
+        fim: date,
+        subprefeitura: Optional[Subprefeitura] = None,
+        por_mes: bool = False
+    ) -> Dict[date, Dict[str, int]]:
+        """
+        Contagens de IRD, IA e IF por dia (ou mês) em [inicio, fim), em uma única consulta.
+        
+        Returns:
+            Dict dia (ou primeiro dia do mês, com `por_mes`) -> contagens (ver
+            CONTAGENS); dias sem SACs nem CNCs não aparecem
+        """
+        if settings.INDICADORES_DIARIOS:
+            data = func.date_trunc('month', IndicadorDiario.dia) if por_mes else IndicadorDiario.dia
+            consulta = select(
+                data,
+                IndicadorDiario.subprefeitura,
+                *[func.sum(getattr(IndicadorDiario, nome)) for nome in CONTAGENS],
+            ).where(
+                IndicadorDiario.dia >= inicio,
+                IndicadorDiario.dia < fim,
+            ).group_by(data, IndicadorDiario.subprefeitura)
+            if subprefeitura:
+                consulta = consulta.where(IndicadorDiario.subprefeitura == subprefeitura.name)
+        else:
+            inicio_periodo = datetime.combine(inicio, time.min)
+            fim_periodo = datetime.combine(fim, time.min)
+            consulta = consulta_contagens(
+                and_(SAC.data_criacao >= inicio_periodo, SAC.data_criacao < fim_periodo),
+                and_(CNC.data_abertura >= inicio_periodo, CNC.data_abertura < fim_periodo),
+                subprefeitura,
+                por_dia=not por_mes,
+                por_mes=por_mes,
+            )
+        
+        contagens: Dict[date, Dict[str, int]] = {}
+        for data, _sigla, *valores in self.db.execute(consulta):
+            data = data.date() if isinstance(data, datetime) else data
+            contagens[data] = _somar([contagens.get(data, {}), dict(zip(CONTAGENS, valores))])
+        return contagens
+    
+    def _contar(
+        self,
+        periodo_inicial: datetime,
+        periodo_final: datetime,
+        subprefeitura: Optional[Subprefeitura] = None
+    ) -> Dict[Optional[Subprefeitura], Dict[str, int]]:
+        """
+        Contagens de IRD, IA e IF por subprefeitura em uma única consulta.
+        
+        Com INDICADORES_DIARIOS, os dias inteiros do período são somados de
+        `indicadores_diarios` e só as pontas (o começo do primeiro dia e o
+        fim do último, quando o período não começa ou termina na virada do
+        dia) são contadas em SACs e CNCs; as duas partes vão em um UNION ALL.
+        
+        Returns:
+            Dict subprefeitura -> contagens (ver CONTAGENS); a chave None
+            são CNCs de subprefeitura não mapeada (entram só no geral)
+        """
+        # Dias inteiros: [primeiro_dia, fim_dias)
+        primeiro_dia = periodo_inicial.date()
+        if periodo_inicial.time() != time.min:
+            primeiro_dia += timedelta(days=1)
+        fim_dias = (periodo_final + timedelta(microseconds=1)).date()
+        
+        if settings.INDICADORES_DIARIOS and primeiro_dia < fim_dias:
+            inicio_dias = datetime.combine(primeiro_dia, time.min)
+            depois_dias = datetime.combine(fim_dias, time.min)
+            
+            def pontas(coluna):
+                return or_(
+                    and_(coluna >= periodo_inicial, coluna < inicio_dias),
+                    and_(coluna >= depois_dias, coluna <= periodo_final),
+                )
+            
+            diarios = select(
+                IndicadorDiario.subprefeitura,
+                *[func.sum(getattr(IndicadorDiario, nome)) for nome in CONTAGENS],
+            ).where(
+                IndicadorDiario.dia >= primeiro_dia,
+                IndicadorDiario.dia < fim_dias,
+            ).group_by(IndicadorDiario.subprefeitura)
+            if subprefeitura:
+                diarios = diarios.where(IndicadorDiario.subprefeitura == subprefeitura.name)
+            consulta = union_all(
+                diarios,
+                consulta_contagens(pontas(SAC.data_criacao), pontas(CNC.data_abertura), subprefeitura),
+            )
+        else:
+            consulta = consulta_contagens(
+                and_(SAC.data_criacao >= periodo_inicial, SAC.data_criacao <= periodo_final),
+                and_(CNC.data_abertura >= periodo_inicial, CNC.data_abertura <= periodo_final),
+                subprefeitura,
+            )
+        
+        contagens: Dict[Optional[Subprefeitura], Dict[str, int]] = {}
+        for sigla, *valores in self.db.execute(consulta):
+            chave = Subprefeitura[sigla] if sigla else None
+            contagens[chave] = _somar([contagens.get(chave, {}), dict(zip(CONTAGENS, valores))])
+        return contagens
+    
+    def _indicadores(
+        self,
+        contagens: Dict[str, int],
+        periodo_inicial: datetime,
+        periodo_final: datetime,
+        subprefeitura: Optional[Subprefeitura]
+    ) -> Dict[str, Dict[str, any]]:
+        """Monta os resultados de IRD, IA e IF a partir das contagens."""
+        return {
+            "ird": self._resultado_ird(contagens["reclamacoes"], periodo_inicial, periodo_final, subprefeitura),
+            "ia": self._resultado_ia(
+                contagens["procedentes"], contagens["no_prazo"], periodo_inicial, periodo_final, subprefeitura
+            ),
+            "if": self._resultado_if(
+                contagens["fiscalizacoes"], contagens["sem_irregularidade"],
+                periodo_inicial, periodo_final, subprefeitura,
+            ),
+        }
+    
+    def _resultado_ird(
+        self,
+        total_reclamacoes: int,
+        periodo_inicial: datetime,
+        periodo_final: datetime,
+        subprefeitura: Optional[Subprefeitura]
+    ) -> Dict[str, any]:
+        """Resultado do IRD a partir do total de reclamações escalonadas procedentes."""
         if subprefeitura:
-            query = query.filter(SAC.subprefeitura == subprefeitura)
             domicilios = settings.DOMICILIOS_POR_SUBPREFEITURA.get(subprefeitura.value, self.TOTAL_DOMICILIOS)
         else:
             domicilios = self.TOTAL_DOMICILIOS
         
-        # Contar reclamações procedentes
-        total_reclamacoes = query.count()
-        
         # Calcular IRD
         if domicilios > 0:
             ird = Decimal(total_reclamacoes) / Decimal(domicilios) * Decimal(1000)
@@ -94,67 +587,21 @@ class IndicadoresService:
             "pontuacao": float(pontuacao),
             "total_reclamacoes": total_reclamacoes,
             "domicilios": domicilios,
-             "tipos_considerados": [tipo.value for tipo in tipos_escalonados],
+             "tipos_considerados": [tipo.value for tipo in TIPOS_ESCALONADOS],
             "periodo_inicial": periodo_inicial,
             "periodo_final": periodo_final,
             "subprefeitura": subprefeitura.value if subprefeitura else None,
         }
     
-    def calcular_ia(
+    def _resultado_ia(
         self,
+        total_procedentes: int,
+        total_no_prazo: int,
         periodo_inicial: datetime,
         periodo_final: datetime,
-        subprefeitura: Optional[Subprefeitura] = None
+        subprefeitura: Optional[Subprefeitura]
     ) -> Dict[str, any]:
-        """
-        Calcula IA (Índice de Atendimento).
-        
-        Fórmula: (solicitações demandantes atendidas no prazo / total demandantes procedentes) × 100
-        
-        Args:
-            periodo_inicial: Data inicial do período
-            periodo_final: Data final do período
-            subprefeitura: Subprefeitura (opcional)
-            
-        Returns:
-            Dict com valor do IA, pontuação e detalhes
-        """
-        # Tipos demandantes
-        tipos_demandantes = [
-            TipoServico.ENTULHO,
-            TipoServico.ANIMAL_MORTO,
-            TipoServico.PAPELEIRAS,
-        ]
-        
-        # Query para demandantes procedentes
-        # IMPORTANTE: Considerar apenas registros com data_execucao para o cálculo de IA
-        query_procedentes = self.db.query(SAC).filter(
-            and_(
-                SAC.data_criacao >= periodo_inicial,
-                SAC.data_criacao <= periodo_final,
-                SAC.tipo_servico.in_(tipos_demandantes),
-                SAC.status.in_([
-                    StatusSAC.EXECUTADO,
-                    StatusSAC.FINALIZADO,
-                    StatusSAC.CONFIRMADA_EXECUCAO,
-                ]),
-                # Apenas SACs com data_execucao podem ser considerados no cálculo de IA
-                SAC.data_execucao.isnot(None),
-            )
-        )
-        
-        if subprefeitura:
-            query_procedentes = query_procedentes.filter(SAC.subprefeitura == subprefeitura)
-        
-        total_procedentes = query_procedentes.count()
-        
-        # Query para atendidos no prazo
-        # Considera apenas os que têm data_execucao e estão dentro do prazo
-        query_no_prazo = query_procedentes.filter(
-            func.extract('epoch', SAC.data_execucao - SAC.data_criacao) / 3600 <= SAC.prazo_max_hours
-        )
-        
-        total_no_prazo = query_no_prazo.count()
+        """Resultado do IA a partir dos demandantes procedentes (com data_execucao) e dos atendidos no prazo."""
         total_fora_prazo = max(total_procedentes - total_no_prazo, 0)
         
         # Calcular IA
@@ -174,55 +621,21 @@ class IndicadoresService:
             "total_procedentes": total_procedentes,
             "total_no_prazo": total_no_prazo,
             "total_fora_prazo": total_fora_prazo,
-            "tipos_considerados": [tipo.value for tipo in tipos_demandantes],
+            "tipos_considerados": [tipo.value for tipo in TIPOS_DEMANDANTES],
             "periodo_inicial": periodo_inicial,
             "periodo_final": periodo_final,
             "subprefeitura": subprefeitura.value if subprefeitura else None,
         }
     
-    def calcular_if(
+    def _resultado_if(
         self,
+        total_fiscalizacoes: int,
+        total_sem_irregularidade: int,
         periodo_inicial: datetime,
         periodo_final: datetime,
-        subprefeitura: Optional[Subprefeitura] = None
+        subprefeitura: Optional[Subprefeitura]
     ) -> Dict[str, any]:
-        """
-        Calcula IF (Índice de Fiscalização).
-        
-        Fórmula: (nº de fiscalizações sem irregularidade / total fiscalizações) × 100
-        
-        Args:
-            periodo_inicial: Data inicial do período
-            periodo_final: Data final do período
-            subprefeitura: Subprefeitura (opcional)
-            
-        Returns:
-            Dict com valor do IF, pontuação e detalhes
-        """
-        # Query base para CNCs no período
-        query = self.db.query(CNC).filter(
-            and_(
-                CNC.data_abertura >= periodo_inicial,
-                CNC.data_abertura <= periodo_final,
-            )
-        )
-        
-        if subprefeitura:
-            # Converter subprefeitura para string para comparar
-            subpref_map = {
-                Subprefeitura.CV: "Casa Verde/Cachoeirinha",
-                Subprefeitura.JT: "Jaçanã/Tremembé",
-                Subprefeitura.ST: "Santana/Tucuruvi",
-                Subprefeitura.MG: "Vila Maria/Vila Guilherme",
-            }
-            query = query.filter(CNC.subprefeitura == subpref_map.get(subprefeitura))
-        
-        total_fiscalizacoes = query.count()
-        
-        # Fiscalizações sem irregularidade (status Regularizado)
-        query_sem_irregularidade = query.filter(CNC.status == StatusCNC.REGULARIZADO)
-        total_sem_irregularidade = query_sem_irregularidade.count()
-        
+        """Resultado do IF a partir do total de fiscalizações e das regularizadas."""
         # Calcular IF
         if total_fiscalizacoes > 0:
             if_valor = Decimal(total_sem_irregularidade) / Decimal(total_fiscalizacoes) * Decimal(100)
@@ -308,10 +721,32 @@ class IndicadoresService:
         Returns:
             Dict com valor do ADC, pontuação total e detalhes
         """
-        # Calcular indicadores
-        ird_result = self.calcular_ird(periodo_inicial, periodo_final, subprefeitura)
-        ia_result = self.calcular_ia(periodo_inicial, periodo_final, subprefeitura)
-        if_result = self.calcular_if(periodo_inicial, periodo_final, subprefeitura)
+        # Calcular indicadores (uma consulta)
+        indicadores = self.calcular_indicadores(periodo_inicial, periodo_final, subprefeitura)
+        return self._resultado_adc(
+            indicadores,
+            periodo_inicial,
+            periodo_final,
+            valor_ipt,
+            valor_mao_obra,
+            valor_equipamentos,
+            subprefeitura,
+        )
+    
+    def _resultado_adc(
+        self,
+        indicadores: Dict[str, Dict[str, any]],
+        periodo_inicial: datetime,
+        periodo_final: datetime,
+        valor_ipt: Optional[Decimal],
+        valor_mao_obra: Optional[Decimal],
+        valor_equipamentos: Optional[Decimal],
+        subprefeitura: Optional[Subprefeitura]
+    ) -> Dict[str, any]:
+        """Resultado do ADC a partir de IRD, IA e IF já calculados e do IPT."""
+        ird_result = indicadores["ird"]
+        ia_result = indicadores["ia"]
+        if_result = indicadores["if"]
         
         # Calcular IPT
         ipt_valor_info = None
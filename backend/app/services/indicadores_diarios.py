@@ -0,0 +1,56 @@
+"""Manutenção de indicadores_diarios (contagens de IRD, IA e IF por dia e subprefeitura)."""
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+
+from sqlalchemy import Date, DateTime, and_, cast, delete, insert, literal, select, true
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement
+
+from app.models.cnc import CNC
+from app.models.indicador_diario import IndicadorDiario
+from app.models.sac import SAC
+from app.services.cache_indicadores import marcar_alteracao
+from app.services.indicadores import CONTAGENS, consulta_contagens
+
+
+def _gravar(db: Session, periodo_sac: ColumnElement, periodo_cnc: ColumnElement) -> int:
+    """Insere as contagens por dia de SACs e CNCs que atendem os filtros."""
+    contagens = consulta_contagens(periodo_sac, periodo_cnc, por_dia=True).subquery()
+    consulta = select(*contagens.c, literal(datetime.utcnow(), DateTime))
+    colunas = ["dia", "subprefeitura", *CONTAGENS, "atualizado_em"]
+    return db.execute(insert(IndicadorDiario).from_select(colunas, consulta)).rowcount
+
+
+def atualizar_dias(db: Session, dias: Iterable[date], entidade: str) -> int:
+    """
+    Recalcula as contagens dos dias informados, na transação do chamador.
+    
+    Cada dia é apagado e contado de novo a partir de SACs e CNCs (um DELETE
+    e um INSERT ... SELECT para todos os dias), então o custo depende dos
+    registros desses dias e não do tamanho das tabelas. No commit, os
+    indicadores em cache da `entidade` alterada (sacs ou cnc) são invalidados.
+    
+    Returns:
+        Linhas (dia, subprefeitura) gravadas
+    """
+    dias = sorted({dia for dia in dias if dia is not None})
+    if not dias:
+        return 0
+    
+    inicio = datetime.combine(dias[0], time.min)
+    fim = datetime.combine(dias[-1] + timedelta(days=1), time.min)
+    
+    def periodo(coluna):
+        # Faixa pelo índice da data e, dentro dela, só os dias pedidos
+        return and_(coluna >= inicio, coluna < fim, cast(coluna, Date).in_(dias))
+    
+    marcar_alteracao(db, entidade)
+    db.execute(delete(IndicadorDiario).where(IndicadorDiario.dia.in_(dias)))
+    return _gravar(db, periodo(SAC.data_criacao), periodo(CNC.data_abertura))
+
+
+def reconstruir(db: Session) -> int:
+    """Recalcula todas as contagens (na transação do chamador)."""
+    marcar_alteracao(db)
+    db.execute(delete(IndicadorDiario))
+    return _gravar(db, true(), true())
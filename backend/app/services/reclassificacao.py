@@ -0,0 +1,188 @@
+"""Reclassificação de tipo_servico/prazo dos SACs pela versão atual das regras."""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.reclassificacao import ReclassificacaoSAC
+from app.models.sac import TipoServico
+from app.services import indicadores_diarios
+from app.utils.classificacao_servico import VERSAO_REGRAS, classificar_servico
+
+logger = logging.getLogger(__name__)
+
+EM_ANDAMENTO = "em_andamento"
+CONCLUIDA = "concluida"
+ERRO = "erro"
+
+# Uma reclassificação por processo
+lock_reclassificacao = threading.Lock()
+
+
+class ReclassificacaoService:
+    """
+    Reaplica as regras de classificação (VERSAO_REGRAS) aos SACs gravados.
+
+    Percorre a tabela em lotes ordenados por id (keyset). Em cada lote, os
+    textos de serviço distintos são classificados uma vez e aplicados com um
+    UPDATE por texto; cada lote é commitado separadamente (locks curtos) e
+    grava o cursor em reclassificacoes_sac, de onde uma execução interrompida
+    é retomada. SACs já classificados na versão atual não são reescritos.
+
+    Os ids são uuid4 aleatórios, então SACs inseridos durante a execução
+    podem cair atrás do cursor e não ser visitados. Isso não deixa SACs
+    desatualizados: SACs só são criados pela importação, que sempre grava
+    `regra_versao = VERSAO_REGRAS` (e reclassifica os que atualiza).
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        tamanho_lote: Optional[int] = None,
+        pausa_segundos: Optional[float] = None,
+    ):
+        self.db = db
+        self.tamanho_lote = tamanho_lote or settings.RECLASSIFICACAO_LOTE
+        self.pausa_segundos = (
+            pausa_segundos if pausa_segundos is not None else settings.RECLASSIFICACAO_PAUSA_SEGUNDOS
+        )
+
+    def iniciar_ou_retomar(self) -> ReclassificacaoSAC:
+        """Retorna a execução em andamento da versão atual ou cria uma nova."""
+        execucao = (
+            self.db.query(ReclassificacaoSAC)
+            .filter(
+                ReclassificacaoSAC.versao_regras == VERSAO_REGRAS,
+                ReclassificacaoSAC.status.in_([EM_ANDAMENTO, ERRO]),
+            )
+            .order_by(ReclassificacaoSAC.iniciado_em.desc())
+            .first()
+        )
+        if execucao:
+            execucao.status = EM_ANDAMENTO
+            execucao.erro = None
+        else:
+            execucao = ReclassificacaoSAC(
+                versao_regras=VERSAO_REGRAS,
+                status=EM_ANDAMENTO,
+                lotes=0,
+                processados=0,
+                atualizados=0,
+            )
+            self.db.add(execucao)
+        self.db.commit()
+        return execucao
+
+    def executar(self, execucao: Optional[ReclassificacaoSAC] = None, max_lotes: Optional[int] = None) -> ReclassificacaoSAC:
+        """
+        Executa (ou retoma) a reclassificação até o fim da tabela.
+
+        Args:
+            execucao: Checkpoint a continuar (padrão: `iniciar_ou_retomar()`)
+            max_lotes: Para depois de N lotes (a execução continua pendente)
+        """
+        execucao = execucao or self.iniciar_ou_retomar()
+        lotes = 0
+        try:
+            while max_lotes is None or lotes < max_lotes:
+                if not self._processar_lote(execucao):
+                    execucao.status = CONCLUIDA
+                    execucao.finalizado_em = datetime.utcnow()
+                    self.db.commit()
+                    break
+                lotes += 1
+                if self.pausa_segundos:
+                    time.sleep(self.pausa_segundos)
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Erro na reclassificação {execucao.id}: {e}")
+            execucao.status = ERRO
+            execucao.erro = str(e)[:500]
+            self.db.commit()
+            raise
+        return execucao
+
+    def _processar_lote(self, execucao: ReclassificacaoSAC) -> bool:
+        """Reclassifica o próximo lote. Retorna False quando não há mais SACs."""
+        if execucao.ultimo_id is None:
+            ids = self.db.execute(
+                text("SELECT id FROM sacs ORDER BY id LIMIT :lote"),
+                {"lote": self.tamanho_lote},
+            ).scalars().all()
+        else:
+            ids = self.db.execute(
+                text("SELECT id FROM sacs WHERE id > :cursor ORDER BY id LIMIT :lote"),
+                {"cursor": execucao.ultimo_id, "lote": self.tamanho_lote},
+            ).scalars().all()
+        if not ids:
+            return False
+
+        faixa = {"primeiro": ids[0], "ultimo": ids[-1], "versao": VERSAO_REGRAS}
+        textos = self.db.execute(
+            text("""
+                SELECT DISTINCT servico_texto FROM sacs
+                WHERE id BETWEEN :primeiro AND :ultimo
+                  AND servico_texto IS NOT NULL
+                  AND regra_versao IS DISTINCT FROM :versao
+            """),
+            faixa,
+        ).scalars().all()
+
+        atualizados = 0
+        dias = set()
+        for texto in textos:
+            tipo, prazo = classificar_servico(texto)
+            # RETURNING: só os dias dos SACs que de fato mudaram vão para o rollup
+            dias_texto = self.db.execute(text("""
+                UPDATE sacs SET
+                    tipo_servico = :tipo,
+                    prazo_max_hours = CASE
+                        WHEN :usa_responsividade THEN COALESCE(NULLIF(responsividade, 0), :prazo)
+                        ELSE :prazo
+                    END,
+                    regra_versao = :versao
+                WHERE id BETWEEN :primeiro AND :ultimo
+                  AND servico_texto = :texto
+                  AND regra_versao IS DISTINCT FROM :versao
+                RETURNING CAST(data_criacao AS date)
+            """), {
+                **faixa,
+                "texto": texto,
+                "tipo": tipo.name,
+                "prazo": prazo,
+                # Cata-Bagulho ignora a responsividade do CSV (mesma regra de prazo_servico)
+                "usa_responsividade": tipo != TipoServico.CATABAGULHO,
+            }).scalars().all()
+            atualizados += len(dias_texto)
+            dias.update(dias_texto)
+
+        if dias:
+            # Tipo e prazo mudam IRD/IA: recalcula os dias dos SACs reclassificados
+            indicadores_diarios.atualizar_dias(self.db, dias, "sacs")
+
+        execucao.ultimo_id = ids[-1]
+        execucao.lotes += 1
+        execucao.processados += len(ids)
+        execucao.atualizados += atualizados
+        self.db.commit()
+        return True
+
+
+def reclassificacao_para_dict(execucao: ReclassificacaoSAC) -> Dict[str, Any]:
+    """Representação serializável de uma execução."""
+    return {
+        "id": str(execucao.id),
+        "versao_regras": execucao.versao_regras,
+        "status": execucao.status,
+        "lotes": execucao.lotes,
+        "processados": execucao.processados,
+        "atualizados": execucao.atualizados,
+        "erro": execucao.erro,
+        "iniciado_em": execucao.iniciado_em.isoformat() if execucao.iniciado_em else None,
+        "finalizado_em": execucao.finalizado_em.isoformat() if execucao.finalizado_em else None,
+    }
@@ -0,0 +1,294 @@
+"""Validação de arquivos do FLIP sem gravar no banco (dry-run da importação)."""
+import logging
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.sac import TipoServico
+from app.services.csv_processor import (
+    LAYOUTS,
+    STATUS_ACIC,
+    STATUS_CNC,
+    STATUS_OUVIDORIA,
+    STATUS_SAC,
+    CSVProcessor,
+    _coluna_texto,
+    _parse_responsividade,
+)
+from app.services.geocoding_cache import GeocodingCacheService
+from app.utils.classificacao_servico import classificar_servico
+from app.utils.colunar import colunas_data
+from app.utils.fingerprint import fingerprint_arquivo
+from app.utils.geocoding import LIMITES_LAT, LIMITES_LNG, parse_coordenadas_serie
+from app.utils.validators import normalizar_subprefeitura, parse_data_brasil_serie
+
+logger = logging.getLogger(__name__)
+
+# Entidade -> (tabela, coluna de identificação no banco)
+TABELAS = {
+    "sacs": ("sacs", "protocolo"),
+    "cnc": ("cnc", "bfs"),
+    "acic": ("acic", "n_acic"),
+    "ouvidoria": ("ouvidorias", "numero_chamado"),
+}
+
+# Coluna de coordenadas de cada entidade (ACIC não tem)
+COLUNAS_COORDENADAS = {
+    "sacs": "Coordenadas",
+    "cnc": "Coordenada",
+    "ouvidoria": "Coordenadas",
+}
+
+# Valores distintos listados por item do relatório (os mais frequentes)
+MAX_VALORES = 20
+
+# Textos que o processador trata como ausentes
+VAZIOS = ("", "nan")
+
+
+def _subprefeitura_padrao(valor: str) -> bool:
+    return normalizar_subprefeitura(valor) is None
+
+
+def _responsividade_invalida(valor: str) -> bool:
+    return valor not in VAZIOS and _parse_responsividade(valor) is None
+
+
+def _valor_multa_invalido(valor: str) -> bool:
+    if valor in VAZIOS:
+        return False
+    try:
+        float(valor.replace(",", "."))
+        return False
+    except ValueError:
+        return True
+
+
+# Valores que caem no padrão (ou são descartados) na importação, por
+# entidade: nome no relatório -> (coluna do CSV, o valor cai no padrão?).
+# Os mesmos mapeamentos usados pelos processadores
+FALLBACKS: Dict[str, Dict[str, Tuple[str, Callable[[str], bool]]]] = {
+    "sacs": {
+        "status_padrao": ("Status", lambda valor: valor not in STATUS_SAC),
+        "servico_outros": ("Serviço", lambda valor: classificar_servico(valor)[0] == TipoServico.OUTROS),
+        "subprefeitura_padrao": ("Regional", _subprefeitura_padrao),
+        "responsividade_invalida": ("Responsividade", _responsividade_invalida),
+    },
+    "cnc": {
+        "status_padrao": ("Situacao_CNC", lambda valor: valor not in STATUS_CNC),
+        "subprefeitura_nao_reconhecida": ("Regional", _subprefeitura_padrao),
+        "responsividade_invalida": ("Responsividade", _responsividade_invalida),
+    },
+    "acic": {
+        "status_nao_reconhecido": ("Status", lambda valor: valor not in STATUS_ACIC),
+        "subprefeitura_nao_reconhecida": ("Regional", _subprefeitura_padrao),
+        "valor_multa_invalido": ("Valor_Multa", _valor_multa_invalido),
+    },
+    "ouvidoria": {
+        "status_nao_reconhecido": ("Status", lambda valor: valor not in STATUS_OUVIDORIA),
+        "subprefeitura_nao_reconhecida": ("Regional", _subprefeitura_padrao),
+    },
+}
+
+
+def _contar_valores(df: pd.DataFrame, coluna: str) -> Counter:
+    """
+    Ocorrências de cada valor distinto da coluna no bloco.
+
+    Os valores são normalizados como no processador (`_coluna_texto`):
+    sem espaços nas pontas e "nan" para ausentes. A contagem é feita pelo
+    pandas; só os valores distintos passam por Python.
+    """
+    if coluna not in df.columns:
+        return Counter({"": len(df)}) if len(df) else Counter()
+    contagem = df[coluna].value_counts(dropna=False, sort=False)
+    resultado: Counter = Counter()
+    for valor, ocorrencias in contagem.items():
+        if ocorrencias:
+            resultado["nan" if pd.isna(valor) else str(valor).strip()] += int(ocorrencias)
+    return resultado
+
+
+def _resumo(valores: Counter) -> Dict[str, Any]:
+    """Total de linhas e os valores mais frequentes."""
+    return {
+        "linhas": sum(valores.values()),
+        "valores": dict(valores.most_common(MAX_VALORES)),
+    }
+
+
+class ValidacaoImportacaoService:
+    """
+    Dry-run da importação: lê e analisa o arquivo sem gravar nada.
+
+    O arquivo é lido como na importação (`CSVProcessor.ler_blocos`) e cada
+    bloco passa uma única vez pelas verificações, todas vetorizadas ou por
+    valor distinto: valores que cairiam em padrões (status, OUTROS,
+    subprefeitura), datas que não convertem e coordenadas vazias, mal
+    formadas ou fora de São Paulo.
+
+    Com uma sessão do banco o relatório também traz o que a importação
+    faria (inseridos, atualizados e ignorados, pelo hash de conteúdo) e os
+    endereços que dependeriam do geocoder. O banco só é consultado.
+    """
+
+    def __init__(self, db: Optional[Session] = None):
+        self.db = db
+        self.processor = CSVProcessor(db)
+
+    def validar(self, entidade: str, file_path: str, chunksize: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Valida um arquivo da entidade (CSV, compactado ou Parquet/Arrow).
+
+        Returns:
+            Dict com o relatório de qualidade dos dados
+        """
+        if entidade not in LAYOUTS:
+            raise ValueError(f"Entidade inválida: {entidade}")
+
+        inicio = time.perf_counter()
+        layout, coluna_chave = LAYOUTS[entidade]
+        fallbacks = FALLBACKS[entidade]
+        coluna_coordenadas = COLUNAS_COORDENADAS.get(entidade)
+        datas = sorted(colunas_data(layout.colunas))
+
+        total = 0
+        sem_chave = 0
+        valores: Dict[str, Counter] = {coluna: Counter() for coluna, _ in fallbacks.values()}
+        datas_invalidas: Dict[str, Counter] = {coluna: Counter() for coluna in datas}
+        coordenadas = Counter()
+        enderecos_sem_coordenadas: Set[str] = set()
+        contagens = {"novos": 0, "alterados": 0, "inalterados": 0}
+        acics_por_bfs: Counter = Counter()
+
+        for df in self.processor.ler_blocos(entidade, file_path, chunksize):
+            total += len(df)
+            chaves = _coluna_texto(df, coluna_chave)
+            sem_chave += int(chaves.isin(VAZIOS).sum())
+
+            for coluna, contagem in valores.items():
+                contagem.update(_contar_valores(df, coluna))
+            for coluna, invalidas in datas_invalidas.items():
+                invalidas.update(self._datas_invalidas(df, coluna))
+
+            if coluna_coordenadas:
+                validas = self._contar_coordenadas(df, coluna_coordenadas, coordenadas)
+                if entidade == "sacs":
+                    enderecos = _coluna_texto(df, "Endereço")[~validas]
+                    enderecos_sem_coordenadas.update(enderecos[enderecos != ""].unique())
+
+            if self.db is not None:
+                tabela, chave = TABELAS[entidade]
+                comparacao = self.processor.comparar_hashes(df, tabela, chave, coluna_chave, contagens)
+                if entidade == "acic":
+                    bfs = _coluna_texto(df, "N_BFS")[~comparacao["existe"]]
+                    acics_por_bfs.update(bfs[~bfs.isin(VAZIOS)])
+
+        relatorio: Dict[str, Any] = {
+            "entidade": entidade,
+            "total": total,
+            "sem_chave": sem_chave,
+            "fallbacks": {},
+            "datas_invalidas": {
+                coluna: _resumo(invalidas) for coluna, invalidas in datas_invalidas.items()
+            },
+        }
+        for nome, (coluna, caiu_no_padrao) in fallbacks.items():
+            relatorio["fallbacks"][nome] = _resumo(
+                Counter({valor: n for valor, n in valores[coluna].items() if caiu_no_padrao(valor)})
+            )
+        if coluna_coordenadas:
+            relatorio["coordenadas"] = {
+                situacao: coordenadas[situacao]
+                for situacao in ("validas", "vazias", "mal_formadas", "fora_dos_limites")
+            }
+        if self.db is not None:
+            relatorio["importacao"] = self._simular_gravacao(entidade, file_path, contagens)
+            if entidade == "sacs":
+                relatorio["geocoding"] = self._simular_geocoding(enderecos_sem_coordenadas)
+            if entidade == "acic":
+                bfs_sem_cnc = self.processor.bfs_sem_cnc(acics_por_bfs)
+                relatorio["importacao"]["sem_cnc"] = sum(acics_por_bfs[bfs] for bfs in bfs_sem_cnc)
+        elif entidade == "sacs":
+            relatorio["geocoding"] = {"enderecos_sem_coordenadas": len(enderecos_sem_coordenadas)}
+
+        duracao = time.perf_counter() - inicio
+        relatorio["duracao_segundos"] = round(duracao, 3)
+        relatorio["linhas_por_segundo"] = round(total / duracao, 1) if duracao > 0 else None
+        return relatorio
+
+    def _datas_invalidas(self, df: pd.DataFrame, coluna: str) -> Counter:
+        """Valores preenchidos da coluna de data que não convertem (um parse por valor distinto)."""
+        if coluna not in df.columns or pd.api.types.is_datetime64_any_dtype(df[coluna]):
+            # Ausente (a importação grava nulo) ou já tipada no Parquet/Arrow
+            return Counter()
+        contagem = _contar_valores(df, coluna)
+        textos = [valor for valor in contagem if valor not in VAZIOS]
+        convertidas = parse_data_brasil_serie(pd.Series(textos, dtype=object))
+        return Counter({
+            valor: contagem[valor]
+            for valor, invalida in zip(textos, convertidas.isna())
+            if invalida
+        })
+
+    def _contar_coordenadas(self, df: pd.DataFrame, coluna: str, coordenadas: Counter) -> pd.Series:
+        """
+        Classifica as coordenadas do bloco (válidas, vazias, mal formadas ou
+        fora dos limites de São Paulo) e acumula em `coordenadas`.
+
+        Returns:
+            Máscara das linhas com coordenada válida
+        """
+        texto = _coluna_texto(df, coluna)
+        vazias = texto.isin(VAZIOS)
+        lat, lng = parse_coordenadas_serie(texto, limites=False)
+        bem_formadas = lat.notna()
+        validas = bem_formadas & lat.between(*LIMITES_LAT) & lng.between(*LIMITES_LNG)
+
+        coordenadas["validas"] += int(validas.sum())
+        coordenadas["vazias"] += int(vazias.sum())
+        coordenadas["mal_formadas"] += int((~vazias & ~bem_formadas).sum())
+        coordenadas["fora_dos_limites"] += int((bem_formadas & ~validas).sum())
+        return validas
+
+    def _simular_gravacao(self, entidade: str, file_path: str, contagens: Dict[str, int]) -> Dict[str, Any]:
+        """
+        O que a importação faria com as linhas, pela comparação de hashes.
+
+        SACs existentes são atualizados (com IMPORT_INCREMENTAL, só os
+        alterados); nas demais entidades os existentes são ignorados.
+        """
+        ultima = self.processor.ultima_importacao(entidade)
+        repetido = bool(
+            settings.IMPORT_INCREMENTAL and ultima and ultima.fingerprint == fingerprint_arquivo(file_path)
+        )
+        existentes = contagens["alterados"] + contagens["inalterados"]
+        if repetido:
+            inseridos, atualizados = 0, 0
+        elif entidade == "sacs":
+            inseridos = contagens["novos"]
+            atualizados = contagens["alterados"] if settings.IMPORT_INCREMENTAL else existentes
+        else:
+            inseridos, atualizados = contagens["novos"], 0
+        return {
+            "arquivo_repetido": repetido,
+            **contagens,
+            "inseridos": inseridos,
+            "atualizados": atualizados,
+            "ignorados": contagens["novos"] + existentes - inseridos - atualizados,
+        }
+
+    def _simular_geocoding(self, enderecos: Set[str]) -> Dict[str, Any]:
+        """Endereços sem coordenada válida e quantos precisariam do geocoder (cache só consultado)."""
+        resolvidos = GeocodingCacheService(self.db).consultar_cache(enderecos) if enderecos else {}
+        return {
+            "enderecos_sem_coordenadas": len(enderecos),
+            "no_cache": len(resolvidos),
+            "chamadas_geocoder": len(enderecos) - len(resolvidos),
+            # Com GEOCODING_DIFERIDO as chamadas ficam para o worker de backfill
+            "diferido": settings.GEOCODING_DIFERIDO,
+        }
@@ -0,0 +1,141 @@
+"""
+Classificação do texto de serviço do FLIP em TipoServico + prazo.
+
+As regras ficam em uma única tabela declarativa (REGRAS_SERVICO), avaliada
+em ordem: a primeira regra que casar define o tipo. O prazo padrão vem de
+settings.PRAZOS_SERVICO. Qualquer mudança nas regras deve incrementar
+VERSAO_REGRAS (a versão fica registrada nos SACs classificados).
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.models.sac import TipoServico
+
+# Incrementar sempre que REGRAS_SERVICO ou os prazos mudarem
+VERSAO_REGRAS = 1
+
+
+class RegraServico(NamedTuple):
+    """
+    Regra de classificação.
+
+    `todos`: grupos de termos; cada grupo precisa ter ao menos um termo no texto.
+    `nenhum`: termos que, se presentes, impedem a regra.
+    """
+    tipo: TipoServico
+    todos: Tuple[Tuple[str, ...], ...]
+    nenhum: Tuple[str, ...] = ()
+
+
+# IMPORTANTE: a ordem importa. Escalonados específicos vêm ANTES dos
+# Demandantes genéricos, para que "Coleta programada e transporte de objetos
+# volumosos e de entulho (Cata-Bagulho)" não seja classificado como ENTULHO.
+REGRAS_SERVICO: Tuple[RegraServico, ...] = (
+    # Escalonado: "Coleta programada e transporte de objetos volumosos e de entulho (Cata-Bagulho)"
+    RegraServico(TipoServico.CATABAGULHO, (("cata-bagulho", "cata bagulho", "coleta programada"),)),
+
+    # Demandantes
+    # "Coleta e transporte de entulho e grandes objetos depositados irregularmente..." (NÃO programada)
+    RegraServico(TipoServico.ENTULHO, (("entulho", "grandes objetos"),), nenhum=("programada",)),
+    RegraServico(TipoServico.ANIMAL_MORTO, (("animal", "animais"), ("morto", "mortos"))),
+    RegraServico(TipoServico.PAPELEIRAS, (("papeleira", "lixeira", "equipamentos de recepção"),)),
+
+    # Escalonados
+    RegraServico(
+        TipoServico.VARRIACAO_COLETA,
+        (("coleta manual", "coleta de varrição"), ("feira", "compactador")),
+    ),
+    RegraServico(TipoServico.VARRIACAO_PRACAS, (("varrição de praça",),)),
+    RegraServico(TipoServico.VARRIACAO, (("varrição",),)),
+    RegraServico(
+        TipoServico.MUTIRAO,
+        (("mutirão", "mutirao", "capinação", "propaganda", "raspagem", "pintura de guia", "zeladoria"),),
+    ),
+    RegraServico(TipoServico.LAVAGEM, (("lavagem",), ("equipamento", "público"))),
+    RegraServico(
+        TipoServico.BUEIRO,
+        (("bueiro", "boca de lobo", "boca de leão", "desobstrução"),),
+    ),
+    RegraServico(TipoServico.MONUMENTOS, (("monumento",),)),
+)
+
+# Demandantes têm prazo próprio em PRAZOS_SERVICO; os demais usam "escalonado"
+TIPOS_DEMANDANTES = (TipoServico.ENTULHO, TipoServico.ANIMAL_MORTO, TipoServico.PAPELEIRAS)
+
+
+class _Classificador:
+    """Tabela de regras compilada em um único regex."""
+
+    def __init__(self, regras: Tuple[RegraServico, ...]):
+        self.regras = regras
+        termos = sorted(
+            {termo for regra in regras for grupo in regra.todos for termo in grupo}
+            | {termo for regra in regras for termo in regra.nenhum},
+            key=len,
+            reverse=True,
+        )
+        # Lookahead: encontra o termo mais longo que começa em cada posição,
+        # inclusive sobrepostos ("varrição de praça" e "varrição")
+        self._padrao = re.compile("(?=(" + "|".join(re.escape(termo) for termo in termos) + "))")
+        # Termo encontrado -> todos os termos contidos nele
+        self._contidos = {
+            termo: frozenset(outro for outro in termos if outro in termo)
+            for termo in termos
+        }
+
+    def termos_presentes(self, texto: str) -> FrozenSet[str]:
+        presentes = set()
+        for termo in self._padrao.findall(texto.lower()):
+            presentes |= self._contidos[termo]
+        return frozenset(presentes)
+
+    def tipo(self, texto: str) -> TipoServico:
+        presentes = self.termos_presentes(texto)
+        for regra in self.regras:
+            if all(presentes.intersection(grupo) for grupo in regra.todos) and \
+               not presentes.intersection(regra.nenhum):
+                return regra.tipo
+        return TipoServico.OUTROS
+
+
+_classificador = _Classificador(REGRAS_SERVICO)
+
+
+def prazo_padrao(tipo: TipoServico) -> int:
+    """Prazo padrão (horas) de um tipo de serviço, conforme settings.PRAZOS_SERVICO."""
+    if tipo in TIPOS_DEMANDANTES:
+        return settings.PRAZOS_SERVICO[tipo.value]
+    return settings.PRAZOS_SERVICO["escalonado"]
+
+
+@lru_cache(maxsize=4096)
+def classificar_servico(texto: str) -> Tuple[TipoServico, int]:
+    """
+    Classifica o texto da coluna Serviço.
+
+    Memoizado por texto: o FLIP tem poucas dezenas de serviços distintos,
+    então classificar milhões de linhas custa o mesmo que os valores distintos.
+
+    Returns:
+        Tupla (TipoServico, prazo padrão em horas)
+    """
+    tipo = _classificador.tipo(texto or "")
+    return tipo, prazo_padrao(tipo)
+
+
+def prazo_servico(texto: str, responsividade: Optional[int] = None) -> int:
+    """
+    Prazo máximo (horas) de um SAC.
+
+    A responsividade do CSV, quando presente, prevalece sobre o prazo padrão,
+    exceto para Cata-Bagulho (sempre 30 dias).
+    """
+    tipo, prazo = classificar_servico(texto or "")
+    # Cata-Bagulho: a responsividade do CSV é só o prazo de vistoria
+    if tipo == TipoServico.CATABAGULHO:
+        return prazo
+    if responsividade:
+        return responsividade
+    return prazo
@@ -0,0 +1,175 @@
+"""
+Arquivos colunares (Parquet e Arrow IPC) dos datasets do FLIP.
+
+O schema é fixo por entidade: as colunas do layout do processador, com as
+datas já convertidas (timestamp), as colunas de baixa cardinalidade como
+dicionário e as demais como texto. O hash de conteúdo de cada linha do CSV
+de origem vai junto (COLUNA_HASH), para que a importação incremental
+reconheça as mesmas linhas vindas do CSV ou do Parquet.
+
+Requer o pacote opcional pyarrow.
+"""
+import itertools
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as paipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Versão do schema gravada nos metadados (incrementar se o schema mudar)
+VERSAO_SCHEMA = "1"
+
+# Metadados do schema
+META_ENTIDADE = b"flip_entidade"
+META_VERSAO = b"flip_schema_versao"
+
+# Hash de conteúdo da linha no CSV de origem (ver app.utils.fingerprint.hash_linhas)
+COLUNA_HASH = "_hash_origem"
+
+# Extensões aceitas nos uploads e na linha de comando
+EXTENSOES_COLUNARES = (".parquet", ".arrow", ".feather")
+
+# Assinaturas (magic bytes)
+ASSINATURA_PARQUET = b"PAR1"
+ASSINATURA_ARROW = b"ARROW1"
+ASSINATURA_ARROW_STREAM = b"\xff\xff\xff\xff"
+
+
+def exigir_pyarrow() -> None:
+    """Erro amigável quando o pyarrow não está instalado."""
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("Arquivos Parquet/Arrow requerem o pacote pyarrow (pip install pyarrow)")
+
+
+def extensao_colunar(nome_arquivo: str) -> Optional[str]:
+    """Extensão colunar aceita do arquivo, ou None."""
+    nome = (nome_arquivo or "").lower()
+    for extensao in EXTENSOES_COLUNARES:
+        if nome.endswith(extensao):
+            return extensao
+    return None
+
+
+def formato_colunar(file_path: str) -> Optional[str]:
+    """"parquet", "arrow" (IPC arquivo), "arrow_stream" (IPC stream) ou None."""
+    with open(file_path, "rb") as arquivo:
+        inicio = arquivo.read(6)
+    if inicio.startswith(ASSINATURA_PARQUET):
+        return "parquet"
+    if inicio == ASSINATURA_ARROW:
+        return "arrow"
+    if inicio.startswith(ASSINATURA_ARROW_STREAM):
+        return "arrow_stream"
+    return None
+
+
+def colunas_data(colunas: Iterable[str]) -> FrozenSet[str]:
+    """Colunas de data de um layout (Data_*)."""
+    return frozenset(coluna for coluna in colunas if coluna.startswith("Data_"))
+
+
+def schema_entidade(entidade: str, colunas: Iterable[str], categoricas: Iterable[str]) -> "pa.Schema":
+    """Schema fixo de uma entidade (colunas em ordem de nome + hash de origem)."""
+    exigir_pyarrow()
+    datas = colunas_data(colunas)
+    categoricas = frozenset(categoricas)
+    campos = []
+    for coluna in sorted(colunas):
+        if coluna in datas:
+            tipo = pa.timestamp("us")
+        elif coluna in categoricas:
+            tipo = pa.dictionary(pa.int32(), pa.string())
+        else:
+            tipo = pa.string()
+        campos.append(pa.field(coluna, tipo))
+    campos.append(pa.field(COLUNA_HASH, pa.string()))
+    return pa.schema(campos, metadata={META_ENTIDADE: entidade.encode(), META_VERSAO: VERSAO_SCHEMA.encode()})
+
+
+def validar_schema(schema: "pa.Schema", esperado: "pa.Schema") -> None:
+    """
+    Confere se o arquivo segue o schema fixo da entidade.
+
+    Raises:
+        ValueError: Entidade, versão ou colunas diferentes do esperado
+    """
+    metadados = schema.metadata or {}
+    entidade = esperado.metadata[META_ENTIDADE].decode()
+    if metadados.get(META_ENTIDADE) != esperado.metadata[META_ENTIDADE]:
+        encontrada = (metadados.get(META_ENTIDADE) or b"?").decode()
+        raise ValueError(f"Arquivo colunar de {encontrada}, esperado {entidade}")
+    if metadados.get(META_VERSAO) != esperado.metadata[META_VERSAO]:
+        raise ValueError(
+            f"Versão de schema {(metadados.get(META_VERSAO) or b'?').decode()} não suportada "
+            f"(esperada {VERSAO_SCHEMA}); converta o CSV novamente"
+        )
+    faltando = [campo.name for campo in esperado if campo.name not in schema.names]
+    divergentes = [
+        campo.name for campo in esperado
+        if campo.name in schema.names and not schema.field(campo.name).type.equals(campo.type)
+    ]
+    if faltando or divergentes:
+        raise ValueError(
+            f"Schema de {entidade} inválido (faltando: {faltando or '-'}; tipos divergentes: {divergentes or '-'})"
+        )
+
+
+def agrupar_lotes(lotes: Iterable[Any], chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Agrupa RecordBatches do pyarrow em DataFrames de `chunksize` linhas.
+
+    O índice continua de um bloco para o outro, como na leitura em blocos
+    do pandas.
+    """
+    inicio = 0
+    pendentes: List[Any] = []
+    linhas = 0
+    for lote in itertools.chain(lotes, [None]):
+        if lote is not None:
+            pendentes.append(lote)
+            linhas += lote.num_rows
+        if pendentes and (linhas >= chunksize or lote is None):
+            bloco = pa.Table.from_batches(pendentes).to_pandas()
+            bloco.index = pd.RangeIndex(inicio, inicio + len(bloco))
+            bloco.columns = bloco.columns.str.strip()
+            inicio += len(bloco)
+            pendentes, linhas = [], 0
+            yield bloco
+
+
+def ler_colunar_em_blocos(file_path: str, chunksize: int, esperado: "pa.Schema") -> Iterator[pd.DataFrame]:
+    """Lê um Parquet ou Arrow IPC em blocos, validando o schema da entidade."""
+    exigir_pyarrow()
+    colunas = esperado.names
+    formato = formato_colunar(file_path)
+    if formato == "parquet":
+        arquivo = pq.ParquetFile(file_path)
+        validar_schema(arquivo.schema_arrow, esperado)
+        yield from agrupar_lotes(arquivo.iter_batches(batch_size=chunksize, columns=colunas), chunksize)
+        return
+
+    with pa.memory_map(file_path) as fonte:
+        leitor = paipc.open_file(fonte) if formato == "arrow" else paipc.open_stream(fonte)
+        validar_schema(leitor.schema, esperado)
+        if formato == "arrow":
+            lotes = (leitor.get_batch(i) for i in range(leitor.num_record_batches))
+        else:
+            lotes = iter(leitor)
+        yield from agrupar_lotes((lote.select(colunas) for lote in lotes), chunksize)
+
+
+def tabela_de_bloco(bloco: pd.DataFrame, schema: "pa.Schema") -> "pa.Table":
+    """Converte um bloco (colunas do layout + COLUNA_HASH) para o schema fixo."""
+    dados: Dict[str, Any] = {}
+    for campo in schema:
+        serie = bloco[campo.name]
+        if pa.types.is_dictionary(campo.type):
+            serie = serie.astype(object).where(serie.notna(), None)
+        dados[campo.name] = pa.array(serie, type=campo.type, from_pandas=True)
+    return pa.Table.from_pydict(dados, schema=schema)
@@ -0,0 +1,90 @@
+"""Leitura de CSVs compactados (.csv.gz e .zip) sem descompactar em disco."""
+import gzip
+import zipfile
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, List, Optional, Union
+
+# Extensões aceitas nos uploads e na linha de comando
+EXTENSOES_CSV = (".csv.gz", ".csv", ".zip")
+
+# Assinaturas (magic bytes): o formato é detectado pelo conteúdo, não pelo nome
+ASSINATURA_GZIP = b"\x1f\x8b"
+ASSINATURA_ZIP = b"PK\x03\x04"
+
+
+def extensao_csv(nome_arquivo: str) -> Optional[str]:
+    """Extensão aceita do arquivo (ex: ".csv.gz"), ou None se não for aceita."""
+    nome = (nome_arquivo or "").lower()
+    for extensao in EXTENSOES_CSV:
+        if nome.endswith(extensao):
+            return extensao
+    return None
+
+
+def tipo_compressao(file_path: str) -> Optional[str]:
+    """"gzip", "zip" ou None (arquivo sem compressão)."""
+    with open(file_path, "rb") as arquivo:
+        inicio = arquivo.read(4)
+    if inicio.startswith(ASSINATURA_GZIP):
+        return "gzip"
+    if inicio == ASSINATURA_ZIP:
+        return "zip"
+    return None
+
+
+def membros_csv(zip_file: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Membros .csv de um zip (ignora diretórios e outros arquivos)."""
+    return [
+        membro for membro in zip_file.infolist()
+        if not membro.is_dir() and membro.filename.lower().endswith(".csv")
+    ]
+
+
+def _membro_unico(zip_file: zipfile.ZipFile) -> zipfile.ZipInfo:
+    membros = membros_csv(zip_file)
+    if len(membros) != 1:
+        raise ValueError(f"O zip deve conter exatamente um CSV (encontrados: {len(membros)})")
+    return membros[0]
+
+
+def nome_csv(file_path: str) -> Optional[str]:
+    """Nome do CSV dentro de um zip de um único CSV (None se o arquivo não for zip)."""
+    if tipo_compressao(file_path) != "zip":
+        return None
+    with zipfile.ZipFile(file_path) as zip_file:
+        return _membro_unico(zip_file).filename
+
+
+@contextmanager
+def abrir_descompactado(file_path: str) -> Iterator[BinaryIO]:
+    """
+    Stream binário com o conteúdo do CSV, descompactado sob demanda.
+
+    Aceita CSV puro, gzip ou zip com um único CSV; o arquivo descompactado
+    nunca é gravado em disco.
+    """
+    compressao = tipo_compressao(file_path)
+    if compressao == "gzip":
+        with gzip.open(file_path, "rb") as arquivo:
+            yield arquivo
+    elif compressao == "zip":
+        with zipfile.ZipFile(file_path) as zip_file, zip_file.open(_membro_unico(zip_file)) as arquivo:
+            yield arquivo
+    else:
+        with open(file_path, "rb") as arquivo:
+            yield arquivo
+
+
+@contextmanager
+def abrir_csv(file_path: str) -> Iterator[Union[str, BinaryIO]]:
+    """
+    Fonte para os leitores de CSV (pandas, pyarrow).
+
+    CSVs sem compressão são lidos pelo caminho (o leitor abre o arquivo);
+    os compactados, pelo stream de `abrir_descompactado`.
+    """
+    if tipo_compressao(file_path) is None:
+        yield file_path
+        return
+    with abrir_descompactado(file_path) as arquivo:
+        yield arquivo
@@ -0,0 +1,37 @@
+"""Fingerprint de arquivos e hash de conteúdo das linhas importadas."""
+import hashlib
+from typing import Iterable
+
+import pandas as pd
+
+from app.utils.compressao import abrir_descompactado
+
+# Bytes lidos por vez no cálculo do fingerprint
+BLOCO_FINGERPRINT = 1024 * 1024
+
+
+def fingerprint_arquivo(file_path: str) -> str:
+    """
+    SHA-256 (hex) do conteúdo do CSV, lido em blocos.
+    
+    Arquivos compactados (.csv.gz, .zip) são descompactados em streaming: o
+    mesmo CSV tem o mesmo fingerprint com ou sem compressão.
+    """
+    sha = hashlib.sha256()
+    with abrir_descompactado(file_path) as arquivo:
+        for bloco in iter(lambda: arquivo.read(BLOCO_FINGERPRINT), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def hash_linhas(df: pd.DataFrame, colunas: Iterable[str] = None) -> pd.Series:
+    """
+    Hash de 64 bits (16 caracteres hex) do conteúdo de cada linha.
+    
+    As colunas entram em ordem de nome, então o hash não muda se o FLIP
+    reordenar as colunas do export; valores ausentes equivalem a "".
+    Colunas categóricas têm o mesmo hash que as de texto.
+    """
+    colunas = sorted(colunas if colunas is not None else df.columns)
+    valores = df[colunas].astype(object).fillna("")
+    return pd.util.hash_pandas_object(valores, index=False).map("{:016x}".format)
@@ -1,32 +1,54 @@
 """Utilitários para geocoding."""
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+import pandas as pd
+import re
 import time
+import unicodedata
+import zlib
 import logging
 
+from app.config import settings
+
 logger = logging.getLogger(__name__)
 
+# Limites aproximados de São Paulo para coordenadas válidas
+LIMITES_LAT = (-24.0, -23.0)
+LIMITES_LNG = (-47.0, -46.0)
 
-def geocode_endereco(endereco: str, max_retries: int = 3) -> Optional[Tuple[float, float]]:
+
+class GeocodingIndisponivelError(Exception):
+    """O serviço de geocoding falhou (timeout/erro), sem resposta definitiva."""
+
+
+@lru_cache(maxsize=1)
+def _geolocator() -> Nominatim:
+    """Cliente Nominatim compartilhado (criado uma vez por processo)."""
+    return Nominatim(user_agent="adc_flip_app")
+
+
+def geocode_remoto(endereco: str, max_retries: int = 3) -> Optional[Tuple[float, float]]:
     """
-    Faz geocoding de um endereço usando Nominatim (gratuito).
+    Geocoding de um endereço no Nominatim, distinguindo falha de "não encontrado".
     
     Args:
         endereco: Endereço completo
         max_retries: Número máximo de tentativas
         
     Returns:
-        Tupla (lat, lng) ou None se não conseguir geocodificar
+        Tupla (lat, lng) ou None se o endereço não foi encontrado
+        
+    Raises:
+        GeocodingIndisponivelError: se o serviço falhar em todas as tentativas
     """
     if not endereco or not endereco.strip():
         return None
     
-    geolocator = Nominatim(user_agent="adc_flip_app")
-    
     for attempt in range(max_retries):
         try:
-            location = geolocator.geocode(endereco, timeout=10)
+            location = _geolocator().geocode(endereco, timeout=10)
             if location:
                 return (location.latitude, location.longitude)
             return None
@@ -34,14 +56,147 @@ def geocode_endereco(endereco: str, max_retries: int = 3) -> Optional[Tuple[floa
             logger.warning(f"Erro no geocoding (tentativa {attempt + 1}): {e}")
             if attempt < max_retries - 1:
                 time.sleep(2 ** attempt)  # Backoff exponencial
-            else:
-                logger.error(f"Falha no geocoding após {max_retries} tentativas")
-                return None
         except Exception as e:
             logger.error(f"Erro inesperado no geocoding: {e}")
-            return None
+            raise GeocodingIndisponivelError(str(e)) from e
+    
+    logger.error(f"Falha no geocoding após {max_retries} tentativas")
+    raise GeocodingIndisponivelError(f"Falha no geocoding após {max_retries} tentativas")
+
+
+def geocode_endereco(endereco: str, max_retries: int = 3) -> Optional[Tuple[float, float]]:
+    """
+    Faz geocoding de um endereço usando Nominatim (gratuito).
+    
+    Args:
+        endereco: Endereço completo
+        max_retries: Número máximo de tentativas
+        
+    Returns:
+        Tupla (lat, lng) ou None se não conseguir geocodificar
+    """
+    try:
+        return geocode_remoto(endereco, max_retries)
+    except GeocodingIndisponivelError:
+        return None
+
+
+def geocode_falso(endereco: str) -> Optional[Tuple[float, float]]:
+    """
+    Geocoder determinístico e offline (GEOCODING_PROVIDER="falso").
+    
+    Para desenvolvimento e testes do fluxo de geocoding sem rede: o mesmo
+    endereço sempre gera a mesma coordenada dentro da Zona Norte. Endereços
+    contendo "NAO ENCONTRADO" retornam None e contendo "FALHA GEOCODING"
+    simulam indisponibilidade do serviço.
+    """
+    chave = normalizar_endereco(endereco)
+    if not chave or "NAO ENCONTRADO" in chave:
+        return None
+    if "FALHA GEOCODING" in chave:
+        raise GeocodingIndisponivelError("Falha simulada")
+    
+    h = zlib.crc32(chave.encode("utf-8"))
+    lat = -23.50 + (h % 10000) / 10000 * 0.10  # -23.50 .. -23.40
+    lng = -46.70 + (h // 10000 % 10000) / 10000 * 0.15  # -46.70 .. -46.55
+    return (round(lat, 7), round(lng, 7))
+
+
+def obter_geocoder() -> Callable[[str], Optional[Tuple[float, float]]]:
+    """
+    Geocoder remoto configurado em settings.GEOCODING_PROVIDER.
     
-    return None
+    O callable retornado segue o contrato de `geocode_remoto`: None quando
+    o endereço não existe e GeocodingIndisponivelError quando o serviço falha.
+    Com o provider "local" retorna o provider remoto de fallback.
+    """
+    provider = settings.GEOCODING_PROVIDER
+    if provider == "local":
+        # O gazetteer local é consultado antes, junto com o cache (precisa do banco)
+        provider = settings.GEOCODING_PROVIDER_REMOTO
+    if provider == "nominatim":
+        return geocode_remoto
+    if provider == "falso":
+        return geocode_falso
+    raise ValueError(f"GEOCODING_PROVIDER não suportado: {provider}")
+
+
+def normalizar_endereco(endereco: str) -> str:
+    """
+    Normaliza um endereço para uso como chave de cache.
+    
+    Remove acentos e pontuação, converte para maiúsculas e colapsa espaços
+    ("R. Maria  Cândida, 10" -> "R MARIA CANDIDA 10").
+    """
+    if not endereco:
+        return ""
+    sem_acentos = unicodedata.normalize("NFKD", endereco).encode("ascii", "ignore").decode("ascii")
+    return " ".join(re.sub(r"[^0-9A-Za-z]+", " ", sem_acentos).upper().split())
+
+
+# Abreviações comuns nos endereços do FLIP (CNCs usam "R.", "Av.", "Cel." etc.)
+ABREVIACOES_LOGRADOURO = {
+    "R": "RUA",
+    "AV": "AVENIDA",
+    "AL": "ALAMEDA",
+    "TV": "TRAVESSA",
+    "TRAV": "TRAVESSA",
+    "PCA": "PRACA",
+    "PC": "PRACA",
+    "EST": "ESTRADA",
+    "ESTR": "ESTRADA",
+    "VL": "VILA",
+    "CEL": "CORONEL",
+    "DR": "DOUTOR",
+    "ENG": "ENGENHEIRO",
+    "GAL": "GENERAL",
+    "GEN": "GENERAL",
+    "PE": "PADRE",
+    "PROF": "PROFESSOR",
+    "SGT": "SARGENTO",
+    "SRG": "SARGENTO",
+    "STA": "SANTA",
+    "STO": "SANTO",
+    "TEN": "TENENTE",
+    "CAP": "CAPITAO",
+    "MAL": "MARECHAL",
+    "BRIG": "BRIGADEIRO",
+}
+
+_RE_CEP = re.compile(r"\b(\d{5})-?(\d{3})\b")
+_RE_NUMERO = re.compile(r"^\s*(\d+)")
+
+
+def decompor_endereco(endereco: str) -> Tuple[str, Optional[int], Optional[str]]:
+    """
+    Extrai logradouro normalizado, número e CEP de um endereço do FLIP.
+    
+    Entende os dois formatos usados nos CSVs:
+    "Rua Paulino de Brito, 842, Jardim Brasil, 02223-010, São Paulo, SP, Brasil" (SAC)
+    "R. Gaurama, 531 - Água Fria, São Paulo - SP, 02339-020, Brasil" (CNC)
+    
+    Returns:
+        Tupla (logradouro, numero, cep); logradouro "" se não identificado
+    """
+    if not endereco:
+        return "", None, None
+    
+    partes = endereco.split(",", 1)
+    palavras = normalizar_endereco(partes[0]).split()
+    logradouro = " ".join(ABREVIACOES_LOGRADOURO.get(palavra, palavra) for palavra in palavras)
+    
+    numero = None
+    if len(partes) > 1:
+        encontrado = _RE_NUMERO.match(partes[1])
+        if encontrado:
+            numero = int(encontrado.group(1))
+    
+    cep = None
+    encontrado = _RE_CEP.search(endereco)
+    if encontrado:
+        cep = encontrado.group(1) + encontrado.group(2)
+    
+    return logradouro, numero, cep
 
 
 def parse_coordenadas(coordenada_str: str) -> Optional[Tuple[float, float]]:
@@ -66,10 +221,39 @@ def parse_coordenadas(coordenada_str: str) -> Optional[Tuple[float, float]]:
         lng = float(parts[1].strip())
         
         # Validação básica (São Paulo está aproximadamente entre essas coordenadas)
-        if -24.0 <= lat <= -23.0 and -47.0 <= lng <= -46.0:
+        if LIMITES_LAT[0] <= lat <= LIMITES_LAT[1] and LIMITES_LNG[0] <= lng <= LIMITES_LNG[1]:
             return (lat, lng)
         
         return None
     except (ValueError, AttributeError):
         return None
 
+
+
+def parse_coordenadas_serie(serie: pd.Series, limites: bool = True) -> Tuple[pd.Series, pd.Series]:
+    """
+    Parse vetorizado de uma coluna de coordenadas no formato "lat,lng".
+    
+    Aplica as mesmas regras de `parse_coordenadas` (duas partes e limites
+    aproximados de São Paulo) à coluna inteira.
+    
+    Args:
+        serie: Coluna com strings "lat,lng" (pode conter NaN)
+        limites: Se False, coordenadas bem formadas fora de São Paulo
+            também são retornadas (validação de arquivos)
+        
+    Returns:
+        Tupla (lat, lng) de séries float com NaN onde a coordenada é inválida
+    """
+    texto = serie.astype(object).where(serie.notna(), "").astype(str).str.strip()
+    partes = texto.str.split(",", expand=True).reindex(columns=[0, 1]).fillna("")
+    
+    lat = pd.to_numeric(partes[0].str.strip(), errors="coerce")
+    lng = pd.to_numeric(partes[1].str.strip(), errors="coerce")
+    
+    # Validação básica (São Paulo está aproximadamente entre essas coordenadas)
+    valido = (texto.str.count(",") == 1) & lat.notna() & lng.notna()
+    if limites:
+        valido &= lat.between(*LIMITES_LAT) & lng.between(*LIMITES_LNG)
+    
+    return lat.where(valido), lng.where(valido)
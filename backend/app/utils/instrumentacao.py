@@ -0,0 +1,147 @@
+"""Medição de tempo, linhas e idas ao banco por etapa da importação."""
+import contextvars
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+T = TypeVar("T")
+
+# Medidor da importação em andamento no contexto atual (cada thread de
+# importação tem o seu; fora de uma importação fica None)
+_medidor_atual: contextvars.ContextVar = contextvars.ContextVar("medidor_importacao", default=None)
+
+
+class MedidorEtapas:
+    """
+    Acumula, por etapa, o tempo gasto, as linhas tratadas e as execuções.
+
+    Enquanto ativo (`ativo()`), também conta as idas ao banco feitas no
+    contexto: comandos SQL, COPY e commits.
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.segundos_anteriores = 0.0
+        self.etapas: Dict[str, Dict[str, Any]] = {}
+        self.contadores: Counter = Counter()
+        self.consultas_banco = 0
+
+    def registrar(self, nome: str, segundos: float, linhas: int = 0, execucoes: int = 1) -> None:
+        etapa = self.etapas.setdefault(nome, {"segundos": 0.0, "linhas": 0, "execucoes": 0})
+        etapa["segundos"] += segundos
+        etapa["linhas"] += linhas
+        etapa["execucoes"] += execucoes
+
+    @contextmanager
+    def etapa(self, nome: str, linhas: int = 0) -> Iterator[None]:
+        """Mede o bloco de código como uma execução da etapa `nome`."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, time.perf_counter() - inicio, linhas)
+
+    def iterar(self, nome: str, blocos: Iterable[T], linhas: Callable[[T], int] = len) -> Iterator[T]:
+        """
+        Repassa os blocos medindo o tempo para obter cada um (leitura e parse do arquivo).
+
+        `linhas` conta as linhas de um bloco (padrão: len).
+        """
+        iterador = iter(blocos)
+        while True:
+            inicio = time.perf_counter()
+            try:
+                bloco = next(iterador)
+            except StopIteration:
+                self.registrar(nome, time.perf_counter() - inicio, execucoes=0)
+                return
+            self.registrar(nome, time.perf_counter() - inicio, linhas(bloco))
+            yield bloco
+
+    def contar(self, nome: str, quantidade: int = 1) -> None:
+        """Contador livre (ex: chamadas ao geocoder, execuções fora do prazo)."""
+        self.contadores[nome] += quantidade
+
+    @contextmanager
+    def ativo(self) -> Iterator["MedidorEtapas"]:
+        """Torna o medidor o da importação atual (contagem de idas ao banco)."""
+        token = _medidor_atual.set(self)
+        try:
+            yield self
+        finally:
+            _medidor_atual.reset(token)
+
+    def carregar(self, metricas: Optional[Dict[str, Any]], consultas_banco: int, segundos: float) -> None:
+        """Continua a partir das medições gravadas (importação retomada)."""
+        for nome, etapa in ((metricas or {}).get("etapas") or {}).items():
+            self.registrar(nome, etapa["segundos"], etapa["linhas"], etapa["execucoes"])
+        self.contadores.update((metricas or {}).get("contadores") or {})
+        self.consultas_banco += consultas_banco
+        self.segundos_anteriores += segundos
+
+    def decorrido(self) -> float:
+        """Segundos desde a criação (mais os de execuções anteriores carregadas)."""
+        return self.segundos_anteriores + time.perf_counter() - self.inicio
+
+    def para_dict(self) -> Dict[str, Any]:
+        return {
+            "etapas": {
+                nome: {
+                    "segundos": round(etapa["segundos"], 3),
+                    "linhas": etapa["linhas"],
+                    "execucoes": etapa["execucoes"],
+                    "linhas_por_segundo": (
+                        round(etapa["linhas"] / etapa["segundos"], 1)
+                        if etapa["linhas"] and etapa["segundos"] > 0 else None
+                    ),
+                }
+                for nome, etapa in self.etapas.items()
+            },
+            "contadores": dict(self.contadores),
+            "pico_memoria_mb": pico_memoria_mb(),
+        }
+
+
+def pico_memoria_mb() -> Optional[Dict[str, float]]:
+    """
+    Pico de memória residente (RSS) desde o início do processo, em MB.
+
+    "filhos" é o maior pico entre os processos filhos já encerrados (ex:
+    pool de leitura da importação em pacote). None onde o módulo `resource`
+    não existe (Windows).
+    """
+    if resource is None:
+        return None
+    # ru_maxrss em KB no Linux e em bytes no macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "processo": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 1),
+        "filhos": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / divisor, 1),
+    }
+
+
+def registrar_consulta(quantidade: int = 1) -> None:
+    """Conta idas ao banco feitas fora do SQLAlchemy (ex: COPY pelo cursor do driver)."""
+    medidor = _medidor_atual.get()
+    if medidor is not None:
+        medidor.consultas_banco += quantidade
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _contar_comando(conn, cursor, statement, parameters, context, executemany) -> None:
+    registrar_consulta()
+
+
+@event.listens_for(Engine, "commit")
+def _contar_commit(conn) -> None:
+    registrar_consulta()
@@ -1,8 +1,13 @@
 """Validações de dados."""
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 import re
 
+import numpy as np
+import pandas as pd
+
+from app.utils.classificacao_servico import classificar_servico
+
 
 def validar_cpf(cpf: str) -> bool:
     """Valida CPF (formato básico)."""
@@ -39,27 +44,121 @@ def parse_data_brasil(data_str: str) -> Optional[datetime]:
     """
     Parse de data no formato brasileiro DD/MM/YYYY HH:MM:SS.
     
+    Wrapper de `parse_data_brasil_serie` para um valor; para colunas inteiras
+    use a versão de série, que é vetorizada.
+    
     Args:
         data_str: String no formato "01/11/2025 04:52:48"
         
     Returns:
         datetime ou None se inválido
     """
-    if not data_str or not data_str.strip():
+    if not isinstance(data_str, str) or not data_str.strip():
         return None
+    data = parse_data_brasil_serie(pd.Series([data_str], dtype=object)).iloc[0]
+    return None if pd.isna(data) else data.to_pydatetime()
+
+
+# Formatos de largura fixa: posição -> separador esperado
+_SEPARADORES_DATA = {
+    19: {2: "/", 5: "/", 10: " ", 13: ":", 16: ":"},  # DD/MM/YYYY HH:MM:SS
+    10: {2: "/", 5: "/"},  # DD/MM/YYYY
+}
+
+
+def _numero(digitos: np.ndarray, inicio: int, fim: int) -> np.ndarray:
+    """Inteiro formado pelos dígitos das posições [inicio, fim) de cada linha."""
+    numero = np.zeros(len(digitos), dtype=np.int64)
+    for posicao in range(inicio, fim):
+        numero = numero * 10 + digitos[:, posicao]
+    return numero
+
+
+def _converter_largura_fixa(texto: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte strings DD/MM/YYYY[ HH:MM:SS] com aritmética sobre os códigos dos caracteres.
     
-    try:
-        # Remove espaços extras
-        data_str = data_str.strip()
+    Returns:
+        Tupla (datas datetime64[s], máscara dos valores convertidos). Valores
+        fora do formato exato ou com campos inválidos (ex: 31/02) ficam fora
+        da máscara.
+    """
+    datas = np.full(len(texto), np.datetime64("NaT"), dtype="datetime64[s]")
+    convertido = np.zeros(len(texto), dtype=bool)
+    tamanhos = np.fromiter((len(valor) for valor in texto), dtype=np.int64, count=len(texto))
+    
+    for largura, separadores in _SEPARADORES_DATA.items():
+        linhas = np.flatnonzero(tamanhos == largura)
+        if not len(linhas):
+            continue
         
-        # Formato com hora
-        if len(data_str) > 10:
-            return datetime.strptime(data_str, "%d/%m/%Y %H:%M:%S")
+        codigos = np.asarray(texto[linhas], dtype=f"U{largura}").view(np.uint32).reshape(len(linhas), largura)
+        digitos = codigos.astype(np.int64) - ord("0")
+        posicoes_digitos = [posicao for posicao in range(largura) if posicao not in separadores]
+        valido = ((digitos[:, posicoes_digitos] >= 0) & (digitos[:, posicoes_digitos] <= 9)).all(axis=1)
+        for posicao, separador in separadores.items():
+            valido &= codigos[:, posicao] == ord(separador)
+        
+        dia, mes, ano = _numero(digitos, 0, 2), _numero(digitos, 3, 5), _numero(digitos, 6, 10)
+        if largura == 19:
+            hora, minuto, segundo = _numero(digitos, 11, 13), _numero(digitos, 14, 16), _numero(digitos, 17, 19)
         else:
-            # Apenas data
-            return datetime.strptime(data_str, "%d/%m/%Y")
-    except (ValueError, AttributeError):
-        return None
+            hora = minuto = segundo = np.zeros(len(linhas), dtype=np.int64)
+        valido &= (ano >= 1) & (mes >= 1) & (mes <= 12) & (dia >= 1)
+        valido &= (hora < 24) & (minuto < 60) & (segundo < 60)
+        
+        # Primeiro dia do mês como datetime64[M]; valores inválidos viram 1970-01 só para o cálculo
+        inicio_mes = ((np.where(valido, ano, 1970) - 1970) * 12 + np.where(valido, mes, 1) - 1).astype("datetime64[M]")
+        dias_no_mes = ((inicio_mes + 1).astype("datetime64[D]") - inicio_mes.astype("datetime64[D]")).astype(np.int64)
+        valido &= dia <= dias_no_mes
+        
+        segundos = (dia - 1) * 86400 + hora * 3600 + minuto * 60 + segundo
+        datas[linhas[valido]] = (
+            inicio_mes.astype("datetime64[D]").astype("datetime64[s]") + segundos.astype("timedelta64[s]")
+        )[valido]
+        convertido[linhas[valido]] = True
+    
+    return datas, convertido
+
+
+def parse_data_brasil_serie(serie: pd.Series) -> pd.Series:
+    """
+    Parse vetorizado de uma coluna de datas no formato brasileiro.
+    
+    Valores com espaços nas pontas (ex: "26/09/2025 ") são aceitos; vazios,
+    NaN e inválidos viram NaT. Cada valor distinto é convertido uma vez, e o
+    formato exato DD/MM/YYYY[ HH:MM:SS] é convertido por aritmética de
+    arrays; o que fugir dele (ex: "1/2/2025") passa pelo `pd.to_datetime`
+    com a mesma regra do parse por valor: mais de 10 caracteres usa
+    DD/MM/YYYY HH:MM:SS, os demais DD/MM/YYYY.
+    
+    Args:
+        serie: Coluna com strings de data (pode conter NaN ou ser categórica)
+            ou já datetime64
+        
+    Returns:
+        Série datetime64 com NaT para valores vazios ou inválidos
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        # Coluna já tipada (Parquet/Arrow convertido do CSV)
+        return serie.astype("datetime64[us]")
+    
+    codigos, unicos = pd.factorize(serie)
+    texto = np.array([str(valor).strip() for valor in unicos], dtype=object)
+    
+    datas, convertido = _converter_largura_fixa(texto)
+    restantes = ~convertido
+    if restantes.any():
+        outros = pd.Series(texto[restantes], dtype=object)
+        com_hora = outros.str.len() > 10
+        datas_com_hora = pd.to_datetime(outros.where(com_hora), format="%d/%m/%Y %H:%M:%S", errors="coerce")
+        datas_sem_hora = pd.to_datetime(outros.where(~com_hora), format="%d/%m/%Y", errors="coerce")
+        datas[restantes] = datas_com_hora.fillna(datas_sem_hora).to_numpy(dtype="datetime64[s]")
+    
+    resultado = np.full(len(serie), np.datetime64("NaT"), dtype="datetime64[s]")
+    presentes = codigos >= 0
+    resultado[presentes] = datas[codigos[presentes]]
+    return pd.Series(resultado, index=serie.index).astype("datetime64[us]")
 
 
 def normalizar_subprefeitura(subpref: str) -> Optional[str]:
@@ -93,6 +192,9 @@ def calcular_prazo_max_hours(tipo_servico: str, responsividade: Optional[int] =
     """
     Calcula prazo máximo em horas baseado no tipo de serviço.
     
+    As regras ficam em app.utils.classificacao_servico (mesma tabela usada
+    para o TipoServico).
+    
     Args:
         tipo_servico: Tipo do serviço
         responsividade: Responsividade do CSV (se disponível)
@@ -102,38 +204,4 @@ def calcular_prazo_max_hours(tipo_servico: str, responsividade: Optional[int] =
     """
     if responsividade:
         return responsividade
-    
-    tipo_lower = tipo_servico.lower()
-    
-    # IMPORTANTE: Verificar Escalonados ANTES dos Demandantes
-    # Cata-Bagulho (Escalonado) - prazo de 720h (30 dias), não importa o prazo de vistoria
-    if "cata-bagulho" in tipo_lower or "cata bagulho" in tipo_lower:
-        return 720  # 30 dias - Escalonado, não importa prazo
-    elif "coleta programada" in tipo_lower:
-        return 720  # 30 dias - Cata-Bagulho (Escalonado)
-    
-    # Demandantes (com responsividade específica)
-    # Coleta e transporte de entulho (NÃO programada = Demandante)
-    elif ("coleta e transporte" in tipo_lower or "coleta de entulho" in tipo_lower) and \
-         ("entulho" in tipo_lower or "grandes objetos" in tipo_lower) and \
-         "programada" not in tipo_lower:
-        return 72  # 72h - Demandante
-    elif ("entulho" in tipo_lower or "grandes objetos" in tipo_lower) and \
-         "programada" not in tipo_lower:
-        return 72  # 72h - Demandante
-    elif "animal" in tipo_lower and "morto" in tipo_lower:
-        return 12  # 12h - Demandante
-    elif "papeleira" in tipo_lower or "lixeira" in tipo_lower or "equipamentos de recepção" in tipo_lower:
-        return 72  # 72h conforme especificação - Demandante
-    
-    # Escalonados (agendados para até 1 mês = 720h)
-    elif ("varrição" in tipo_lower or 
-          "bueiro" in tipo_lower or 
-          "capinação" in tipo_lower or 
-          "mutirão" in tipo_lower or
-          "lavagem" in tipo_lower or
-          "monumento" in tipo_lower):
-        return 720  # 30 dias para escalonados
-    else:
-        return 720  # 30 dias padrão para escalonados/outros
-
+    return classificar_servico(tipo_servico)[1]
@@ -0,0 +1,37 @@
+"""add_geocoding_cache
+
+Revision ID: 5b8e2f41c7a9
+Revises: 3c31933bb126
+Create Date: 2026-10-17 10:12:40.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f41c7a9'
+down_revision: Union[str, None] = '3c31933bb126'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('geocoding_cache',
+    sa.Column('endereco_normalizado', sa.String(), nullable=False),
+    sa.Column('endereco', sa.String(), nullable=False),
+    sa.Column('lat', sa.Float(), nullable=True),
+    sa.Column('lng', sa.Float(), nullable=True),
+    sa.Column('provider', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('endereco_normalizado')
+    )
+    op.create_index(op.f('ix_geocoding_cache_updated_at'), 'geocoding_cache', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_geocoding_cache_updated_at'), table_name='geocoding_cache')
+    op.drop_table('geocoding_cache')
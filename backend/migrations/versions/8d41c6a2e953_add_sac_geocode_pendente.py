@@ -0,0 +1,40 @@
+"""add_sac_geocode_pendente
+
+Revision ID: 8d41c6a2e953
+Revises: 5b8e2f41c7a9
+Create Date: 2026-10-17 11:02:15.442871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41c6a2e953'
+down_revision: Union[str, None] = '5b8e2f41c7a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('sacs', sa.Column('geocode_status', sa.String(), nullable=True))
+    op.add_column('sacs', sa.Column('geocode_tentativas', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('sacs', sa.Column('geocode_proxima_tentativa', sa.DateTime(), nullable=True))
+    op.add_column('sacs', sa.Column('geocode_erro', sa.String(), nullable=True))
+    op.create_index(op.f('ix_sacs_geocode_status'), 'sacs', ['geocode_status'], unique=False)
+    
+    # SACs já importados sem coordenadas entram na fila do backfill
+    op.execute("""
+        UPDATE sacs SET geocode_status = 'pendente'
+        WHERE (lat IS NULL OR lng IS NULL) AND endereco_text <> ''
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_sacs_geocode_status'), table_name='sacs')
+    op.drop_column('sacs', 'geocode_erro')
+    op.drop_column('sacs', 'geocode_proxima_tentativa')
+    op.drop_column('sacs', 'geocode_tentativas')
+    op.drop_column('sacs', 'geocode_status')
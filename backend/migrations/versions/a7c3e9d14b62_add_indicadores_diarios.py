@@ -0,0 +1,85 @@
+"""add_indicadores_diarios
+
+Revision ID: a7c3e9d14b62
+Revises: f4b8d2e65a19
+Create Date: 2026-10-17 22:41:08.530217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d14b62'
+down_revision: Union[str, None] = 'f4b8d2e65a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Contagens diárias de IRD, IA e IF por subprefeitura."""
+    op.create_table('indicadores_diarios',
+    sa.Column('dia', sa.Date(), nullable=False),
+    sa.Column('subprefeitura', sa.String(length=2), nullable=False),
+    sa.Column('reclamacoes', sa.Integer(), nullable=False),
+    sa.Column('procedentes', sa.Integer(), nullable=False),
+    sa.Column('no_prazo', sa.Integer(), nullable=False),
+    sa.Column('fiscalizacoes', sa.Integer(), nullable=False),
+    sa.Column('sem_irregularidade', sa.Integer(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('dia', 'subprefeitura')
+    )
+    
+    # Contagens dos SACs e CNCs já gravados (mesmas regras de
+    # app.services.indicadores.consulta_contagens). Os Enums são comparados
+    # como texto: valores criados em migrations anteriores na mesma
+    # transação não podem ser usados como literais do tipo.
+    op.execute("""
+        INSERT INTO indicadores_diarios (
+            dia, subprefeitura, reclamacoes, procedentes, no_prazo,
+            fiscalizacoes, sem_irregularidade, atualizado_em
+        )
+        SELECT
+            COALESCE(s.dia, c.dia), COALESCE(s.subprefeitura, c.subprefeitura),
+            COALESCE(s.reclamacoes, 0), COALESCE(s.procedentes, 0), COALESCE(s.no_prazo, 0),
+            COALESCE(c.fiscalizacoes, 0), COALESCE(c.sem_irregularidade, 0),
+            now() AT TIME ZONE 'utc'
+        FROM (
+            SELECT
+                CAST(data_criacao AS date) AS dia,
+                CAST(subprefeitura AS varchar) AS subprefeitura,
+                count(*) FILTER (WHERE CAST(tipo_servico AS varchar) IN (
+                    'CATABAGULHO', 'VARRIACAO_COLETA', 'MUTIRAO', 'LAVAGEM', 'BUEIRO',
+                    'VARRIACAO', 'VARRIACAO_PRACAS', 'MONUMENTOS', 'OUTROS'
+                )) AS reclamacoes,
+                count(*) FILTER (WHERE CAST(tipo_servico AS varchar) IN ('ENTULHO', 'ANIMAL_MORTO', 'PAPELEIRAS')
+                    AND data_execucao IS NOT NULL) AS procedentes,
+                count(*) FILTER (WHERE CAST(tipo_servico AS varchar) IN ('ENTULHO', 'ANIMAL_MORTO', 'PAPELEIRAS')
+                    AND data_execucao IS NOT NULL
+                    AND EXTRACT(epoch FROM data_execucao - data_criacao) / 3600 <= prazo_max_hours) AS no_prazo
+            FROM sacs
+            WHERE CAST(status AS varchar) IN ('EXECUTADO', 'FINALIZADO', 'CONFIRMADA_EXECUCAO')
+            GROUP BY 1, 2
+        ) AS s
+        FULL JOIN (
+            SELECT
+                CAST(data_abertura AS date) AS dia,
+                CASE subprefeitura
+                    WHEN 'Casa Verde/Cachoeirinha' THEN 'CV'
+                    WHEN 'Jaçanã/Tremembé' THEN 'JT'
+                    WHEN 'Santana/Tucuruvi' THEN 'ST'
+                    WHEN 'Vila Maria/Vila Guilherme' THEN 'MG'
+                    ELSE ''
+                END AS subprefeitura,
+                count(*) AS fiscalizacoes,
+                count(*) FILTER (WHERE CAST(status AS varchar) = 'REGULARIZADO') AS sem_irregularidade
+            FROM cnc
+            GROUP BY 1, 2
+        ) AS c ON s.dia = c.dia AND s.subprefeitura = c.subprefeitura
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('indicadores_diarios')
@@ -0,0 +1,54 @@
+"""add_sac_reclassificacao
+
+Revision ID: a93f07d5b2c1
+Revises: 8d41c6a2e953
+Create Date: 2026-10-17 13:20:51.907114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a93f07d5b2c1'
+down_revision: Union[str, None] = '8d41c6a2e953'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Fonte da classificação nos SACs + checkpoints da reclassificação.
+    
+    SACs importados antes desta migration não têm servico_texto e ficam de
+    fora da reclassificação até serem reimportados.
+    """
+    op.add_column('sacs', sa.Column('servico_texto', sa.String(), nullable=True))
+    op.add_column('sacs', sa.Column('regra_versao', sa.Integer(), nullable=True))
+    op.add_column('sacs', sa.Column('responsividade', sa.Integer(), nullable=True))
+    
+    op.create_table('reclassificacoes_sac',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('versao_regras', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('ultimo_id', sa.UUID(), nullable=True),
+    sa.Column('lotes', sa.Integer(), nullable=False),
+    sa.Column('processados', sa.Integer(), nullable=False),
+    sa.Column('atualizados', sa.Integer(), nullable=False),
+    sa.Column('erro', sa.String(), nullable=True),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=False),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=False),
+    sa.Column('finalizado_em', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_reclassificacoes_sac_versao_regras'), 'reclassificacoes_sac', ['versao_regras'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_reclassificacoes_sac_versao_regras'), table_name='reclassificacoes_sac')
+    op.drop_table('reclassificacoes_sac')
+    op.drop_column('sacs', 'responsividade')
+    op.drop_column('sacs', 'regra_versao')
+    op.drop_column('sacs', 'servico_texto')
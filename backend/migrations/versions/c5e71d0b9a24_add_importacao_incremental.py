@@ -0,0 +1,56 @@
+"""add_importacao_incremental
+
+Revision ID: c5e71d0b9a24
+Revises: a93f07d5b2c1
+Create Date: 2026-10-17 15:02:37.418265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e71d0b9a24'
+down_revision: Union[str, None] = 'a93f07d5b2c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABELAS = ('sacs', 'cnc', 'acic', 'ouvidorias')
+
+
+def upgrade() -> None:
+    """
+    Hash de conteúdo por linha + histórico de importações (fingerprint).
+    
+    Registros existentes ficam com hash nulo e contam como alterados na
+    primeira importação incremental.
+    """
+    for tabela in TABELAS:
+        op.add_column(tabela, sa.Column('hash_origem', sa.String(length=16), nullable=True))
+    
+    op.create_table('importacoes',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('entidade', sa.String(), nullable=False),
+    sa.Column('arquivo', sa.String(), nullable=True),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('tamanho_bytes', sa.BigInteger(), nullable=True),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('novos', sa.Integer(), nullable=False),
+    sa.Column('alterados', sa.Integer(), nullable=False),
+    sa.Column('inalterados', sa.Integer(), nullable=False),
+    sa.Column('erros', sa.Integer(), nullable=False),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=False),
+    sa.Column('finalizado_em', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_importacao_entidade_finalizado', 'importacoes', ['entidade', 'finalizado_em'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_importacao_entidade_finalizado', table_name='importacoes')
+    op.drop_table('importacoes')
+    for tabela in TABELAS:
+        op.drop_column(tabela, 'hash_origem')
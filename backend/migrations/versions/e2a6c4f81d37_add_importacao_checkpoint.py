@@ -0,0 +1,46 @@
+"""add_importacao_checkpoint
+
+Revision ID: e2a6c4f81d37
+Revises: c5e71d0b9a24
+Create Date: 2026-10-17 18:41:09.532170
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c4f81d37'
+down_revision: Union[str, None] = 'c5e71d0b9a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Checkpoint das importações: linhas já commitadas, blocos e retomadas.
+    
+    Importações anteriores ficam com o checkpoint no total (concluídas).
+    """
+    op.add_column('importacoes', sa.Column('linhas_confirmadas', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('importacoes', sa.Column('blocos', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('importacoes', sa.Column('retomadas', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('importacoes', sa.Column('erro', sa.String(), nullable=True))
+    op.add_column('importacoes', sa.Column('atualizado_em', sa.DateTime(), nullable=True))
+    op.execute("UPDATE importacoes SET linhas_confirmadas = total, atualizado_em = finalizado_em")
+    op.alter_column('importacoes', 'atualizado_em', nullable=False)
+    op.alter_column('importacoes', 'finalizado_em', existing_type=sa.DateTime(), nullable=True)
+    op.create_index('idx_importacao_entidade_fingerprint', 'importacoes', ['entidade', 'fingerprint'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_importacao_entidade_fingerprint', table_name='importacoes')
+    op.execute("DELETE FROM importacoes WHERE finalizado_em IS NULL")
+    op.alter_column('importacoes', 'finalizado_em', existing_type=sa.DateTime(), nullable=False)
+    op.drop_column('importacoes', 'atualizado_em')
+    op.drop_column('importacoes', 'erro')
+    op.drop_column('importacoes', 'retomadas')
+    op.drop_column('importacoes', 'blocos')
+    op.drop_column('importacoes', 'linhas_confirmadas')
@@ -0,0 +1,35 @@
+"""add_importacao_metricas
+
+Revision ID: f4b8d2e65a19
+Revises: e2a6c4f81d37
+Create Date: 2026-10-17 20:12:45.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2e65a19'
+down_revision: Union[str, None] = 'e2a6c4f81d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Métricas por etapa das importações (tempo, linhas, idas ao banco, geocoder)."""
+    op.add_column('importacoes', sa.Column('duracao_segundos', sa.Float(), nullable=True))
+    op.add_column('importacoes', sa.Column('consultas_banco', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('importacoes', sa.Column('chamadas_geocoder', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('importacoes', sa.Column('metricas', sa.JSON(), nullable=True))
+    op.create_index('idx_importacao_iniciado', 'importacoes', ['iniciado_em'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_importacao_iniciado', table_name='importacoes')
+    op.drop_column('importacoes', 'metricas')
+    op.drop_column('importacoes', 'chamadas_geocoder')
+    op.drop_column('importacoes', 'consultas_banco')
+    op.drop_column('importacoes', 'duracao_segundos')
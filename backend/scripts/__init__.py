@@ -0,0 +1 @@
+"""Scripts de linha de comando (executar da pasta backend com `python -m scripts.<nome>`)."""
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark do parse de datas DD/MM/YYYY[ HH:MM:SS].
+
+Compara, sobre as colunas Data_* de um CSV do FLIP:
+- o laço com `datetime.strptime` por valor (parse antigo por célula);
+- duas chamadas de `pd.to_datetime` com formato (parse de série anterior);
+- `parse_data_brasil_serie` (valores distintos + aritmética de arrays).
+
+Uso (na pasta backend; DATABASE_URL precisa estar definido, mas o banco
+não é acessado):
+
+    python -m scripts.benchmark_datas ../docs/TODOS_SACS.csv --multiplicar 20
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+import pandas as pd
+
+
+def _strptime(data_str: str) -> Optional[datetime]:
+    """Parse por valor como era feito antes (strptime)."""
+    if not data_str or not data_str.strip():
+        return None
+    try:
+        data_str = data_str.strip()
+        if len(data_str) > 10:
+            return datetime.strptime(data_str, "%d/%m/%Y %H:%M:%S")
+        return datetime.strptime(data_str, "%d/%m/%Y")
+    except ValueError:
+        return None
+
+
+def laco_strptime(serie: pd.Series) -> pd.Series:
+    return pd.Series([_strptime(str(valor)) for valor in serie], index=serie.index, dtype=object)
+
+
+def to_datetime_dois_formatos(serie: pd.Series) -> pd.Series:
+    texto = serie.astype(object).where(serie.notna(), "").astype(str).str.strip()
+    com_hora = texto.str.len() > 10
+    datas_com_hora = pd.to_datetime(texto.where(com_hora), format="%d/%m/%Y %H:%M:%S", errors="coerce")
+    datas_sem_hora = pd.to_datetime(texto.where(~com_hora), format="%d/%m/%Y", errors="coerce")
+    return datas_com_hora.fillna(datas_sem_hora)
+
+
+def _medir(funcao: Callable[[pd.Series], pd.Series], colunas: pd.DataFrame, repeticoes: int) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for coluna in colunas:
+            funcao(colunas[coluna])
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("arquivo", help="CSV exportado do FLIP")
+    parser.add_argument("--multiplicar", type=int, default=1, help="Repetir as linhas N vezes")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Execuções por variante (vale a mais rápida)")
+    args = parser.parse_args()
+
+    from app.utils.validators import parse_data_brasil_serie
+
+    df = pd.read_csv(args.arquivo, sep=";", dtype=str)
+    df.columns = df.columns.str.strip()
+    colunas = df[[coluna for coluna in df.columns if coluna.startswith("Data_")]]
+    colunas = pd.concat([colunas] * args.multiplicar, ignore_index=True)
+    celulas = colunas.size
+    print(f"{len(colunas.columns)} colunas de data x {len(colunas)} linhas = {celulas} células")
+
+    variantes = {
+        "strptime por valor": laco_strptime,
+        "to_datetime (2 formatos)": to_datetime_dois_formatos,
+        "parse_data_brasil_serie": parse_data_brasil_serie,
+    }
+    tempos = {}
+    for nome, funcao in variantes.items():
+        tempos[nome] = _medir(funcao, colunas, args.repeticoes)
+        print(f"{nome:26s} {tempos[nome]:8.3f}s  {1e9 * tempos[nome] / celulas:8.1f} ns/célula")
+
+    base = tempos["strptime por valor"]
+    for nome, tempo in tempos.items():
+        if nome != "strptime por valor":
+            print(f"{nome}: {base / tempo:.1f}x mais rápido que o strptime por valor")
+
+
+if __name__ == "__main__":
+    main()
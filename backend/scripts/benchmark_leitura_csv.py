@@ -0,0 +1,130 @@
+"""
+Benchmark da leitura dos CSVs do FLIP: tempo de parse e pico de memória.
+
+Compara a leitura completa (todas as colunas como texto) com a leitura
+podada (só as colunas do layout, categóricas) na engine C e, se o pyarrow
+estiver instalado, na engine pyarrow. Cada variante roda em um processo
+novo, para que o pico de RSS de uma não contamine a outra.
+
+Uso (na pasta backend; DATABASE_URL precisa estar definido, mas o banco
+não é acessado):
+
+    python -m scripts.benchmark_leitura_csv ../docs/TODOS_SACS.csv --entidade sacs --multiplicar 20
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict
+
+LAYOUTS = {
+    "sacs": "LAYOUT_SAC",
+    "cnc": "LAYOUT_CNC",
+    "acic": "LAYOUT_ACIC",
+    "ouvidoria": "LAYOUT_OUVIDORIA",
+}
+
+VARIANTES = {
+    "completa": dict(engine="c", podada=False),
+    "podada": dict(engine="c", podada=True),
+    "podada_pyarrow": dict(engine="pyarrow", podada=True),
+}
+
+
+def _pico_rss_mb() -> float:
+    # ru_maxrss é em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _medir(arquivo: str, entidade: str, engine: str, podada: bool, chunksize: int) -> Dict[str, Any]:
+    """Lê o arquivo inteiro em blocos (como a importação) e mede tempo e memória."""
+    from app.config import settings
+    from app.services import csv_processor
+
+    settings.IMPORT_CSV_ENGINE = engine
+    processor = csv_processor.CSVProcessor(None)
+    layout = getattr(csv_processor, LAYOUTS[entidade]) if podada else None
+
+    rss_inicial = _pico_rss_mb()
+    inicio = time.perf_counter()
+    linhas = 0
+    memoria_bloco = 0
+    for bloco in processor._ler_csv_em_blocos(arquivo, chunksize, layout):
+        linhas += len(bloco)
+        memoria_bloco = max(memoria_bloco, int(bloco.memory_usage(deep=True).sum()))
+    duracao = time.perf_counter() - inicio
+
+    return {
+        "linhas": linhas,
+        "segundos": round(duracao, 3),
+        "pico_rss_mb": round(_pico_rss_mb() - rss_inicial, 1),
+        "memoria_bloco_mb": round(memoria_bloco / 1024 / 1024, 1),
+    }
+
+
+def _multiplicar(arquivo: str, vezes: int) -> str:
+    """Cria um arquivo temporário com as linhas de dados repetidas `vezes` vezes."""
+    with open(arquivo, "rb") as origem:
+        cabecalho = origem.readline()
+        dados = origem.read()
+    if not dados.endswith(b"\n"):
+        dados += b"\n"
+    destino = tempfile.NamedTemporaryFile(delete=False, suffix=".csv")
+    with destino:
+        destino.write(cabecalho)
+        for _ in range(vezes):
+            destino.write(dados)
+    return destino.name
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("arquivo", help="CSV exportado do FLIP")
+    parser.add_argument("--entidade", choices=sorted(LAYOUTS), default="sacs")
+    parser.add_argument("--multiplicar", type=int, default=1, help="Repetir as linhas N vezes")
+    parser.add_argument("--chunksize", type=int, default=None, help="Linhas por bloco (padrão: IMPORT_CHUNK_SIZE)")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Execuções por variante (vale a mais rápida)")
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.services.csv_processor import PYARROW_AVAILABLE
+
+    chunksize = args.chunksize or settings.IMPORT_CHUNK_SIZE
+    arquivo = _multiplicar(args.arquivo, args.multiplicar) if args.multiplicar > 1 else args.arquivo
+    try:
+        print(f"Arquivo: {args.arquivo} x{args.multiplicar} ({os.path.getsize(arquivo) / 1024 / 1024:.1f} MB)")
+        resultados = {}
+        for nome, variante in VARIANTES.items():
+            if variante["engine"] == "pyarrow" and not PYARROW_AVAILABLE:
+                print(f"{nome:16s} ignorada (pyarrow não instalado)")
+                continue
+            execucoes = []
+            for _ in range(args.repeticoes):
+                # Processo novo por execução: pico de RSS isolado
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    execucoes.append(executor.submit(
+                        _medir, arquivo, args.entidade, variante["engine"], variante["podada"], chunksize,
+                    ).result())
+            resultados[nome] = min(execucoes, key=lambda r: r["segundos"])
+            r = resultados[nome]
+            print(
+                f"{nome:16s} {r['linhas']:>9d} linhas  {r['segundos']:7.3f}s  "
+                f"pico RSS +{r['pico_rss_mb']:7.1f} MB  bloco {r['memoria_bloco_mb']:6.1f} MB"
+            )
+
+        base = resultados["completa"]
+        for nome, r in resultados.items():
+            if nome == "completa":
+                continue
+            tempo = 100 * (1 - r["segundos"] / base["segundos"]) if base["segundos"] else 0
+            rss = 100 * (1 - r["pico_rss_mb"] / base["pico_rss_mb"]) if base["pico_rss_mb"] else 0
+            print(f"{nome}: parse {tempo:.0f}% mais rápido, pico de RSS {rss:.0f}% menor que a leitura completa")
+    finally:
+        if arquivo != args.arquivo:
+            os.unlink(arquivo)
+
+
+if __name__ == "__main__":
+    main()
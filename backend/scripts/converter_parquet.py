@@ -0,0 +1,57 @@
+"""
+Converte exports CSV do FLIP em Parquet (ou Arrow IPC) com schema fixo.
+
+O arquivo convertido tem só as colunas usadas pela importação, as datas
+já tipadas e o hash de cada linha do CSV; pode ser importado no lugar do
+CSV (upload, importação em pacote) sem repetir o parse. Requer pyarrow.
+
+Uso (na pasta backend; DATABASE_URL precisa estar definido, mas o banco
+não é acessado):
+
+    python -m scripts.converter_parquet ../docs/TODOS_SACS.csv
+    python -m scripts.converter_parquet ../docs/Novembro/*.csv --destino /tmp/flip --formato arrow
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivos", nargs="+", help="CSVs do FLIP (.csv, .csv.gz, .zip)")
+    parser.add_argument(
+        "--entidade",
+        choices=["sacs", "cnc", "acic", "ouvidoria"],
+        help="Entidade dos arquivos (padrão: identificada pelo nome)",
+    )
+    parser.add_argument("--formato", choices=["parquet", "arrow"], default="parquet")
+    parser.add_argument("--destino", default=None, help="Diretório de saída (padrão: o do CSV)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Linhas por bloco (padrão: IMPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    from app.services.exportacao_parquet import converter_csv
+    from app.services.importacao_pacote import identificar_entidade
+    from app.utils.compressao import nome_csv
+
+    extensao = ".parquet" if args.formato == "parquet" else ".arrow"
+    if args.destino:
+        os.makedirs(args.destino, exist_ok=True)
+    for arquivo in args.arquivos:
+        # Zip com um único CSV: vale o nome do CSV
+        nome = os.path.basename(nome_csv(arquivo) or arquivo)
+        entidade = args.entidade or identificar_entidade(nome)
+        if not entidade:
+            print(f"Entidade não identificada: {arquivo} (use --entidade)", file=sys.stderr)
+            return 1
+        for sufixo in (".gz", ".zip", ".csv"):
+            if nome.lower().endswith(sufixo):
+                nome = nome[:-len(sufixo)]
+        destino = os.path.join(args.destino or os.path.dirname(os.path.abspath(arquivo)), nome + extensao)
+        resultado = converter_csv(entidade, arquivo, destino, args.formato, args.chunksize)
+        print(json.dumps(resultado, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
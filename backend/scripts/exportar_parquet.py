@@ -0,0 +1,47 @@
+"""
+Exporta snapshots Parquet das tabelas de entidades (sacs, cnc, acic, ouvidorias).
+
+Um arquivo por tabela, `<tabela>_<AAAAMMDD_HHMMSS>.parquet`, lido do banco
+em blocos. Requer pyarrow.
+
+Uso (na pasta backend):
+
+    python -m scripts.exportar_parquet --destino /tmp/snapshots
+    python -m scripts.exportar_parquet sacs cnc --destino /tmp/snapshots
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+
+def main() -> int:
+    from app.services.exportacao_parquet import TABELAS_SNAPSHOT
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tabelas", nargs="*", help=f"Tabelas ({', '.join(TABELAS_SNAPSHOT)}; padrão: todas)")
+    parser.add_argument("--destino", default=".", help="Diretório de saída")
+    parser.add_argument("--chunksize", type=int, default=None, help="Linhas por row group (padrão: IMPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+    invalidas = sorted(set(args.tabelas) - set(TABELAS_SNAPSHOT))
+    if invalidas:
+        parser.error(f"Tabelas inválidas: {', '.join(invalidas)}")
+
+    from app.database import SessionLocal
+    from app.services.exportacao_parquet import exportar_snapshot
+
+    os.makedirs(args.destino, exist_ok=True)
+    carimbo = datetime.now().strftime("%Y%m%d_%H%M%S")
+    db = SessionLocal()
+    try:
+        for tabela in args.tabelas or TABELAS_SNAPSHOT:
+            destino = os.path.join(args.destino, f"{tabela}_{carimbo}.parquet")
+            print(json.dumps(exportar_snapshot(db, tabela, destino, args.chunksize), ensure_ascii=False))
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Importação em pacote dos exports do FLIP pela linha de comando.
+
+Recebe os CSVs do dia (SAC, CNC, ACIC e Ouvidoria) e/ou um .zip com eles;
+a entidade de cada CSV é identificada pelo nome do arquivo. Cada CSV pode
+vir compactado (.csv.gz ou .zip), descompactado em streaming na leitura.
+Mesmo fluxo do endpoint POST /upload/pacote, executado de forma síncrona.
+
+Uso (na pasta backend):
+
+    python -m scripts.importar_pacote ../docs/Novembro/*.csv
+    python -m scripts.importar_pacote exports_do_dia.zip --por-arquivo
+    python -m scripts.importar_pacote TODOS_SACS.csv.gz
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivos", nargs="+", help="CSVs (.csv, .csv.gz, .zip) e/ou .zip com vários CSVs")
+    parser.add_argument(
+        "--por-arquivo",
+        action="store_true",
+        help="Commit por arquivo (padrão: um commit para o pacote inteiro)",
+    )
+    parser.add_argument("--processos", type=int, default=None, help="Processos que leem e preparam os arquivos (padrão: IMPORT_PACOTE_WORKERS)")
+    parser.add_argument("--chunksize", type=int, default=None, help="Linhas por bloco (padrão: IMPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+    from app.services.importacao_pacote import ERRO, ImportacaoPacoteService, montar_pacote
+
+    diretorio = tempfile.mkdtemp(prefix="pacote_")
+    db = SessionLocal()
+    try:
+        arquivos = montar_pacote(args.arquivos, diretorio)
+
+        def progresso(etapa: str, linhas: int) -> None:
+            print(f"{etapa:24s} {linhas:>9d} linhas", file=sys.stderr)
+
+        servico = ImportacaoPacoteService(db, progresso=progresso, max_workers=args.processos, chunksize=args.chunksize)
+        resultado = servico.importar(arquivos, atomico=not args.por_arquivo)
+    finally:
+        db.close()
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+    print(json.dumps(resultado, indent=2, ensure_ascii=False, default=str))
+    return 1 if resultado["status"] == ERRO else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Recalcula toda a tabela indicadores_diarios a partir de SACs e CNCs.
+
+A importação, a reclassificação e a edição de SACs pela API já mantêm a
+tabela; use após alterar SACs ou CNCs direto no banco.
+
+Uso (na pasta backend):
+
+    python -m scripts.reconstruir_indicadores_diarios
+"""
+import sys
+
+
+def main() -> int:
+    from app.database import SessionLocal
+    from app.services import indicadores_diarios
+
+    db = SessionLocal()
+    try:
+        linhas = indicadores_diarios.reconstruir(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"{linhas} linhas (dia, subprefeitura) gravadas em indicadores_diarios")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Dry-run da importação: relatório de qualidade dos exports do FLIP, sem gravar.
+
+Para cada arquivo, conta os valores que cairiam em padrões na importação
+(status, serviço OUTROS, subprefeitura CV), as datas que não convertem e as
+coordenadas vazias, mal formadas ou fora de São Paulo. Com o banco
+(padrão) também mostra quantas linhas seriam inseridas/atualizadas e
+quantos endereços iriam para o geocoder; o banco só é consultado.
+
+Uso (na pasta backend):
+
+    python -m scripts.validar_csv ../docs/Novembro/*.csv
+    python -m scripts.validar_csv TODOS_SACS.csv.gz --sem-banco
+"""
+import argparse
+import json
+import os
+import sys
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivos", nargs="+", help="Arquivos do FLIP (.csv, .csv.gz, .zip, .parquet, .arrow)")
+    parser.add_argument(
+        "--entidade",
+        choices=["sacs", "cnc", "acic", "ouvidoria"],
+        help="Entidade dos arquivos (padrão: identificada pelo nome)",
+    )
+    parser.add_argument(
+        "--sem-banco",
+        action="store_true",
+        help="Não consulta o banco (sem simulação de inserções/atualizações)",
+    )
+    parser.add_argument("--chunksize", type=int, default=None, help="Linhas por bloco (padrão: IMPORT_CHUNK_SIZE)")
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+    from app.services.importacao_pacote import identificar_entidade
+    from app.services.validacao_importacao import ValidacaoImportacaoService
+    from app.utils.compressao import nome_csv
+
+    db = None if args.sem_banco else SessionLocal()
+    try:
+        servico = ValidacaoImportacaoService(db)
+        for arquivo in args.arquivos:
+            # Zip com um único CSV: vale o nome do CSV
+            nome = os.path.basename(nome_csv(arquivo) or arquivo)
+            entidade = args.entidade or identificar_entidade(nome)
+            if not entidade:
+                print(f"Entidade não identificada: {arquivo} (use --entidade)", file=sys.stderr)
+                return 1
+            relatorio = servico.validar(entidade, arquivo, args.chunksize)
+            print(json.dumps({"arquivo": arquivo, **relatorio}, indent=2, ensure_ascii=False))
+    finally:
+        if db is not None:
+            db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -55,6 +55,41 @@ export interface KPIs {
   cncs_urgentes: number;
 }
 
+export interface ImportacaoJob {
+  job_id: string;
+  entidade: string;
+  arquivo?: string;
+  status: 'pendente' | 'aguardando' | 'processando' | 'concluido' | 'erro';
+  etapa: string;
+  linhas_processadas: number;
+  linhas_por_segundo?: number | null;
+  resultado?: any;
+  erro?: string | null;
+}
+
+const INTERVALO_POLLING_MS = 1000;
+
+// Envia o CSV e aguarda a importação (processada em segundo plano no backend)
+const importarCSV = async (endpoint: string, file: File) => {
+  const formData = new FormData();
+  formData.append('file', file);
+  const { data: job } = await api.post<ImportacaoJob>(endpoint, formData, {
+    headers: { 'Content-Type': 'multipart/form-data' },
+  });
+  
+  let estado = job;
+  while (estado.status !== 'concluido' && estado.status !== 'erro') {
+    await new Promise((resolve) => setTimeout(resolve, INTERVALO_POLLING_MS));
+    const { data } = await api.get<ImportacaoJob>(`/upload/jobs/${job.job_id}`);
+    estado = data;
+  }
+  
+  if (estado.status === 'erro') {
+    throw new Error(estado.erro || 'Erro na importação');
+  }
+  return { ...estado.resultado, job_id: estado.job_id };
+};
+
 // API calls
 export const apiService = {
   // SACs
@@ -98,39 +133,16 @@ export const apiService = {
   },
   
   // Upload
-  uploadSACsCSV: async (file: File) => {
-    const formData = new FormData();
-    formData.append('file', file);
-    const { data } = await api.post('/upload/sacs-csv', formData, {
-      headers: { 'Content-Type': 'multipart/form-data' },
-    });
-    return data;
-  },
+  uploadSACsCSV: (file: File) => importarCSV('/upload/sacs-csv', file),
   
-  uploadCNCsCSV: async (file: File) => {
-    const formData = new FormData();
-    formData.append('file', file);
-    const { data } = await api.post('/upload/cnc-csv', formData, {
-      headers: { 'Content-Type': 'multipart/form-data' },
-    });
-    return data;
-  },
+  uploadCNCsCSV: (file: File) => importarCSV('/upload/cnc-csv', file),
   
-  uploadACICsCSV: async (file: File) => {
-    const formData = new FormData();
-    formData.append('file', file);
-    const { data } = await api.post('/upload/acic-csv', formData, {
-      headers: { 'Content-Type': 'multipart/form-data' },
-    });
-    return data;
-  },
+  uploadACICsCSV: (file: File) => importarCSV('/upload/acic-csv', file),
   
-  uploadOuvidoriaCSV: async (file: File) => {
-    const formData = new FormData();
-    formData.append('file', file);
-    const { data } = await api.post('/upload/ouvidoria-csv', formData, {
-      headers: { 'Content-Type': 'multipart/form-data' },
-    });
+  uploadOuvidoriaCSV: (file: File) => importarCSV('/upload/ouvidoria-csv', file),
+  
+  getImportacao: async (jobId: string) => {
+    const { data } = await api.get<ImportacaoJob>(`/upload/jobs/${jobId}`);
     return data;
   },
   